@@ -0,0 +1,260 @@
+"""
+End-to-end plugin benchmark against the local GMGN stand-in.
+
+Runs TopWallets and SolanaWalletScanner through the full WalletWave lifecycle
+(fetch, parse, filter, export) at several wallet counts. Reports wallets/sec,
+p50/p99 wallet lookup latency (timed inside the scan workers with --workers)
+and peak RSS. Every case runs in a fresh process so peak memory is not shared
+between cases. Results are written to JSON for comparison between commits.
+
+Usage:
+    python -m benchmarks.bench_e2e --sizes 1000,10000,100000
+    python -m benchmarks.bench_e2e --latency lognormal:50:0.5 --workers 4 --baseline old.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from benchmarks.mock_gmgn import run_in_subprocess, wallet_addresses
+
+PLUGINS = ("TopWallets", "SolanaWalletScanner")
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+# directory the scan workers of a case write their lookup latencies to, inherited through the environment
+LATENCY_DIR_ENV = "WALLETWAVE_BENCH_LATENCY_DIR"
+
+
+def percentile(values: list, q: float):
+    """ Nearest-rank percentile of a list of numbers, None if empty """
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _time_wallet_lookups(latencies: list) -> None:
+    """ Appends the duration of every GmgnRepo.get_wallet_info call of this process to latencies """
+    from WalletWave.repositories.gmgn_repo import GmgnRepo
+
+    get_wallet_info = GmgnRepo.get_wallet_info
+
+    async def timed_get_wallet_info(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await get_wallet_info(self, *args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    GmgnRepo.get_wallet_info = timed_get_wallet_info
+
+
+def _timed_scan_shard(*args, **kwargs) -> None:
+    """ Scan worker entry point that records its lookup latencies for the case process """
+    from WalletWave.utils import worker_pool
+
+    latencies = []
+    _time_wallet_lookups(latencies)
+    try:
+        worker_pool._scan_shard(*args, **kwargs)
+    finally:
+        (Path(os.environ[LATENCY_DIR_ENV]) / f"{os.getpid()}.json").write_text(json.dumps(latencies))
+
+
+def _write_config(workdir: Path, plugin: str, size: int, options: dict) -> Path:
+    wallet_file = workdir / "wallets.txt"
+    if plugin == "SolanaWalletScanner":
+        wallet_file.write_text("\n".join(wallet_addresses(size, options["seed"])))
+
+    config = {
+        "program_settings": {
+            "export_path": str(workdir / "data"),
+            "export_format": "csv",
+            "export_enabled": True,
+            "workers": options["workers"],
+            "request_delay": options["request_delay"],
+            "logging_level": "WARNING",
+        },
+        "plugin_settings": {
+            "TopWallets": {"timeframe": "7d", "wallet_tag": "smart_degen", "win_rate": 0},
+            "SolanaWalletScanner": {"timeframe": "7d", "wallet_file": str(wallet_file), "timeout": 0},
+        },
+    }
+    config_path = workdir / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    return config_path
+
+
+def _run_case(plugin_name: str, size: int, base_url: str, options: dict, results) -> None:
+    """ Process entry point of one benchmark case """
+    from WalletWave.utils.gmgn_client.utils.gmgn_endpoints import BASE_URL_ENV
+
+    os.environ[BASE_URL_ENV] = base_url  # inherited by scan workers
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        os.chdir(workdir)  # logs/ is created in the working directory
+        latency_dir = workdir / "latencies"
+        latency_dir.mkdir()
+        os.environ[LATENCY_DIR_ENV] = str(latency_dir)
+
+        from CLI.plugin_manager import PluginManager
+        from WalletWave.config import ConfigManager, parse_args
+        from WalletWave.main import WalletWave
+        from WalletWave.utils import worker_pool
+        from WalletWave.utils.logging_utils import init_logging
+
+        # time every wallet lookup, in this process and in the scan workers of the sharded path
+        latencies = []
+        _time_wallet_lookups(latencies)
+        worker_pool._scan_shard = _timed_scan_shard
+
+        manager = ConfigManager(parse_args(["--config", str(_write_config(workdir, plugin_name, size, options))]))
+        manager.interactive = False
+        init_logging(manager.config)
+
+        app = WalletWave(manager)
+        plugin_manager = PluginManager(config_manager=manager, services=app.services)
+        plugin_manager.load_plugins()
+        plugin = plugin_manager.get_plugin(plugin_name).load(manager, app.services)
+
+        started = time.perf_counter()
+        asyncio.run(app.run_plugins([plugin]))
+        elapsed = time.perf_counter() - started
+        for path in latency_dir.glob("*.json"):
+            latencies.extend(json.loads(path.read_text()))
+
+        exported = sum(1 for path in (workdir / "data").glob("*.csv") for _ in path.open()) - 1
+        metrics = app.services.metrics.to_dict()
+        results.put({
+            "plugin": plugin_name,
+            "wallets": size,
+            "workers": options["workers"],
+            "seconds": elapsed,
+            "wallets_per_sec": size / elapsed if elapsed else None,
+            "p50_ms": percentile(latencies, 0.50) * 1000 if latencies else None,
+            "p99_ms": percentile(latencies, 0.99) * 1000 if latencies else None,
+            "peak_rss_mb": _peak_rss_mb(),
+            "exported_rows": max(exported, 0),
+            "requests": {name: endpoint["requests"] for name, endpoint in metrics["endpoints"].items()},
+        })
+
+
+def run_case(plugin: str, size: int, base_url: str, options: dict) -> dict:
+    """
+    Runs one case in a fresh process.
+
+    :raises RuntimeError: If the process exits without a result or runs longer than options["case_timeout"].
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run_case, args=(plugin, size, base_url, options, results))
+    process.start()
+    deadline = time.monotonic() + options["case_timeout"]
+    try:
+        while True:
+            try:
+                return results.get(timeout=1)
+            except queue.Empty:
+                pass
+            if not process.is_alive():
+                try:  # the result may have been flushed as the process exited
+                    return results.get(timeout=1)
+                except queue.Empty:
+                    raise RuntimeError(f"{plugin} with {size:,} wallets exited with code {process.exitcode}")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{plugin} with {size:,} wallets timed out after {options['case_timeout']:g}s")
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_result(result: dict, baseline: dict = None) -> None:
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else "-"
+
+    line = (f"{result['plugin']:<22}{result['wallets']:>9,}{fmt(result['wallets_per_sec'], '>12,.1f')}"
+            f"{fmt(result['p50_ms'], '>10.2f')}{fmt(result['p99_ms'], '>10.2f')}{fmt(result['peak_rss_mb'], '>11.1f')}")
+    if baseline and baseline.get("wallets_per_sec") and result["wallets_per_sec"]:
+        line += f"   {result['wallets_per_sec'] / baseline['wallets_per_sec']:6.2f}x vs baseline"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark against a local GMGN stand-in")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma separated wallet counts")
+    parser.add_argument("--plugins", default=",".join(PLUGINS), help="Comma separated plugins to run")
+    parser.add_argument("--latency", default="fixed:0", help="Stand-in latency spec, e.g. lognormal:50:0.5 (ms)")
+    parser.add_argument("--workers", type=int, default=1, help="Scan worker processes")
+    parser.add_argument("--request-delay", type=float, default=0, help="Client request_delay in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Fixture random seed")
+    parser.add_argument("--case-timeout", type=float, default=3600, help="Seconds before a case is aborted")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/e2e_<commit>.json)")
+    parser.add_argument("--baseline", help="Previous result file to compare throughput with")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    plugins = [plugin.strip() for plugin in args.plugins.split(",")]
+    options = {"workers": args.workers, "request_delay": args.request_delay, "seed": args.seed,
+               "case_timeout": args.case_timeout}
+
+    baseline = {}
+    if args.baseline:
+        for result in json.loads(Path(args.baseline).read_text())["results"]:
+            baseline[(result["plugin"], result["wallets"])] = result
+
+    print(f"{'plugin':<22}{'wallets':>9}{'wallets/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak MiB':>11}")
+    results = []
+    for size in sizes:
+        with run_in_subprocess(latency=args.latency, rank_size=size, seed=args.seed) as base_url:
+            for plugin in plugins:
+                try:
+                    result = run_case(plugin, size, base_url, options)
+                except RuntimeError as e:
+                    print(f"{plugin:<22}{size:>9,}   failed: {e}")
+                    continue
+                results.append(result)
+                _print_result(result, baseline.get((plugin, size)))
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"e2e_{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"latency": args.latency, **options},
+        "results": results,
+    }, indent=2))
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
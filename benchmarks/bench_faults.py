@@ -0,0 +1,171 @@
+"""
+Goodput of the GMGN client under scripted throttling and network faults.
+
+Fetches wallet info for a list of wallets from a FaultyGmgnServer running a
+fault script (see ``mock_gmgn.py``), with the client retry policy given on
+the command line. Reports goodput (wallets fetched per second), wasted
+requests (answered without producing a wallet), the time spent backing off
+and the recovery time after every fault phase: from the arrival of its last
+faulted request to the arrival of the next request answered normally.
+Lookup latency percentiles show the effect of --hedge on slow responses.
+
+Usage:
+    python -m benchmarks.bench_faults --faults "ok*50,429*20:retry_after=2,ok*100" --backoff 5,10
+    python -m benchmarks.bench_faults --faults "ok*50,429*20:retry_after=2,ok*100" --backoff 0.5,1 --respect-retry-after
+    python -m benchmarks.bench_faults --faults "ok*50,slowloris*2:seconds=20,ok*50" --request-timeout 5
+    python -m benchmarks.bench_faults --faults "ok*500" --latency lognormal:20:1 --hedge
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from benchmarks.mock_gmgn import FaultyGmgnServer, wallet_addresses
+
+
+def recovery_times(server: FaultyGmgnServer) -> list:
+    """
+    :return: (phase, seconds) from the last faulted request of every phase to the next good one,
+             seconds is None if no good request followed.
+    """
+    last_fault = {}
+    for index, (at, phase_index, kind) in enumerate(server.events):
+        if kind != "ok" and phase_index is not None:
+            last_fault[phase_index] = (index, at)
+
+    recoveries = []
+    for phase_index, (index, at) in sorted(last_fault.items()):
+        recovered = next((t for t, _, kind in server.events[index + 1:] if kind == "ok"), None)
+        recoveries.append((repr(server.phases[phase_index]), recovered - at if recovered is not None else None))
+    return recoveries
+
+
+async def run(args) -> dict:
+    from WalletWave.repositories.gmgn_repo import GmgnRepo
+    from WalletWave.utils.gmgn_client.client import Gmgn
+    from WalletWave.utils.gmgn_client.utils.gmgn_endpoints import BASE_URL_ENV
+    from WalletWave.utils.gmgn_client.utils.hedging import HedgePolicy
+
+    server = FaultyGmgnServer(latency=args.latency, seed=args.seed, faults=args.faults)
+    os.environ[BASE_URL_ENV] = await server.start()
+
+    backoff = tuple(float(value) for value in args.backoff.split(","))
+    client = Gmgn(persistent=True, request_delay=args.request_delay, backoff_range=backoff,
+                  max_retries=args.max_retries, cookie_clear_after=args.cookie_clear_after,
+                  respect_retry_after=args.respect_retry_after, request_timeout=args.request_timeout or None,
+                  hedging=HedgePolicy(args.hedge_quantile, args.hedge_max_ratio) if args.hedge else None)
+    repo = GmgnRepo(client)
+    wallets = wallet_addresses(args.wallets, args.seed)
+    pending = iter(wallets)
+    fetched = 0
+    latencies = []
+
+    async def fetch_wallets():
+        nonlocal fetched
+        for wallet in pending:
+            lookup_started = time.perf_counter()
+            if await repo.get_wallet_info(wallet, period="7d"):
+                fetched += 1
+            latencies.append(time.perf_counter() - lookup_started)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(fetch_wallets() for _ in range(args.concurrency)))
+    finally:
+        elapsed = time.perf_counter() - started
+        await repo.aclose()
+        await server.close()
+
+    requests = sum(server.outcomes.values())
+    metrics = client.metrics.to_dict()
+    wallet_metrics = metrics["endpoints"].get("wallet_info", {})
+    latencies.sort()
+    return {
+        "faults": args.faults,
+        "policy": {
+            "backoff": backoff,
+            "max_retries": args.max_retries,
+            "cookie_clear_after": args.cookie_clear_after,
+            "respect_retry_after": args.respect_retry_after,
+            "request_timeout": args.request_timeout,
+            "request_delay": args.request_delay,
+            "concurrency": args.concurrency,
+            "hedge": {"quantile": args.hedge_quantile, "max_ratio": args.hedge_max_ratio} if args.hedge else None,
+        },
+        "wallets": len(wallets),
+        "fetched": fetched,
+        "failed": len(wallets) - fetched,
+        "seconds": elapsed,
+        "goodput": fetched / elapsed if elapsed else None,
+        "requests": requests,
+        "wasted_requests": requests - fetched,
+        "outcomes": dict(server.outcomes),
+        "client_status": wallet_metrics.get("status", {}),
+        "lookup_latency": {
+            **{
+                f"p{int(q * 100)}": latencies[min(int(q * len(latencies)), len(latencies) - 1)] if latencies else None
+                for q in (0.5, 0.95, 0.99)
+            },
+            "max": latencies[-1] if latencies else None,
+        },
+        "hedges": wallet_metrics.get("hedges", 0),
+        "hedge_wins": wallet_metrics.get("hedge_wins", 0),
+        "backoff_seconds": metrics["backoff_seconds"],
+        "header_rotations": metrics["header_rotations"],
+        "cookie_clears": metrics["cookie_clears"],
+        "recovery": recovery_times(server),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GMGN client goodput under injected faults")
+    parser.add_argument("--faults", default="ok*50,429*10,ok*50", help="Fault script, see benchmarks/mock_gmgn.py")
+    parser.add_argument("--wallets", type=int, default=200, help="Wallets to fetch")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent fetch loops sharing the client")
+    parser.add_argument("--latency", default="fixed:20", help="Stand-in latency spec (ms)")
+    parser.add_argument("--seed", type=int, default=0, help="Fixture random seed")
+    parser.add_argument("--request-delay", type=float, default=0, help="Minimum seconds between requests")
+    parser.add_argument("--backoff", default="5,10", help="MIN,MAX seconds to wait before a retry")
+    parser.add_argument("--max-retries", type=int, help="Retries per request (default: until success)")
+    parser.add_argument("--cookie-clear-after", type=int, default=3, help="Clear cookies after this many rejections")
+    parser.add_argument("--respect-retry-after", action="store_true", help="Wait as long as Retry-After asks")
+    parser.add_argument("--request-timeout", type=float, default=0, help="Seconds for a whole request (0 = no limit)")
+    parser.add_argument("--hedge", action="store_true", help="Hedge wallet lookups slower than the hedge quantile")
+    parser.add_argument("--hedge-quantile", type=float, default=0.99, help="Latency quantile after which a lookup is hedged")
+    parser.add_argument("--hedge-max-ratio", type=float, default=0.05, help="Maximum share of requests hedged")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Print the client's retry log")
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    else:
+        logging.getLogger().addHandler(logging.NullHandler())
+
+    result = asyncio.run(run(args))
+
+    print(f"fault script     {result['faults']}")
+    print(f"fetched          {result['fetched']}/{result['wallets']} wallets in {result['seconds']:.2f}s")
+    print(f"goodput          {result['goodput']:.2f} wallets/s")
+    print(f"requests         {result['requests']} ({result['wasted_requests']} wasted)")
+    print(f"server outcomes  {', '.join(f'{kind}={count}' for kind, count in sorted(result['outcomes'].items()))}")
+    latency = result["lookup_latency"]
+    print(f"lookup latency   p50 {latency['p50'] * 1000:.0f}ms, p95 {latency['p95'] * 1000:.0f}ms, "
+          f"p99 {latency['p99'] * 1000:.0f}ms, max {latency['max'] * 1000:.0f}ms")
+    if args.hedge:
+        print(f"hedges           {result['hedges']} sent, {result['hedge_wins']} answered first")
+    print(f"backoff          {result['backoff_seconds']:.2f}s, {result['header_rotations']} header rotations, "
+          f"{result['cookie_clears']} cookie clears")
+    for phase, seconds in result["recovery"]:
+        print(f"recovery         {phase:<16} {f'{seconds:.2f}s' if seconds is not None else 'never'}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
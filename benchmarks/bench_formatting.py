@@ -0,0 +1,53 @@
+"""
+Export formatting micro-benchmark.
+
+Formats full ``WalletInfo`` summary rows through the row and columnar paths of
+``file_utils`` and compares them with per-cell key classification.
+
+Usage:
+    python -m benchmarks.bench_formatting --rows 100000
+"""
+import argparse
+import time
+
+from WalletWave.utils import file_utils
+from benchmarks.fixtures import make_wallet_summaries
+
+
+def _classify_every_cell(item: dict) -> dict:
+    """ Reference implementation that classifies every key of every row """
+    item = file_utils._flatten_nested_dicts(item)
+    return {
+        key: formatter(value) if formatter else value
+        for key, value in item.items()
+        for formatter in (file_utils._resolve_formatter(key),)
+    }
+
+
+def _time(label: str, func, rows: int) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  {rows / elapsed:12,.0f} rows/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark export formatting")
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of WalletInfo rows to format")
+    parser.add_argument("--seed", type=int, default=0, help="Fixture random seed")
+    args = parser.parse_args()
+
+    rows = make_wallet_summaries(args.rows, seed=args.seed)
+    flat_rows = [file_utils._flatten_nested_dicts(row) for row in rows]
+    columns = {key: [row[key] for row in flat_rows] for key in flat_rows[0]}
+
+    print(f"Formatting {args.rows:,} rows x {len(flat_rows[0])} columns")
+    _time("per-cell classification", lambda: [_classify_every_cell(row) for row in rows], args.rows)
+    file_utils._column_plan.cache_clear()
+    _time("cached column plan (rows)", lambda: [file_utils._apply_formatting(row) for row in rows], args.rows)
+    _time("cached column plan (cols)", lambda: file_utils._apply_column_formatting(columns), args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Micro-benchmarks of the CPU hot paths.
+
+Covers response validation, wallet summaries, export formatting and header
+identity selection over schema-faithful fixtures. Every case reports the best
+ops/sec over several repeats, plus the memory it allocates: the bytes per op
+still held by the results and the peak of one batch, from tracemalloc in a
+separate pass so tracing does not skew the timings.
+
+Usage:
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --filter format --repeat 10
+    python -m benchmarks.bench_micro --output micro.json --baseline micro_old.json
+"""
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_e2e import git_commit
+from benchmarks.fixtures import make_address, make_wallet_info_response, make_wallet_summaries, make_wallets_response
+
+
+class Case:
+    """ One benchmarked call, run `ops` times per batch over pre-built inputs """
+
+    def __init__(self, name: str, func, inputs: list):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+
+    def batch(self, ops: int) -> list:
+        func, inputs = self.func, self.inputs
+        size = len(inputs)
+        return [func(inputs[index % size]) for index in range(ops)]
+
+
+def build_cases(seed: int, rank_size: int) -> list:
+    from WalletWave.utils import daily_profit, file_utils
+    from WalletWave.utils.formatting_utils import (format_currency, format_gmgn_time_period, format_percentage,
+                                                   format_timestamp)
+    from WalletWave.utils.gmgn_client.schemas import WalletInfoResponse, WalletsResponse
+    from WalletWave.utils.gmgn_client.utils.agent_mapper import AgentMapper
+    from WalletWave.utils.scoring import ScoringEngine, TopK
+
+    rng = random.Random(seed)
+    wallet_payloads = [make_wallet_info_response(rng) for _ in range(64)]
+    wallet_responses = [WalletInfoResponse.model_validate(payload) for payload in wallet_payloads]
+    summary_inputs = [(make_address(rng), response) for response in wallet_responses]
+    rank_payloads = [make_wallets_response(rng, rank_size) for _ in range(4)]
+    ranks = [WalletsResponse.model_validate(payload).rank for payload in rank_payloads]
+    summaries = make_wallet_summaries(256, seed)
+    flat_summaries = [file_utils._flatten_nested_dicts(summary) for summary in summaries]
+    fieldnames = set().union(*flat_summaries)
+    numbers = [rng.uniform(-1, 1) * 10 ** rng.randint(0, 6) for _ in range(256)]
+    timestamps = [rng.randint(1_600_000_000, 1_750_000_000) for _ in range(256)]
+    agent_mapper = AgentMapper()
+    scoring = ScoringEngine()
+    scores = [rng.random() for _ in range(10_000)]
+
+    def top_k(k):
+        shortlist = TopK(k)
+        for index, score in enumerate(scores):
+            shortlist.push(score, index)
+        return shortlist.items()
+
+    return [
+        Case("WalletInfoResponse.model_validate", WalletInfoResponse.model_validate, wallet_payloads),
+        Case(f"WalletsResponse.model_validate[{rank_size}]", WalletsResponse.model_validate, rank_payloads),
+        Case("WalletInfoResponse.to_summary", lambda args: args[1].to_summary(args[0]), summary_inputs),
+        Case("file_utils._flatten_nested_dicts", file_utils._flatten_nested_dicts, summaries),
+        Case("file_utils._apply_formatting", file_utils._apply_formatting, summaries),
+        Case(f"file_utils._sort_fieldnames[{len(fieldnames)}]", file_utils._sort_fieldnames, [fieldnames]),
+        Case("format_timestamp", format_timestamp, timestamps),
+        Case("format_percentage", format_percentage, numbers),
+        Case("format_currency", format_currency, numbers),
+        Case("format_gmgn_time_period", format_gmgn_time_period, [abs(number) for number in numbers]),
+        Case(f"daily_profit numpy[{rank_size}]", lambda rank: daily_profit._metrics_numpy(rank, 7), ranks),
+        Case(f"daily_profit python[{rank_size}]", lambda rank: daily_profit._metrics_python(rank, 7), ranks),
+        Case("ScoringEngine.score", scoring.score, summaries),
+        Case("TopK.push[10000 -> 50]", top_k, [50]),
+        Case("AgentMapper.get_random_client_and_agent", lambda _: agent_mapper.get_random_client_and_agent(), [None]),
+    ]
+
+
+def calibrate(case: Case, min_seconds: float) -> int:
+    """ :return: Number of ops per batch so that a batch takes about min_seconds """
+    ops = 1
+    while True:
+        started = time.perf_counter()
+        case.batch(ops)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds or ops >= 10_000_000:
+            return ops
+        ops = max(ops * 2, int(ops * min_seconds / max(elapsed, 1e-9)))
+
+
+def measure(case: Case, repeat: int, min_seconds: float) -> dict:
+    ops = calibrate(case, min_seconds)
+    best = min(_timed(case, ops) for _ in range(repeat))
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        results = case.batch(ops)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+
+    return {
+        "case": case.name,
+        "ops": ops,
+        "ops_per_sec": ops / best,
+        "us_per_op": best / ops * 1e6,
+        "retained_bytes_per_op": (current - before) / ops,
+        "peak_kib": (peak - before) / 1024,
+    }
+
+
+def _timed(case: Case, ops: int) -> float:
+    started = time.perf_counter()
+    case.batch(ops)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the CPU hot paths")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case, the best one is reported")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timed batch")
+    parser.add_argument("--rank-size", type=int, default=100, help="Wallets per rank response")
+    parser.add_argument("--seed", type=int, default=0, help="Fixture random seed")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Previous result file to compare ops/sec with")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        baseline = {result["case"]: result for result in json.loads(Path(args.baseline).read_text())["results"]}
+
+    cases = [case for case in build_cases(args.seed, args.rank_size) if args.filter in case.name]
+    print(f"{'case':<44}{'ops/s':>14}{'us/op':>11}{'B/op kept':>11}{'peak KiB':>11}")
+    results = []
+    for case in cases:
+        result = measure(case, args.repeat, args.min_time)
+        results.append(result)
+        line = (f"{case.name:<44}{result['ops_per_sec']:>14,.0f}{result['us_per_op']:>11.2f}"
+                f"{result['retained_bytes_per_op']:>11.0f}{result['peak_kib']:>11.1f}")
+        if case.name in baseline:
+            line += f"   {result['ops_per_sec'] / baseline[case.name]['ops_per_sec']:6.2f}x vs baseline"
+        print(line)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            "commit": git_commit(),
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {"repeat": args.repeat, "min_time": args.min_time, "rank_size": args.rank_size,
+                         "seed": args.seed},
+            "results": results,
+        }, indent=2))
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
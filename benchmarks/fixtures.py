@@ -0,0 +1,310 @@
+"""
+Synthetic but schema-faithful GMGN payloads for the benchmark suites.
+
+Every generator is seeded so two runs (or two commits) produce the same data.
+"""
+import random
+import string
+import time
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def make_address(rng: random.Random) -> str:
+    """ Returns a random base58 string shaped like a Solana address """
+    return "".join(rng.choice(BASE58_ALPHABET) for _ in range(44))
+
+
+def make_wallet_info(rng: random.Random) -> dict:
+    """
+    Builds the ``data`` object of a walletNew response with every WalletInfo field populated.
+
+    :param rng: Seeded random generator.
+    :return: Dictionary that validates as WalletInfo.
+    """
+    now = int(time.time())
+    buy_7d, sell_7d = rng.randint(0, 500), rng.randint(0, 500)
+    return {
+        "twitter_bind": rng.random() < 0.2,
+        "twitter_fans_num": rng.randint(0, 50_000),
+        "eth_balance": "0",
+        "sol_balance": f"{rng.uniform(0, 500):.9f}",
+        "trx_balance": "0",
+        "balance": f"{rng.uniform(0, 500):.9f}",
+        "total_value": rng.uniform(0, 1_000_000),
+        "unrealized_profit": rng.uniform(-50_000, 50_000),
+        "unrealized_pnl": rng.uniform(-1, 5),
+        "realized_profit": rng.uniform(-50_000, 250_000),
+        "pnl": rng.uniform(-1, 5),
+        "pnl_7d": rng.uniform(-1, 5),
+        "pnl_30d": rng.uniform(-1, 5),
+        "realized_profit_7d": rng.uniform(-50_000, 250_000),
+        "realized_profit_30d": rng.uniform(-50_000, 250_000),
+        "all_pnl": rng.uniform(-1, 5),
+        "total_profit": rng.uniform(-50_000, 250_000),
+        "total_profit_pnl": rng.uniform(-1, 5),
+        "buy_30d": buy_7d * 4,
+        "sell_30d": sell_7d * 4,
+        "buy_7d": buy_7d,
+        "sell_7d": sell_7d,
+        "buy": buy_7d * 10,
+        "sell": sell_7d * 10,
+        "last_active_timestamp": now - rng.randint(0, 7 * 86_400),
+        "followers_count": rng.randint(0, 5_000),
+        "is_contract": False,
+        "updated_at": now,
+        "token_num": rng.randint(0, 300),
+        "pnl_lt_minus_dot5_num": rng.randint(0, 50),
+        "pnl_minus_dot5_0x_num": rng.randint(0, 50),
+        "pnl_lt_2x_num": rng.randint(0, 50),
+        "pnl_2x_5x_num": rng.randint(0, 20),
+        "pnl_gt_5x_num": rng.randint(0, 10),
+        "avg_holding_peroid": rng.uniform(0, 30 * 86_400),
+        "profit_num": rng.randint(0, 200),
+        "token_avg_cost": rng.uniform(0, 5_000),
+        "token_sold_avg_profit": rng.uniform(-2_000, 10_000),
+        "history_bought_cost": rng.uniform(0, 1_000_000),
+        "winrate": rng.random(),
+        "twitter_username": None,
+        "twitter_name": None,
+        "ens": None,
+        "avatar": None,
+        "name": "".join(rng.choice(string.ascii_lowercase) for _ in range(8)),
+        "tags": rng.sample(["smart_degen", "pump_smart", "snipe_bot", "kol"], k=rng.randint(0, 2)),
+        "tag_rank": {"fresh_wallet": None},
+        "refresh_requested_at": None,
+        "risk": {
+            "token_active": str(rng.randint(0, 300)),
+            "token_honeypot": str(rng.randint(0, 10)),
+            "token_honeypot_ratio": rng.random() * 0.1,
+            "no_buy_hold": str(rng.randint(0, 10)),
+            "no_buy_hold_ratio": rng.random() * 0.1,
+            "sell_pass_buy": str(rng.randint(0, 10)),
+            "sell_pass_buy_ratio": rng.random() * 0.1,
+            "fast_tx": str(rng.randint(0, 10)),
+            "fast_tx_ratio": rng.random() * 0.1,
+        },
+    }
+
+
+def make_wallet_info_response(rng: random.Random) -> dict:
+    """ Wraps a WalletInfo payload in the walletNew response envelope """
+    return {"code": 0, "msg": "success", "data": make_wallet_info(rng)}
+
+
+def make_rank_entry(rng: random.Random, address: str = None) -> dict:
+    """
+    Builds one entry of a rank (trending wallets) response.
+
+    :param rng: Seeded random generator.
+    :param address: Wallet address, random if omitted.
+    :return: Dictionary that validates as RankEntry.
+    """
+    address = address or make_address(rng)
+    now = int(time.time())
+    day = now - now % 86_400
+    buy_30d, sell_30d = rng.randint(0, 2_000), rng.randint(0, 2_000)
+    return {
+        "wallet_address": address,
+        "address": address,
+        "realized_profit": rng.uniform(-50_000, 250_000),
+        "buy": buy_30d * 3,
+        "sell": sell_30d * 3,
+        "last_active": now - rng.randint(0, 86_400),
+        "realized_profit_1d": rng.uniform(-5_000, 25_000),
+        "realized_profit_7d": rng.uniform(-20_000, 100_000),
+        "realized_profit_30d": rng.uniform(-50_000, 250_000),
+        "pnl_30d": rng.uniform(-1, 5),
+        "pnl_7d": rng.uniform(-1, 5),
+        "pnl_1d": rng.uniform(-1, 2),
+        "txs_30d": buy_30d + sell_30d,
+        "buy_30d": buy_30d,
+        "sell_30d": sell_30d,
+        "balance": rng.uniform(0, 500),
+        "eth_balance": rng.uniform(0, 500),
+        "sol_balance": rng.uniform(0, 500),
+        "trx_balance": rng.uniform(0, 500),
+        "twitter_username": None,
+        "avatar": None,
+        "ens": None,
+        "tag": "smart_degen",
+        "tag_rank": {"fresh_wallet": None},
+        "nickname": None,
+        "tags": rng.sample(["smart_degen", "pump_smart", "snipe_bot", "kol"], k=rng.randint(0, 2)),
+        "twitter_name": None,
+        "followers_count": rng.randint(0, 5_000),
+        "is_blue_verified": 0,
+        "twitter_description": None,
+        "name": None,
+        "avg_hold_time": rng.randint(0, 30 * 86_400),
+        "recent_buy_tokens": [
+            {"address": make_address(rng), "name": "".join(rng.choice(string.ascii_uppercase) for _ in range(4)),
+             "symbol": "".join(rng.choice(string.ascii_uppercase) for _ in range(4)), "timestamp": now - i * 600}
+            for i in range(rng.randint(0, 3))
+        ],
+        "winrate_7d": rng.random(),
+        "avg_cost_7d": rng.uniform(0, 5_000),
+        "pnl_lt_minus_dot5_num_7d": rng.randint(0, 50),
+        "pnl_minus_dot5_0x_num_7d": rng.randint(0, 50),
+        "pnl_lt_2x_num_7d": rng.randint(0, 50),
+        "pnl_2x_5x_num_7d": rng.randint(0, 20),
+        "pnl_gt_5x_num_7d": rng.randint(0, 10),
+        "pnl_lt_minus_dot5_num_7d_ratio": rng.random(),
+        "pnl_minus_dot5_0x_num_7d_ratio": rng.random(),
+        "pnl_lt_2x_num_7d_ratio": rng.random(),
+        "pnl_2x_5x_num_7d_ratio": rng.random(),
+        "pnl_gt_5x_num_7d_ratio": rng.random(),
+        "daily_profit_7d": [
+            {"timestamp": day - i * 86_400, "profit": rng.uniform(-5_000, 15_000)} for i in range(7)
+        ],
+        "txs": buy_30d + sell_30d,
+        "token_num_7d": rng.randint(0, 300),
+        "avg_holding_period_7d": rng.uniform(0, 7 * 86_400),
+    }
+
+
+def make_wallets_response(rng: random.Random, count: int, addresses: list = None) -> dict:
+    """
+    Builds a rank (trending wallets) response.
+
+    :param rng: Seeded random generator.
+    :param count: Number of rank entries.
+    :param addresses: Wallet addresses to use, random if omitted.
+    """
+    addresses = addresses or [make_address(rng) for _ in range(count)]
+    return {"code": 0, "msg": "success", "data": {"rank": [make_rank_entry(rng, address) for address in addresses[:count]]}}
+
+
+def make_token_info(rng: random.Random, address: str = None) -> dict:
+    """
+    Builds the token info payload of the tokens endpoint.
+
+    :param rng: Seeded random generator.
+    :param address: Token contract address, random if omitted.
+    :return: Dictionary that validates as TokenInfo.
+    """
+    symbol = "".join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(3, 6)))
+    price = rng.uniform(0.000001, 2)
+    return {
+        "chain": "sol",
+        "address": address or make_address(rng),
+        "symbol": symbol,
+        "name": symbol.title(),
+        "decimals": rng.choice([6, 9]),
+        "logo": None,
+        "price": price,
+        "price_1h": price * rng.uniform(0.8, 1.2),
+        "price_24h": price * rng.uniform(0.5, 1.5),
+        "swaps_5m": rng.randint(0, 500),
+        "swaps_1h": rng.randint(0, 5_000),
+        "swaps_6h": rng.randint(0, 30_000),
+        "swaps_24h": rng.randint(0, 100_000),
+        "volume_24h": rng.uniform(0, 5_000_000),
+        "liquidity": rng.uniform(0, 2_000_000),
+        "total_supply": rng.randint(10 ** 8, 10 ** 12),
+        "is_in_token_list": rng.random() < 0.1,
+        "hot_level": rng.randint(0, 3),
+        "is_show_alert": False,
+        "buy_tax": None,
+        "sell_tax": None,
+        "is_honeypot": None,
+        "renounced": rng.random() < 0.8,
+        "top_10_holder_rate": rng.random(),
+        "renounced_mint": 1,
+        "renounced_freeze_account": 1,
+        "burn_ratio": f"{rng.random():.4f}",
+        "burn_status": "burn",
+    }
+
+
+def make_token_info_response(rng: random.Random, address: str = None) -> dict:
+    """ Wraps a TokenInfo payload in the tokens response envelope """
+    return {"code": 0, "msg": "success", "data": [make_token_info(rng, address)]}
+
+
+def make_holder_status(rng: random.Random) -> dict:
+    """ Builds the holder status block (statusNow/statusOld) of the top holders response """
+    return {
+        "hold": rng.randint(0, 100),
+        "bought_more": rng.randint(0, 50),
+        "sold_part": rng.randint(0, 50),
+        "sold": rng.randint(0, 50),
+        "transfered": rng.randint(0, 10),
+        "bought_rate": f"{rng.random():.4f}",
+        "holding_rate": f"{rng.random():.4f}",
+        "top_10_holder_rate": rng.random(),
+        "smart_pos": [],
+        "smart_count_hold": rng.randint(0, 20),
+        "smart_count_bought_more": rng.randint(0, 10),
+        "smart_count_sold_part": rng.randint(0, 10),
+        "smart_count_sold": rng.randint(0, 10),
+        "smart_count_transfered": rng.randint(0, 5),
+        "transfer_pos": [],
+    }
+
+
+def make_holder_info(rng: random.Random, token_address: str, wallet_address: str = None) -> dict:
+    """
+    Builds one holder of the top holders endpoint.
+
+    :return: Dictionary that validates as HolderInfo.
+    """
+    bought = rng.uniform(0, 10 ** 9)
+    sold = bought * rng.random()
+    realized = rng.uniform(-5_000, 50_000)
+    unrealized = rng.uniform(-5_000, 50_000)
+    return {
+        "token_address": token_address,
+        "wallet_address": wallet_address or make_address(rng),
+        "first_bought_amount": f"{bought * rng.random():.2f}",
+        "first_bought_tax_amount": "0",
+        "buy_amount": f"{bought:.2f}",
+        "sell_amount": f"{sold:.2f}",
+        "is_fast_sniper": int(rng.random() < 0.05),
+        "balance": f"{bought - sold:.2f}",
+        "history_bought_amount": f"{bought:.2f}",
+        "history_sold_amount": f"{sold:.2f}",
+        "status": rng.choice(["hold", "bought_more", "sold_part", "sold"]),
+        "maker_token_tags": rng.sample(["smart_degen", "sniper", "bundler", "fresh_wallet"], rng.randint(0, 2)),
+        "tags": [],
+        "profit": realized + unrealized,
+        "realized_profit": realized,
+        "unrealized_profit": unrealized,
+        "total_cost": rng.uniform(0, 20_000),
+    }
+
+
+def make_top_holders_response(rng: random.Random, token_address: str, wallet_addresses: list) -> dict:
+    """
+    Builds a top holders response for a token.
+
+    :param wallet_addresses: Addresses of the holders, one HolderInfo each.
+    :return: Dictionary that validates as TopHoldersResponse.
+    """
+    return {
+        "code": 0,
+        "msg": "success",
+        "data": {
+            "chain": "sol",
+            "holder_count": len(wallet_addresses) + rng.randint(0, 10_000),
+            "statusNow": make_holder_status(rng),
+            "statusOld": make_holder_status(rng),
+            "sold_diff": rng.randint(-10, 10),
+            "sold_part_diff": rng.randint(-10, 10),
+            "hold_diff": rng.randint(-10, 10),
+            "bought_more": rng.randint(0, 20),
+            "holderInfo": [make_holder_info(rng, token_address, address) for address in wallet_addresses],
+        },
+    }
+
+
+def make_wallet_summaries(count: int, seed: int = 0) -> list:
+    """
+    Builds ``count`` rows shaped like ``WalletInfoResponse.to_summary`` without a summary function.
+
+    :param count: Number of rows.
+    :param seed: Random seed.
+    :return: List of summary dictionaries (wallet_address + full WalletInfo dump).
+    """
+    rng = random.Random(seed)
+    return [{"wallet_address": make_address(rng), **make_wallet_info(rng)} for _ in range(count)]
@@ -0,0 +1,440 @@
+"""
+Local GMGN stand-in for the benchmark suites.
+
+Serves schema-faithful rank, walletNew, token and top holders payloads (see ``fixtures.py``)
+over plain HTTP/1.1 with keep-alive, after a latency drawn from a configurable
+distribution. With --gzip, bodies are gzip-encoded for clients that accept it, like
+the real API.
+
+Usage:
+    python -m benchmarks.mock_gmgn --port 8787 --latency lognormal:80:0.5 --rank-size 1000
+
+    WALLETWAVE_GMGN_BASE_URL=http://127.0.0.1:8787/defi/quotation walletwave run TopWallets
+
+Latency specs (milliseconds):
+    fixed:MS                  every response after MS
+    uniform:LOW:HIGH          uniformly distributed
+    normal:MEAN:STDDEV        normal, clipped at 0
+    lognormal:MEDIAN:SIGMA    log-normal, long right tail like a real API
+    exp:MEAN                  exponential
+
+Fault scripts (--faults) are comma separated phases of KIND*COUNT, applied to
+consecutive requests in order; requests after the last phase are answered
+normally. Phases take optional ":retry_after=SECONDS" (403/429/500) or
+":seconds=SECONDS" (timeout, slowloris) parameters:
+    ok*200,429*30:retry_after=2,ok*200,reset*5,timeout*3:seconds=30,slowloris*2
+
+Fault kinds:
+    ok          normal response
+    403/429/500 error status, with a Retry-After header if retry_after is set
+    timeout     accept the request and never answer, close after `seconds`
+    reset       drop the connection without answering
+    slowloris   send the body one byte per second for `seconds`, then the rest
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import multiprocessing
+import random
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+from benchmarks.fixtures import (make_address, make_rank_entry, make_token_info_response, make_top_holders_response,
+                                 make_wallet_info_response)
+
+PREFIX = "/defi/quotation"
+RANK_PATH = PREFIX + "/v1/rank/sol/wallets/"
+WALLET_INFO_PATH = PREFIX + "/v1/smartmoney/sol/walletNew/"
+TOKEN_INFO_PATH = PREFIX + "/v1/tokens/sol/"
+TOP_HOLDERS_PATH = PREFIX + "/v1/tokens/top_holders/sol/"
+
+_ADDRESS_PLACEHOLDER = "@@ADDRESS@@"
+
+
+class LatencyModel:
+    """ Response latency distribution, parsed from a spec such as "lognormal:80:0.5" """
+
+    def __init__(self, spec: str = "fixed:0", seed: int = 0):
+        self.spec = spec
+        self._rng = random.Random(seed)
+        kind, *params = spec.split(":")
+        try:
+            params = [float(param) for param in params]
+        except ValueError:
+            raise ValueError(f"Invalid latency spec: {spec}")
+
+        rng = self._rng
+        samplers = {
+            "fixed": (1, lambda ms: ms),
+            "uniform": (2, lambda low, high: rng.uniform(low, high)),
+            "normal": (2, lambda mean, stddev: max(rng.gauss(mean, stddev), 0.0)),
+            "lognormal": (2, lambda median, sigma: rng.lognormvariate(0, sigma) * median),
+            "exp": (1, lambda mean: rng.expovariate(1 / mean) if mean else 0.0),
+        }
+        if kind not in samplers or len(params) != samplers[kind][0]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+        sampler = samplers[kind][1]
+        self._sample = lambda: sampler(*params)
+
+    def sample(self) -> float:
+        """ :return: The next latency in seconds """
+        return self._sample() / 1000
+
+
+def wallet_addresses(count: int, seed: int = 0) -> List[str]:
+    """ The wallet addresses ranked by a stand-in started with the same rank size and seed """
+    rng = random.Random(seed)
+    return [make_address(rng) for _ in range(count)]
+
+
+class MockGmgnServer:
+    """
+    Asyncio HTTP server answering the GMGN endpoints used by WalletWave.
+
+    Bodies are pre-encoded from a pool of fixtures, so serving costs little CPU and the client side
+    dominates the measurements. Unknown paths get a 404.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: str = "fixed:0", rank_size: int = 100,
+                 seed: int = 0, pool_size: int = 256, gzip: bool = False):
+        """
+        :param host: Interface to bind.
+        :param port: Port to bind, 0 picks a free one.
+        :param latency: Latency spec, see the module docstring.
+        :param rank_size: Number of wallets returned by the rank endpoint.
+        :param seed: Fixture seed.
+        :param pool_size: Number of distinct walletNew/token payloads served.
+        :param gzip: Gzip-encode bodies when the request accepts it.
+        """
+        self.host = host
+        self.port = port
+        self.latency = LatencyModel(latency, seed)
+        self.rank_size = rank_size
+        self.seed = seed
+        self.gzip = gzip
+        self.requests = {"rank": 0, "wallet_info": 0, "token_info": 0, "top_holders": 0, "not_found": 0}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+        rng = random.Random(seed + 1)
+        self._wallet_bodies = [json.dumps(make_wallet_info_response(rng)).encode() for _ in range(pool_size)]
+        self._token_templates = [
+            json.dumps(make_token_info_response(rng, _ADDRESS_PLACEHOLDER)) for _ in range(pool_size)
+        ]
+        self.pool_size = pool_size
+        self._ranked = wallet_addresses(rank_size, seed)
+        self._rank_body = self._build_rank_body(rng, self._ranked, pool_size)
+        self._rank_variants = {}  # (timeframe, tag) -> body of the other ranks
+
+    @staticmethod
+    def _build_rank_body(rng: random.Random, addresses: List[str], pool_size: int) -> bytes:
+        entries = [json.dumps(make_rank_entry(rng, _ADDRESS_PLACEHOLDER)) for _ in range(min(pool_size, len(addresses)) or 1)]
+        rank = ",".join(
+            entries[index % len(entries)].replace(_ADDRESS_PLACEHOLDER, address)
+            for index, address in enumerate(addresses)
+        )
+        return f'{{"code":0,"msg":"success","data":{{"rank":[{rank}]}}}}'.encode()
+
+    @property
+    def base_url(self) -> str:
+        """ Value for WALLETWAVE_GMGN_BASE_URL """
+        return f"http://{self.host}:{self.port}{PREFIX}"
+
+    def route(self, target: str):
+        """
+        :param target: Request path, with its query string.
+        :return: (status, body) for a request.
+        """
+        path, _, query = target.partition("?")
+        if path.startswith(RANK_PATH):
+            self.requests["rank"] += 1
+            return 200, self._rank(path[len(RANK_PATH):], parse_qs(query).get("tag", ["smart_degen"])[0])
+        if path.startswith(WALLET_INFO_PATH):
+            self.requests["wallet_info"] += 1
+            address = path[len(WALLET_INFO_PATH):]
+            return 200, self._wallet_bodies[zlib.crc32(address.encode()) % len(self._wallet_bodies)]
+        if path.startswith(TOP_HOLDERS_PATH):
+            self.requests["top_holders"] += 1
+            return 200, self._top_holders_body(path[len(TOP_HOLDERS_PATH):])
+        if path.startswith(TOKEN_INFO_PATH):
+            self.requests["token_info"] += 1
+            address = path[len(TOKEN_INFO_PATH):]
+            template = self._token_templates[zlib.crc32(address.encode()) % len(self._token_templates)]
+            return 200, template.replace(_ADDRESS_PLACEHOLDER, address).encode()
+        self.requests["not_found"] += 1
+        return 404, b'{"code":404,"msg":"not found"}'
+
+    def _rank(self, timeframe: str, tag: str) -> bytes:
+        """
+        The 7d smart_degen rank lists wallet_addresses(rank_size, seed). Every other timeframe/tag
+        shares half of its wallets with it, the other half only appears in that rank.
+        """
+        if (timeframe, tag) == ("7d", "smart_degen"):
+            return self._rank_body
+        body = self._rank_variants.get((timeframe, tag))
+        if body is None:
+            rng = random.Random(zlib.crc32(f"{timeframe}/{tag}".encode()) ^ self.seed)
+            shared = rng.sample(self._ranked, len(self._ranked) // 2)
+            addresses = shared + [make_address(rng) for _ in range(len(self._ranked) - len(shared))]
+            rng.shuffle(addresses)
+            body = self._rank_variants[(timeframe, tag)] = self._build_rank_body(rng, addresses, self.pool_size)
+        return body
+
+    def _top_holders_body(self, token: str, holders: int = 20) -> bytes:
+        """ Holders of a token, a quarter of them taken from the ranked wallets so crawls can go deeper """
+        rng = random.Random(zlib.crc32(token.encode()) ^ self.seed)
+        addresses = [
+            rng.choice(self._ranked) if self._ranked and index % 4 == 0 else make_address(rng)
+            for index in range(holders)
+        ]
+        return json.dumps(make_top_holders_response(rng, token, addresses)).encode()
+
+    async def respond(self, writer: asyncio.StreamWriter, path: str, headers: dict) -> bool:
+        """
+        Answers one request.
+
+        :return: False to close the connection.
+        """
+        status, body = self.route(path)
+        delay = self.latency.sample()
+        if delay:
+            await asyncio.sleep(delay)
+        extra_headers = None
+        if self.gzip and "gzip" in headers.get("accept-encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            extra_headers = {"Content-Encoding": "gzip"}
+        self.write_response(writer, status, body, extra_headers)
+        await writer.drain()
+        return True
+
+    @staticmethod
+    def write_response(writer: asyncio.StreamWriter, status: int, body: bytes, extra_headers: dict = None) -> None:
+        reasons = {200: "OK", 403: "Forbidden", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+        headers = "".join(f"{name}: {value}\r\n" for name, value in (extra_headers or {}).items())
+        writer.write(
+            f"HTTP/1.1 {status} {reasons.get(status, 'Unknown')}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n{headers}\r\n".encode() + body
+        )
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                target = parts[1] if len(parts) > 1 else "/"
+                if not await self.respond(writer, target, headers) or headers.get("connection") == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        """
+        Starts listening.
+
+        :return: The base URL to point the client at.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.base_url
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+FAULT_KINDS = ("ok", "403", "429", "500", "timeout", "reset", "slowloris")
+
+
+class FaultPhase:
+    """ KIND*COUNT phase of a fault script """
+
+    def __init__(self, kind: str, count: int, retry_after: Optional[float] = None, seconds: float = 30.0):
+        if kind not in FAULT_KINDS:
+            raise ValueError(f"Unknown fault kind: {kind}")
+        self.kind = kind
+        self.count = count
+        self.retry_after = retry_after
+        self.seconds = seconds
+
+    def __repr__(self):
+        return f"{self.kind}*{self.count}"
+
+
+def parse_fault_script(script: str) -> List[FaultPhase]:
+    """
+    Parses a fault script such as "ok*100,429*20:retry_after=3,reset*5", see the module docstring.
+    """
+    phases = []
+    for item in filter(None, (item.strip() for item in script.split(","))):
+        phase, *options = item.split(":")
+        kind, _, count = phase.partition("*")
+        kwargs = {}
+        for option in options:
+            name, _, value = option.partition("=")
+            if name not in ("retry_after", "seconds"):
+                raise ValueError(f"Unknown fault option: {option}")
+            kwargs[name] = float(value)
+        try:
+            phases.append(FaultPhase(kind, int(count or 1), **kwargs))
+        except ValueError as e:
+            raise ValueError(f"Invalid fault phase {item!r}: {e}")
+    return phases
+
+
+class FaultyGmgnServer(MockGmgnServer):
+    """
+    MockGmgnServer that answers requests according to a fault script.
+
+    Every request is recorded in `events` as (arrival time, phase index, kind), so a harness can tell
+    when a fault burst ended and when the client got through again.
+    """
+
+    def __init__(self, *args, faults: str = "", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.phases = parse_fault_script(faults)
+        self.outcomes = Counter()
+        self.events = []  # (perf_counter at arrival, phase index or None after the script, kind)
+        self._served = 0
+        self._closing: Optional[asyncio.Event] = None
+
+    def next_fault(self):
+        """
+        :return: (phase index, phase) for the next request, (None, None) once the script is over.
+        """
+        index = self._served
+        self._served += 1
+        for phase_index, phase in enumerate(self.phases):
+            if index < phase.count:
+                return phase_index, phase
+            index -= phase.count
+        return None, None
+
+    async def _wait(self, seconds: float) -> None:
+        """ Sleeps, returning early when the server shuts down """
+        try:
+            await asyncio.wait_for(self._closing.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def respond(self, writer: asyncio.StreamWriter, path: str, headers: dict) -> bool:
+        phase_index, phase = self.next_fault()
+        kind = phase.kind if phase else "ok"
+        self.outcomes[kind] += 1
+        self.events.append((time.perf_counter(), phase_index, kind))
+        return await self._respond(writer, path, headers, phase)
+
+    async def _respond(self, writer: asyncio.StreamWriter, path: str, headers: dict, phase: Optional[FaultPhase]) -> bool:
+        kind = phase.kind if phase else "ok"
+        if kind == "ok":
+            keep_alive = await super().respond(writer, path, headers)
+        elif kind in ("403", "429", "500"):
+            status = int(kind)
+            extra_headers = {"Retry-After": f"{phase.retry_after:g}"} if phase.retry_after is not None else None
+            self.write_response(writer, status, json.dumps({"code": status, "msg": "fault injected"}).encode(),
+                                extra_headers)
+            await writer.drain()
+            keep_alive = True
+        elif kind == "timeout":
+            await self._wait(phase.seconds)
+            keep_alive = False
+        elif kind == "reset":
+            writer.transport.abort()
+            keep_alive = False
+        else:  # slowloris
+            status, body = self.route(path)
+            head, rest = body[:int(phase.seconds)], body[int(phase.seconds):]
+            writer.write(f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode())
+            for byte in head:
+                writer.write(bytes((byte,)))
+                await writer.drain()
+                await self._wait(1)
+                if self._closing.is_set():
+                    return False
+            writer.write(rest)
+            await writer.drain()
+            keep_alive = True
+        return keep_alive
+
+    async def start(self) -> str:
+        self._closing = asyncio.Event()
+        return await super().start()
+
+    async def close(self) -> None:
+        if self._closing is not None:
+            self._closing.set()
+        await super().close()
+
+
+def _serve(server_kwargs: dict, ready) -> None:
+    async def serve():
+        server = FaultyGmgnServer(**server_kwargs) if server_kwargs.get("faults") else MockGmgnServer(**server_kwargs)
+        ready.put(await server.start())
+        await asyncio.Event().wait()  # until terminated
+
+    asyncio.run(serve())
+
+
+@contextmanager
+def run_in_subprocess(**server_kwargs):
+    """
+    Runs a MockGmgnServer in its own process so serving does not compete with the measured client.
+
+    :param server_kwargs: MockGmgnServer arguments.
+    :return: Context manager yielding the base URL.
+    """
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    process = context.Process(target=_serve, args=(server_kwargs, ready), daemon=True)
+    process.start()
+    try:
+        yield ready.get(timeout=600)
+    finally:
+        process.terminate()
+        process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local GMGN stand-in")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8787, help="Port to bind")
+    parser.add_argument("--latency", default="fixed:0", help="Latency spec, e.g. lognormal:80:0.5 (ms)")
+    parser.add_argument("--rank-size", type=int, default=100, help="Number of wallets returned by the rank endpoint")
+    parser.add_argument("--seed", type=int, default=0, help="Fixture random seed")
+    parser.add_argument("--faults", default="", help="Fault script, e.g. ok*100,429*20:retry_after=3,reset*5")
+    parser.add_argument("--gzip", action="store_true", help="Gzip-encode bodies for clients that accept it")
+    args = parser.parse_args()
+
+    async def serve():
+        server_args = (args.host, args.port, args.latency, args.rank_size, args.seed)
+        server_kwargs = {"gzip": args.gzip}
+        server = (FaultyGmgnServer(*server_args, faults=args.faults, **server_kwargs) if args.faults
+                  else MockGmgnServer(*server_args, **server_kwargs))
+        print(f"Serving GMGN stand-in, set WALLETWAVE_GMGN_BASE_URL={await server.start()}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
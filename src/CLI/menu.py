@@ -1,7 +1,7 @@
 from CLI import banner, plugin_manager
 
-def menu(config_manager):
-    pm = plugin_manager.PluginManager(config_manager=config_manager)
+def menu(config_manager, services=None):
+    pm = plugin_manager.PluginManager(config_manager=config_manager, services=services)
     pm.load_plugins()
 
     banner.print_wave_banner()
@@ -42,11 +42,13 @@ def menu(config_manager):
                     print("Invalid plugin number.")
                     continue
 
-                selected_plugin = pm.plugins[plugin_choice - 1]
-                print(f"Selected Plugin: {selected_plugin.get_name()}")
+                print(f"Selected Plugin: {pm.plugins[plugin_choice - 1].name}")
+                selected_plugin = pm.select_plugin(plugin_choice - 1)
                 return "plugin", selected_plugin
             except ValueError:
                 print("Invalid input. Please enter a number.")
+            except Exception as e:
+                print(f"Failed to load plugin: {e}")
         else:
             print("Invalid choice.")
 
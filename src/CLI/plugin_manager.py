@@ -1,19 +1,198 @@
+import ast
+import builtins
 import importlib
 import logging
 import os
 import inspect
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from WalletWave.plugins.utils.plugin_interface import PluginInterface
 from WalletWave.utils.logging_utils import get_logger
 
+METADATA_FIELDS = {"name": "get_name", "description": "get_description", "version": "get_version"}
+
+
+@dataclass
+class PluginSpec:
+    """
+    Metadata of a discovered plugin. The plugin module is only imported by load().
+    """
+    module: str
+    class_name: str
+    name: str
+    description: str = ""
+    version: str = ""
+
+    def load(self, config_manager, services=None):
+        """
+        Imports the plugin module and instantiates the plugin class.
+
+        :param config_manager: The configuration manager passed to the plugin.
+        :param services: Shared ServiceContainer injected into the plugin.
+        :return: The plugin instance.
+        """
+        module = importlib.import_module(self.module)
+        plugin_class = getattr(module, self.class_name)
+        if not (inspect.isclass(plugin_class) and issubclass(plugin_class, PluginInterface)):
+            raise TypeError(f"{self.module}.{self.class_name} is not a PluginInterface subclass")
+        if services is None:
+            return plugin_class(config_manager)
+        if "services" in inspect.signature(plugin_class).parameters:
+            return plugin_class(config_manager, services=services)
+        # plugins written before the service container only take the config manager
+        plugin = plugin_class(config_manager)
+        plugin.services = services
+        return plugin
+
+
+def _is_plugin_class(node: ast.ClassDef) -> bool:
+    """ True if PluginInterface is one of the direct bases of the class """
+    for base in node.bases:
+        if isinstance(base, ast.Name) and base.id == PluginInterface.__name__:
+            return True
+        if isinstance(base, ast.Attribute) and base.attr == PluginInterface.__name__:
+            return True
+    return False
+
+
+def _is_abstract(node: ast.ClassDef) -> bool:
+    """ True if the class declares abstract methods, i.e. it is a base for other plugins """
+    for statement in node.body:
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for decorator in statement.decorator_list:
+                name = decorator.attr if isinstance(decorator, ast.Attribute) else getattr(decorator, "id", None)
+                if name == "abstractmethod":
+                    return True
+    return False
+
+
+def _imported_names(tree: ast.Module, package: str) -> Dict[str, Tuple[str, Optional[str]]]:
+    """
+    :return: Local name -> (module, attribute) of the imports of a module, attribute None for a module import.
+    """
+    names = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            if node.level:
+                parent = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                module = f"{parent}.{module}" if module else parent
+            for alias in node.names:
+                names[alias.asname or alias.name] = (module, alias.name)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    names[alias.asname] = (alias.name, None)
+                else:
+                    top = alias.name.split(".")[0]
+                    names[top] = (top, None)
+    return names
+
+
+class _ClassIndex:
+    """
+    Classes of the scanned plugin modules, to find plugins that subclass PluginInterface through
+    another class (class MyScan(BaseScanPlugin)).
+
+    Bases are resolved against the scanned classes and the imports of their module. A base imported
+    from outside the plugin directory is checked by importing that module only; a base that cannot be
+    resolved from the source at all is checked by importing the plugin module itself.
+    """
+
+    def __init__(self, package: str, trees: Dict[str, ast.Module]):
+        self.package = package
+        self.classes = {
+            f"{package}.{module}": {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+            for module, tree in trees.items()
+        }
+        self.imports = {f"{package}.{module}": _imported_names(tree, package) for module, tree in trees.items()}
+        self._resolved: Dict[Tuple[str, str], bool] = {}
+
+    def is_plugin(self, module: str, class_name: str) -> bool:
+        key = (module, class_name)
+        if key not in self._resolved:
+            self._resolved[key] = False  # guards against cyclic bases
+            node = self.classes[module][class_name]
+            self._resolved[key] = _is_plugin_class(node) or any(
+                self._base_is_plugin(module, base) for base in node.bases
+            )
+        return self._resolved[key]
+
+    def _base_is_plugin(self, module: str, base: ast.expr) -> bool:
+        parts = []
+        while isinstance(base, ast.Attribute):
+            parts.insert(0, base.attr)
+            base = base.value
+        if not isinstance(base, ast.Name):
+            return False  # a call or subscript, e.g. Generic[T]
+        name, *attributes = [base.id, *parts]
+
+        if not attributes and name in self.classes[module]:
+            return self.is_plugin(module, name)
+        target = self.imports[module].get(name)
+        if target is None:
+            if attributes or hasattr(builtins, name):
+                return False
+            return self._imports_as_plugin(module, name)  # defined at runtime, e.g. Base = make_base()
+
+        source = target[0] if target[1] is None else f"{target[0]}.{target[1]}"
+        if attributes:
+            *submodules, class_name = attributes
+            source = ".".join([source, *submodules])
+        elif target[1] is None:
+            return False  # a module is not a class
+        else:
+            source, class_name = target
+        if class_name in self.classes.get(source, {}):
+            return self.is_plugin(source, class_name)
+        return self._imports_as_plugin(source, class_name)
+
+    def _imports_as_plugin(self, module: str, name: str) -> bool:
+        try:
+            obj = getattr(importlib.import_module(module), name)
+        except Exception as e:
+            get_logger("PluginManager").warning(f"Could not resolve plugin base {module}.{name}: {e}")
+            return False
+        return inspect.isclass(obj) and issubclass(obj, PluginInterface)
+
+
+def _read_metadata(node: ast.ClassDef) -> dict:
+    """
+    Reads plugin metadata from the class body without executing it.
+
+    Class attributes (name = "...") take precedence over getters that return a string literal
+    (def get_name(self): return "...").
+    """
+    metadata = {}
+    getters = {getter: field for field, getter in METADATA_FIELDS.items()}
+    for statement in node.body:
+        if isinstance(statement, (ast.Assign, ast.AnnAssign)):
+            targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+            value = statement.value
+            for target in targets:
+                if (isinstance(target, ast.Name) and target.id in METADATA_FIELDS
+                        and isinstance(value, ast.Constant) and isinstance(value.value, str)):
+                    metadata[target.id] = value.value
+        elif isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)) and statement.name in getters:
+            field = getters[statement.name]
+            returns = [child for child in ast.walk(statement) if isinstance(child, ast.Return)]
+            if (field not in metadata and len(returns) == 1 and isinstance(returns[0].value, ast.Constant)
+                    and isinstance(returns[0].value.value, str)):
+                metadata[field] = returns[0].value.value
+    return metadata
+
 
 class PluginManager:
     """
-    Manages plugins: loading, selecting, and executing them.
+    Manages plugins: discovering, selecting, and loading them.
+
+    Discovery only parses the plugin sources for their metadata; a plugin module is imported and
+    its class instantiated once the plugin is selected.
     """
 
-    def __init__(self, plugin_directory: str = None, config_manager=None):
+    def __init__(self, plugin_directory: str = None, config_manager=None, services=None):
         """
         Initialize the plugin manager with the directory containing plugins.
         """
@@ -24,40 +203,63 @@ class PluginManager:
         self.plugin_directory = root / "WalletWave" / "plugins"
         self.debug_logger = get_logger(f"Pluggins path is {self.plugin_directory}")
         self.config_manager = config_manager
+        self.services = services
         self.plugins = []
 
     def load_plugins(self) -> None:
         """
-        Dynamically loads plugins from the specified directory.
+        Discovers the plugins of the plugin directory without importing them.
         """
         self.debug_logger.debug(f"Plugin directory resolved to: {self.plugin_directory}")
         if not os.path.exists(self.plugin_directory):
             raise FileNotFoundError(f"Plugin directory does not exist: {self.plugin_directory}")
 
-        for file in os.listdir(self.plugin_directory):
+        trees = {}
+        for file in sorted(os.listdir(self.plugin_directory)):
             if file.endswith(".py") and file != "__init__.py":
                 module_name = file[:-3]  # Remove the .py extension
                 try:
-                    #Dynamically import the plugin
-                    module = importlib.import_module(f"WalletWave.plugins.{module_name}")
-                    for _, obj in inspect.getmembers(module, inspect.isclass):
-                        if issubclass(obj, PluginInterface) and obj is not PluginInterface:
-                            self.plugins.append(obj(self.config_manager))
+                    source = (self.plugin_directory / file).read_text(encoding="utf-8")
+                    trees[module_name] = ast.parse(source, filename=file)
                 except Exception as e:
                     print(f"Failed to load plugin {module_name}: {e}")
 
+        index = _ClassIndex("WalletWave.plugins", trees)
+        for module_name, tree in trees.items():
+            module = f"WalletWave.plugins.{module_name}"
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef) and not _is_abstract(node) and index.is_plugin(module, node.name):
+                    metadata = _read_metadata(node)
+                    self.plugins.append(PluginSpec(
+                        module=module,
+                        class_name=node.name,
+                        name=metadata.get("name", node.name),
+                        description=metadata.get("description", ""),
+                        version=metadata.get("version", ""),
+                    ))
+
     def list_plugins(self) -> None:
         """
         Lists all available plugins with their descriptions.
         """
         for i, plugin in enumerate(self.plugins):
-            print(f"[{i + 1}] {plugin.get_name()} ({plugin.get_version()}): {plugin.get_description()}")
+            print(f"[{i + 1}] {plugin.name} ({plugin.version}): {plugin.description}")
 
     def select_plugin(self, index: int):
         """
-        Returns the selected plugin based on the index.
+        Loads and returns the selected plugin based on the index.
         """
         if 0 <= index < len(self.plugins):
-            return self.plugins[index]
+            return self.plugins[index].load(self.config_manager, self.services)
         else:
             raise ValueError("Invalid plugin index")
+
+    def get_plugin(self, name: str) -> Optional[PluginSpec]:
+        """
+        Returns the spec of the plugin whose class name or display name matches, ignoring case.
+        """
+        name = name.lower()
+        for plugin in self.plugins:
+            if name in (plugin.class_name.lower(), plugin.name.lower()):
+                return plugin
+        return None
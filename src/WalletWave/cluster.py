@@ -0,0 +1,204 @@
+import asyncio
+import time
+
+from WalletWave.config import ConfigManager
+from WalletWave.repositories.snapshot_repo import SnapshotRepo
+from WalletWave.utils.config_validators import *
+from WalletWave.utils.file_utils import FileUtils
+from WalletWave.utils.logging_utils import get_logger
+from WalletWave.utils.work_queue import LeaseQueue, Lease
+
+logger = get_logger("Cluster")
+
+
+def _load_wallet_file(file_path: str) -> list:
+    with open(file_path, "r") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+async def _fetch_top_wallet_addresses(manager: ConfigManager, timeframe: str, wallet_tag: str) -> list:
+    # imported here so the coordinator only builds a client when it needs the rank
+    from WalletWave.services import ServiceContainer
+
+    async with ServiceContainer(manager) as services:
+        response = await services.gmgn_repo.get_trending_wallets(timeframe, wallet_tag)
+    return [wallet.wallet_address for wallet in response.rank] if response else []
+
+
+def submit_job(manager: ConfigManager, queue: LeaseQueue, args) -> int:
+    """
+    Splits a wallet list or a TopWallets sweep into leases on the shared queue.
+
+    :return: The job id.
+    """
+    if args.top_wallets:
+        timeframe = validate_timeframe(manager.get_plugin_setting("TopWallets", "timeframe", "7d"))
+        wallet_tag = validate_wallet_tag(manager.get_plugin_setting("TopWallets", "wallet_tag", "smart_degen"))
+        win_rate = validate_win_rate(manager.get_plugin_setting("TopWallets", "win_rate", 60))
+        wallet_addresses = asyncio.run(_fetch_top_wallet_addresses(manager, timeframe, wallet_tag))
+        params = {"period": timeframe, "win_rate": win_rate}
+        kind = "top_wallets"
+    elif args.wallets:
+        wallet_addresses = _load_wallet_file(args.wallets)
+        params = {"period": manager.get_plugin_setting("SolanaWalletScanner", "timeframe", "7d")}
+        kind = "wallet_list"
+    else:
+        raise ValueError("Nothing to submit: pass --wallets <file> or --top-wallets")
+
+    if not wallet_addresses:
+        raise ValueError("No wallets to submit")
+
+    return queue.create_job(kind, wallet_addresses, lease_size=args.lease_size, params=params)
+
+
+def collect_job(manager: ConfigManager, queue: LeaseQueue, job_id: int) -> list:
+    """
+    Merges the results of a job into one export.
+
+    :return: The exported wallet summaries.
+    """
+    job = queue.get_job(job_id)
+    if job is None:
+        raise ValueError(f"Unknown job: {job_id}")
+
+    results = queue.get_results(job_id)
+    win_rate = job["params"].get("win_rate")
+    if win_rate is not None:
+        results = [
+            result for result in results
+            if result.get("winrate") is not None and result["winrate"] >= win_rate
+        ]
+
+    status = queue.job_status(job_id)
+    logger.info(f"Job {job_id}: {len(results)} wallets collected, lease status: {status}")
+    if manager.snapshot_db:
+        snapshots = SnapshotRepo(manager.snapshot_db)
+        try:
+            snapshots.record(results)
+        finally:
+            snapshots.close()
+    if manager.export_enabled:
+        FileUtils(manager.export_path).export_wallet_data(results, export_format=manager.export_format)
+    return results
+
+
+def coordinator_command(manager: ConfigManager, args) -> None:
+    """
+    Entry point of `walletwave coordinator`.
+    """
+    queue = LeaseQueue(args.queue)
+    try:
+        if args.action == "submit":
+            job_id = submit_job(manager, queue, args)
+            print(f"Submitted job {job_id} to {args.queue}")
+            if args.wait:
+                while not queue.is_finished(job_id):
+                    time.sleep(args.poll_interval)
+                collect_job(manager, queue, job_id)
+        elif args.action == "status":
+            if args.job is None:
+                raise ValueError("--job is required for status")
+            print(f"Job {args.job}: {queue.job_status(args.job)}")
+        elif args.action == "collect":
+            if args.job is None:
+                raise ValueError("--job is required for collect")
+            collect_job(manager, queue, args.job)
+    finally:
+        queue.close()
+
+
+async def _heartbeat(queue: LeaseQueue, lease: Lease, owner: str, ttl: float, task: asyncio.Task) -> bool:
+    """
+    Renews the lease every ttl / 3 seconds and cancels the work if the lease was lost.
+
+    :return: True once the lease is lost.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(ttl / 3)
+        # sqlite may wait up to its busy timeout on a locked queue file, keep the lookups running meanwhile
+        if not await loop.run_in_executor(None, queue.heartbeat, lease, owner, ttl):
+            logger.warning(f"Lost lease {lease.lease_id}, cancelling its work")
+            task.cancel()
+            return True
+
+
+async def _process_lease(gmgn, lease: Lease) -> list:
+    period = lease.params.get("period", "7d")
+    timeout = lease.params.get("timeout")
+    results = []
+    for wallet_address in lease.items:
+        summary = None
+        try:
+            wallet_info = await gmgn.get_wallet_info(wallet_address, timeout, period=period)
+            if wallet_info:
+                summary = wallet_info.to_summary(wallet_address)
+        except Exception as e:
+            logger.error(f"Error fetching data for wallet {wallet_address}: {e}")
+        results.append((wallet_address, summary))
+    return results
+
+
+async def run_worker(queue: LeaseQueue, worker_id: str, gmgn, lease_ttl: float = 120, poll_interval: float = 5,
+                     exit_when_idle: bool = False) -> None:
+    """
+    Claims leases from the queue and runs their GmgnRepo lookups until stopped.
+
+    :param queue: Shared lease queue.
+    :param worker_id: Unique id of this worker (host + pid by default).
+    :param gmgn: GmgnRepo used for the lookups.
+    :param lease_ttl: Seconds a lease stays claimed without a heartbeat.
+    :param poll_interval: Seconds to wait before asking for work again when the queue is empty.
+    :param exit_when_idle: Stop instead of polling when there is no work left.
+    """
+    logger.info(f"Worker {worker_id} started on {queue.path}")
+    while True:
+        lease = queue.claim(worker_id, lease_ttl)
+        if lease is None:
+            if exit_when_idle:
+                logger.info(f"Worker {worker_id}: no work left, exiting")
+                return
+            await asyncio.sleep(poll_interval)
+            continue
+
+        logger.info(f"Worker {worker_id} claimed lease {lease.lease_id} of job {lease.job_id} "
+                    f"({len(lease.items)} wallets, attempt {lease.attempts})")
+        task = asyncio.create_task(_process_lease(gmgn, lease))
+        heartbeat = asyncio.create_task(_heartbeat(queue, lease, worker_id, lease_ttl, task))
+        try:
+            results = await task
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled() and heartbeat.result():
+                continue  # lease lost, the queue already handed it to someone else
+            queue.release(lease, worker_id)
+            raise
+        finally:
+            heartbeat.cancel()
+
+        if queue.complete(lease, worker_id, results):
+            logger.info(f"Worker {worker_id} completed lease {lease.lease_id}")
+
+
+async def _run_worker(queue: LeaseQueue, args, services) -> None:
+    try:
+        async with services:
+            await run_worker(queue, args.worker_id, services.gmgn_repo, lease_ttl=args.lease_ttl,
+                             poll_interval=args.poll_interval, exit_when_idle=args.exit_when_idle)
+    finally:
+        services.write_metrics()
+
+
+def worker_command(manager: ConfigManager, args) -> None:
+    """
+    Entry point of `walletwave worker`.
+    """
+    from WalletWave.services import ServiceContainer
+
+    queue = LeaseQueue(args.queue)
+    services = ServiceContainer(manager)
+    try:
+        asyncio.run(_run_worker(queue, args, services))
+    except KeyboardInterrupt:
+        logger.info("Worker stopped")
+    finally:
+        queue.close()
@@ -1,5 +1,6 @@
 import argparse
 import os
+import socket
 
 import yaml
 from yaml import YAMLError
@@ -68,7 +69,24 @@ class ConfigManager:
             "export_enabled": validate_export_enabled(
               program_settings.get("export_enabled", True) #defaults to True
             ),
-            "logging_level": program_settings.get("logging_level", "INFO")
+            "workers": validate_workers(
+                self._args.workers if self._args and self._args.workers else program_settings.get("workers", 1)
+            ),
+            "request_delay": validate_request_delay(program_settings.get("request_delay", 2)),
+            "retry": validate_retry_policy(program_settings.get("retry")),
+            "lane_weights": validate_lane_weights(program_settings.get("lane_weights")),
+            "hedging": validate_hedging_policy(program_settings.get("hedging")),
+            "time_budget": validate_time_budget(getattr(self._args, "time_budget", None) if self._args else None),
+            "record_session": getattr(self._args, "record", None) if self._args else None,
+            "replay_session": getattr(self._args, "replay", None) if self._args else None,
+            "snapshot_db": validate_snapshot_db(program_settings.get(
+                "snapshot_db", os.path.join(self._args.export_path if self._args and self._args.export_path
+                                            else program_settings.get("export_path", "data"), "snapshots.db")
+            )),
+            "logging_level": program_settings.get("logging_level", "INFO"),
+            "log_format": validate_log_format(program_settings.get("log_format", "text")),
+            "wallet_log_sample": validate_wallet_log_sample(program_settings.get("wallet_log_sample", 1)),
+            "interactive": True # plugins may prompt the user
         }
 
     def _load_plugin_settings(self):
@@ -80,6 +98,11 @@ class ConfigManager:
         plugins = self._config_data.get("plugin_settings", {})
         return {plugin: settings for plugin, settings in plugins.items()}
 
+    @property
+    def daemon_settings(self):
+        """ Return the daemon (walletwave serve) settings as dict """
+        return self._config_data.get("daemon_settings") or {}
+
     @property
     def plugins(self):
         """ Return all plugin settings as dict """
@@ -107,6 +130,23 @@ class ConfigManager:
             self._plugin_settings[plugin] = {}
         self._plugin_settings[plugin][key] = value
 
+    def with_plugin_settings(self, plugin, settings):
+        """
+        Return a copy of this config manager with extra settings for one plugin
+
+        The copy does not share plugin settings with the original, so overrides stay local to it.
+
+        :param plugin: Name of the plugin
+        :param settings: Settings that override the plugin config
+        :return: New ConfigManager instance
+        """
+        clone = object.__new__(ConfigManager)
+        clone.__dict__.update(self.__dict__)
+        clone._final_config = dict(self._final_config)
+        clone._plugin_settings = {name: dict(values or {}) for name, values in self._plugin_settings.items()}
+        clone._plugin_settings.setdefault(plugin, {}).update(settings or {})
+        return clone
+
     def __getattr__(self, name):
         """
         Dynamic attribute access to plugin settings
@@ -159,13 +199,88 @@ class ConfigManager:
         """ Return whether exporting is enabled. """
         return self._final_config["export_enabled"]
 
+    @property
+    def workers(self):
+        """ Return the number of scan worker processes. """
+        return self._final_config["workers"]
+
+    @property
+    def request_delay(self):
+        """ Return the minimum number of seconds between two GMGN requests of the process. """
+        return self._final_config["request_delay"]
+
+    @property
+    def lane_weights(self):
+        """ Return the share of the rate budget of each request priority (interactive, normal, bulk). """
+        return self._final_config["lane_weights"]
+
+    @property
+    def hedge_policy(self):
+        """ Return the HedgePolicy arguments of the GMGN client, or None if hedging is disabled. """
+        return self._final_config["hedging"]
+
+    @property
+    def time_budget(self):
+        """ Return the seconds every plugin run may take (--time-budget), or None. Plugins may override it with their time_budget setting. """
+        return self._final_config["time_budget"]
+
+    @property
+    def retry_policy(self):
+        """ Return the GMGN client retry policy as Gmgn keyword arguments. """
+        return self._final_config["retry"]
+
+    @property
+    def record_session(self):
+        """ Return the session file GMGN responses are recorded to (--record), or None. """
+        return self._final_config["record_session"]
+
+    @property
+    def replay_session(self):
+        """ Return the session file GMGN responses are replayed from (--replay), or None. """
+        return self._final_config["replay_session"]
+
+    @property
+    def snapshot_db(self):
+        """ Return the path of the wallet snapshot database, or None if snapshots are disabled. """
+        return self._final_config["snapshot_db"]
+
+    @property
+    def metrics_out(self):
+        """ Return the path client metrics are written to, or None. """
+        return getattr(self._args, "metrics_out", None) if self._args else None
+
+    @property
+    def profile(self):
+        """ Return True if the run should be profiled (--profile or --profile-pstats). """
+        return bool(self._args and (getattr(self._args, "profile", False) or self.profile_pstats))
+
+    @property
+    def profile_pstats(self):
+        """ Return the path cProfile stats are written to, or None. """
+        return getattr(self._args, "profile_pstats", None) if self._args else None
+
+    @property
+    def memprofile(self):
+        """ Return True if memory allocations should be traced (--memprofile). """
+        return bool(self._args and getattr(self._args, "memprofile", False))
+
+    @property
+    def interactive(self):
+        """ Return whether plugins may prompt the user for input """
+        return self._final_config["interactive"]
+
+    @interactive.setter
+    def interactive(self, interactive):
+        """ Enable or disable user prompts in plugins """
+        self._final_config["interactive"] = validate_interactive(interactive)
+
     @property
     def config(self):
         """ Return the fully merged config dictionary """
         return self._final_config
 
-def parse_args():
-    """ Parse command-line arguments"""
+def parse_args(argv=None):
+    """ Parse command-line arguments (sys.argv unless argv is given) """
     # Get the default path of the config file relative the script directory
     default_config_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "config.yaml"))
 
@@ -174,7 +289,54 @@ def parse_args():
     parser.add_argument("--export_path", type=str, help="Path to export files")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
     parser.add_argument("--export-format", type=str, choices=["csv", "txt"], help="Export format (csv or txt)")
-    return parser.parse_args()
+    parser.add_argument("--workers", type=int, help="Number of worker processes used to scan wallet lists")
+    parser.add_argument("--time-budget", type=float, metavar="SECONDS", help="Bound every plugin run to this many seconds: new requests stop shortly before, work still running at the deadline is cancelled and the completed part is exported as partial")
+    parser.add_argument("--metrics-out", type=str, help="Write GMGN client metrics to this file at the end of the run (.json for a JSON summary, Prometheus text otherwise)")
+    parser.add_argument("--profile", action="store_true", help="Print wall/CPU time per plugin lifecycle stage at the end of the run")
+    parser.add_argument("--profile-pstats", type=str, help="Also run under cProfile and write the stats to this .pstats file (implies --profile)")
+    parser.add_argument("--memprofile", action="store_true", help="Trace memory allocations per pipeline stage (fetch, parse, summarize, filter, export) and print a report at the end of the run")
+    parser.add_argument("--startup-profile", action="store_true", help="Print an import-time breakdown per subsystem once started")
+    session = parser.add_mutually_exclusive_group()
+    session.add_argument("--record", type=str, metavar="SESSION", help="Archive every GMGN response of the run to this session file")
+    session.add_argument("--replay", type=str, metavar="SESSION", help="Answer GMGN requests from a recorded session file, without network access or rate limiting")
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    coordinator = subparsers.add_parser("coordinator", help="Split scan jobs into leases on a shared work queue")
+    coordinator.add_argument("action", choices=["submit", "status", "collect"], help="Coordinator action")
+    coordinator.add_argument("--queue", type=str, required=True, help="Path to the shared SQLite work queue")
+    coordinator.add_argument("--wallets", type=str, help="Wallet list file to submit")
+    coordinator.add_argument("--top-wallets", action="store_true", help="Submit a TopWallets sweep using its plugin settings")
+    coordinator.add_argument("--job", type=int, help="Job id (status, collect)")
+    coordinator.add_argument("--lease-size", type=int, default=50, help="Wallets per lease")
+    coordinator.add_argument("--wait", action="store_true", help="Wait for the submitted job and export its results")
+    coordinator.add_argument("--poll-interval", type=float, default=5, help="Seconds between job status checks")
+
+    subparsers.add_parser("serve", help="Run the plugin jobs scheduled in daemon_settings until stopped")
+
+    run = subparsers.add_parser("run", help="Run one or more plugins without prompts")
+    run.add_argument("plugins", nargs="+", help="Plugin class or display names, e.g. TopWallets")
+    run.add_argument("--param", action="append", default=[], metavar="[PLUGIN.]KEY=VALUE",
+                     help="Plugin setting override, applied to every selected plugin unless prefixed with its name")
+
+    history = subparsers.add_parser("history", help="Print the metric snapshots of a wallet from the snapshot database")
+    history.add_argument("address", help="Wallet address")
+    history.add_argument("--days", type=float, help="Only snapshots of the last N days")
+    history.add_argument("--db", type=str, help="Snapshot database (default: program_settings.snapshot_db)")
+
+    movers = subparsers.add_parser("movers", help="Print the wallets whose metric changed the most over the last N days")
+    movers.add_argument("--metric", type=str, default="winrate", help="Snapshot metric to compare")
+    movers.add_argument("--days", type=float, default=7, help="Window length in days")
+    movers.add_argument("--limit", type=int, default=20, help="Number of wallets")
+    movers.add_argument("--db", type=str, help="Snapshot database (default: program_settings.snapshot_db)")
+
+    worker = subparsers.add_parser("worker", help="Claim leases from a shared work queue and run their lookups")
+    worker.add_argument("--queue", type=str, required=True, help="Path to the shared SQLite work queue")
+    worker.add_argument("--worker-id", type=str, default=f"{socket.gethostname()}-{os.getpid()}", help="Unique worker id")
+    worker.add_argument("--lease-ttl", type=float, default=120, help="Seconds a lease stays claimed without a heartbeat")
+    worker.add_argument("--poll-interval", type=float, default=5, help="Seconds between claims when the queue is empty")
+    worker.add_argument("--exit-when-idle", action="store_true", help="Exit when the queue has no work left")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
     # Parse arguments
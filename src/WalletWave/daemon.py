@@ -0,0 +1,264 @@
+import asyncio
+import signal
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from CLI.plugin_manager import PluginManager
+from WalletWave.config import ConfigManager
+from WalletWave.services import ServiceContainer
+from WalletWave.utils.gmgn_client.metrics import serve_metrics
+from WalletWave.utils.logging_utils import get_logger
+
+
+class CronSchedule:
+    """
+    Cron-like schedule: "minute hour day-of-month month day-of-week".
+
+    Every field accepts "*", numbers, ranges ("1-5"), lists ("0,30") and steps ("*/15", "0-30/10").
+    Day of week runs from 0 (Sunday) to 6 (7 is also accepted as Sunday). As in cron, when both day
+    fields are restricted a time matches if either of them matches.
+    """
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: '{expression}'")
+
+        self.expression = expression
+        self.minutes = self._parse_field(parts[0], 0, 59)
+        self.hours = self._parse_field(parts[1], 0, 23)
+        self.days = self._parse_field(parts[2], 1, 31)
+        self.months = self._parse_field(parts[3], 1, 12)
+        self.weekdays = frozenset(day % 7 for day in self._parse_field(parts[4], 0, 7))
+        self._day_restricted = parts[2] != "*"
+        self._weekday_restricted = parts[4] != "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> frozenset:
+        values = set()
+        for item in field.split(","):
+            step = 1
+            if "/" in item:
+                item, step_value = item.split("/", 1)
+                step = int(step_value)
+                if step < 1:
+                    raise ValueError(f"Invalid step in cron field: '{field}'")
+
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start, end = (int(value) for value in item.split("-", 1))
+            else:
+                start = int(item)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron field '{field}' out of range {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_matches = moment.day in self.days
+        weekday_matches = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_matches or weekday_matches
+        return day_matches and weekday_matches
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        :return: The first matching minute strictly after moment.
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 4)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+    def __str__(self):
+        return self.expression
+
+
+class IntervalSchedule:
+    """ Runs every `seconds` seconds """
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be greater than 0")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def __str__(self):
+        return f"every {self.seconds}s"
+
+
+class ScheduledJob:
+    """ A plugin instance run on a schedule by the daemon """
+
+    def __init__(self, name: str, plugin, schedule, run_on_start: bool = False):
+        self.name = name
+        self.plugin = plugin
+        self.schedule = schedule
+        self.run_on_start = run_on_start
+        self.next_run: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+
+class WalletWaveDaemon:
+    """
+    Long-running scheduler behind `walletwave serve`.
+
+    Plugins and the GMGN client are built once. Every job shares one warm connection pool and
+    response cache, runs on its own schedule, never overlaps with a previous run of itself, and
+    exports its results to a file prefixed with the job name. Client metrics can be scraped
+    live from daemon_settings.metrics_port.
+    """
+
+    def __init__(self, config: ConfigManager):
+        # imported here: main.py imports this module to dispatch `walletwave serve`
+        from WalletWave.main import WalletWave
+
+        self.config = config
+        self.config.interactive = False  # jobs run unattended
+        self.logger = get_logger("WalletWaveDaemon")
+        settings = config.daemon_settings
+        # every job shares the warm client and response cache between runs
+        self.services = ServiceContainer(config, cache_ttl=settings.get("cache_ttl", 300))
+        self.app = WalletWave(config, self.services)
+        self.jobs = self._load_jobs(settings.get("jobs") or [])
+        self._stopping: Optional[asyncio.Event] = None
+
+    def _load_jobs(self, job_settings: List[dict]) -> List[ScheduledJob]:
+        plugin_manager = PluginManager(config_manager=self.config)
+        plugin_manager.load_plugins()
+
+        jobs = []
+        for settings in job_settings:
+            name = settings.get("name")
+            plugin_name = settings.get("plugin")
+            plugin_spec = plugin_manager.get_plugin(plugin_name) if plugin_name else None
+            if not name or plugin_spec is None:
+                raise ValueError(f"Invalid daemon job '{name}': unknown plugin '{plugin_name}'")
+            plugin_name = plugin_spec.class_name
+            if any(job.name == name for job in jobs):
+                raise ValueError(f"Duplicate daemon job name: '{name}'")
+
+            if settings.get("schedule"):
+                schedule = CronSchedule(settings["schedule"])
+            elif settings.get("interval"):
+                schedule = IntervalSchedule(settings["interval"])
+            else:
+                raise ValueError(f"Daemon job '{name}' needs a 'schedule' or an 'interval'")
+
+            job_config = self.config.with_plugin_settings(plugin_name, settings.get("settings"))
+            plugin = plugin_spec.load(job_config, self.services)
+            jobs.append(ScheduledJob(name, plugin, schedule, run_on_start=settings.get("run_on_start", False)))
+        return jobs
+
+    def stop(self) -> None:
+        """ Stop scheduling new runs; running jobs are allowed to finish """
+        if self._stopping is not None and not self._stopping.is_set():
+            self.logger.info("Stopping daemon...")
+            self._stopping.set()
+
+    def _install_signal_handlers(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # not supported on Windows event loops
+
+    def _start(self, job: ScheduledJob) -> None:
+        if job.running:
+            self.logger.warning(f"Job {job.name} is still running, skipping this run")
+            return
+        job.task = asyncio.create_task(self._run_job(job))
+
+    async def _run_job(self, job: ScheduledJob) -> None:
+        started = time.monotonic()
+        self.logger.info(f"Running job {job.name} ({job.plugin.get_name()})")
+        await self.app.execute(job.plugin, file_prefix=job.name)
+        self.logger.info(f"Job {job.name} finished in {time.monotonic() - started:.1f}s, next run at {job.next_run}")
+
+    async def run(self) -> None:
+        """
+        Runs the scheduled jobs until stop() is called (SIGINT/SIGTERM).
+        """
+        if not self.jobs:
+            self.logger.error("No jobs configured in daemon_settings, nothing to run")
+            return
+
+        self._stopping = asyncio.Event()
+        self._install_signal_handlers()
+        if self.app.profiler:
+            self.app.profiler.start()
+        if self.app.memory_profiler:
+            self.app.memory_profiler.start()
+
+        metrics_server = None
+        metrics_port = self.config.daemon_settings.get("metrics_port")
+        if metrics_port:
+            metrics_host = self.config.daemon_settings.get("metrics_host", "127.0.0.1")
+            metrics_server = await serve_metrics(self.services.metrics, metrics_host, metrics_port)
+            self.logger.info(f"Serving client metrics on http://{metrics_host}:{metrics_port}/metrics")
+
+        now = datetime.now()
+        for job in self.jobs:
+            job.next_run = now if job.run_on_start else job.schedule.next_after(now)
+            self.logger.info(f"Scheduled job {job.name} ({job.schedule}), first run at {job.next_run}")
+
+        try:
+            while not self._stopping.is_set():
+                now = datetime.now()
+                for job in self.jobs:
+                    if job.next_run <= now:
+                        job.next_run = job.schedule.next_after(now)
+                        self._start(job)
+
+                wake_up = min(job.next_run for job in self.jobs)
+                delay = min(max((wake_up - datetime.now()).total_seconds(), 0), 60)
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            running = [job.task for job in self.jobs if job.running]
+            if running:
+                self.logger.info(f"Waiting for {len(running)} running jobs to finish...")
+                await asyncio.gather(*running, return_exceptions=True)
+            if metrics_server is not None:
+                metrics_server.close()
+                await metrics_server.wait_closed()
+            await self.services.aclose()
+            self.services.write_metrics()
+            if self.app.profiler:
+                self.app.profiler.report()
+            if self.app.memory_profiler:
+                self.app.memory_profiler.report()
+
+
+def daemon_command(manager: ConfigManager, args) -> None:
+    """
+    Entry point of `walletwave serve`.
+    """
+    try:
+        asyncio.run(WalletWaveDaemon(manager).run())
+    except KeyboardInterrupt:
+        pass
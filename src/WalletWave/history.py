@@ -0,0 +1,67 @@
+import time
+from pathlib import Path
+
+from WalletWave.config import ConfigManager
+from WalletWave.repositories.snapshot_repo import SnapshotRepo
+from WalletWave.utils.formatting_utils import format_currency, format_percentage, format_timestamp
+
+# columns printed by `walletwave history`, every metric stays available through SnapshotRepo.history
+HISTORY_COLUMNS = ("winrate", "pnl_7d", "pnl_30d", "realized_profit_7d", "total_value", "buy_7d", "sell_7d", "score")
+
+
+def format_metric(metric: str, value) -> str:
+    if value is None:
+        return "-"
+    if "winrate" in metric or "pnl" in metric:
+        return format_percentage(value)
+    if "profit" in metric or "value" in metric:
+        return format_currency(value)
+    return f"{value:,.2f}" if metric == "score" else f"{value:,.0f}"
+
+
+def print_history(repo: SnapshotRepo, address: str, days: float = None) -> None:
+    since = time.time() - days * 86400 if days else None
+    snapshots = repo.history(address, since=since)
+    if not snapshots:
+        print(f"No snapshots of {address} in {repo.path}")
+        return
+
+    print(f"{'snapshot':<21}" + "".join(f"{column:>20}" for column in HISTORY_COLUMNS))
+    for snapshot in snapshots:
+        print(f"{format_timestamp(snapshot['timestamp']):<21}"
+              + "".join(f"{format_metric(column, snapshot[column]):>20}" for column in HISTORY_COLUMNS))
+
+
+def print_movers(repo: SnapshotRepo, metric: str, days: float, limit: int) -> None:
+    movers = repo.movers(metric, days=days, limit=limit)
+    if not movers:
+        print(f"No wallet has two {metric} snapshots in the last {days:g} days in {repo.path}")
+        return
+
+    print(f"{'wallet':<46}{'first':>16}{'last':>16}{'change':>16}  {'since':<21}")
+    for mover in movers:
+        print(f"{mover['wallet_address']:<46}{format_metric(metric, mover['first']):>16}"
+              f"{format_metric(metric, mover['last']):>16}{format_metric(metric, mover['change']):>16}"
+              f"  {format_timestamp(mover['first_timestamp']):<21}")
+
+
+def history_command(manager: ConfigManager, args) -> None:
+    """
+    Entry point of `walletwave history` and `walletwave movers`.
+
+    Both read the snapshot database only, without any GMGN request.
+    """
+    path = args.db or manager.snapshot_db
+    if not path:
+        raise ValueError("Snapshots are disabled: set program_settings.snapshot_db or pass --db")
+    if not Path(path).exists():
+        raise ValueError(f"Snapshot database not found: {path}")
+
+    repo = SnapshotRepo(path)
+    try:
+        if args.command == "history":
+            print_history(repo, args.address, days=args.days)
+        else:
+            print_movers(repo, args.metric, args.days, args.limit)
+    finally:
+        repo.close()
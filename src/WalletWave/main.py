@@ -1,9 +1,26 @@
+import sys
+
+# installed before anything else is imported so the profile covers the whole startup path
+from WalletWave.utils.startup_profile import StartupProfiler
+_startup_profiler = StartupProfiler.install() if "--startup-profile" in sys.argv else None
+
 from CLI.menu import menu
 from WalletWave.config import parse_args
 from WalletWave.config import ConfigManager
+from WalletWave.utils.config_validators import validate_request_priority, validate_time_budget
 from WalletWave.utils.file_utils import FileUtils
+from WalletWave.utils.gmgn_client.utils.rate_limiter import request_priority
+from WalletWave.utils.mem_profile import MemoryProfiler, memory_stage
+from WalletWave.utils.run_profile import RunProfiler
+from WalletWave.utils.time_budget import TimeBudget
 from WalletWave.utils.logging_utils import get_logger, init_logging
 import asyncio
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+# the service container imports the GMGN client, it is only built once a plugin runs
+if TYPE_CHECKING:
+    from WalletWave.services import ServiceContainer
 
 class WalletWave:
     """
@@ -11,52 +28,158 @@ class WalletWave:
     - execute function of WalletWave
        - Step 1: Initialize the plugin
        - Step 2: Execute the plugin
-       - Step 3: Export plugin results
+       - Step 3: Record wallet snapshots and export plugin results
        - Step 4: Finalize the plugin
     - export function
        - Exports the data returned from plugin by passing to file_utils
+    - services
+       - Shared GMGN client/repository injected into every plugin, closed by run_plugins
+       - Client metrics are written to --metrics-out once the plugins finished
+    - request priority
+       - GMGN requests of a plugin run in the lane set by its priority setting (interactive, normal, bulk)
+         and are dropped after request_max_wait seconds without a rate limit slot
+    - time budget
+       - With --time-budget (or the time_budget plugin setting) a plugin run stops issuing requests shortly
+         before the budget and is cancelled at the deadline; the results completed so far are exported
+         with a <file>.meta.json sidecar marking them partial, with coverage stats
+    - profiler
+       - Wall/CPU time per lifecycle stage when --profile is set
+       - tracemalloc statistics per pipeline stage when --memprofile is set
     """
-    def __init__(self, config: ConfigManager):
+    def __init__(self, config: ConfigManager, services: "ServiceContainer" = None):
         """
         Initializes the main app.
         """
+        from WalletWave.services import ServiceContainer
+
         self.config = config
+        self.services = services or ServiceContainer(config)
         self.logger = get_logger("WalletWave")
         self.file_utils = FileUtils(self.config.export_path)
+        self.profiler = None
+        if self.config.profile:
+            self.profiler = RunProfiler(self.services.metrics, self.services.rate_limiter,
+                                        pstats_path=self.config.profile_pstats)
+        self.memory_profiler = MemoryProfiler() if self.config.memprofile else None
+
+    def _stage(self, plugin, stage: str):
+        """ Times a lifecycle stage when --profile is set """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(plugin.get_name(), stage)
+
+    def _memory_run(self, plugin):
+        """ Measures the memory retained by a plugin run when --memprofile is set """
+        if self.memory_profiler is None:
+            return nullcontext()
+        return self.memory_profiler.run(plugin.get_name())
+
+    def _run_meta(self, plugin, budget: TimeBudget, finished: bool, data, dropped_before: int) -> dict:
+        """ Metadata of a time budgeted run: whether its results are partial, and how much was covered """
+        coverage = plugin.coverage()
+        planned, completed = coverage.get("planned"), coverage.get("completed")
+        dropped = self.services.metrics.dropped_requests() - dropped_before
+        incomplete = dropped > 0 or (planned is not None and completed is not None and completed < planned)
+        return {
+            "plugin": plugin.plugin_class,
+            "partial": not finished or (budget.nearly_spent and incomplete),
+            "cancelled": not finished,
+            "time_budget": budget.seconds,
+            "elapsed": round(budget.elapsed, 3),
+            "exported": len(data) if data else 0,
+            "dropped_requests": dropped,
+            **coverage,
+            "coverage": round(completed / planned, 4) if planned and completed is not None else None,
+        }
 
-    async def execute(self, plugin):
+    async def execute(self, plugin, file_prefix: str = "wallet_list"):
         """
         Executes the selected plugin's lifecycle: initialize, execute, and finalize.
         :param plugin: The plugin object to execute.
+        :param file_prefix: Prefix of the exported file name.
         """
         try:
+            settings = plugin.config_manager.plugins.get(plugin.plugin_class) or {}
+            time_budget = validate_time_budget(settings.get("time_budget", self.config.time_budget))
+            budget = TimeBudget(time_budget) if time_budget else None  # counted from initialize on
+
             # Step 1: Initialize the plugin
             self.logger.info(f"Initializing: {plugin.get_name()}")
-            await plugin.initialize()
+            with self._stage(plugin, "initialize"):
+                await plugin.initialize()
 
             # Step 2: Execute the plugin
             self.logger.info("Executing plugin...")
-            data = await plugin.execute()
+            priority = validate_request_priority(settings)
+            with self._stage(plugin, "execute"), self._memory_run(plugin), request_priority(**priority):
+                if budget is None:
+                    data = await plugin.execute()
+                else:
+                    dropped_before = self.services.metrics.dropped_requests()
+                    data, finished = await budget.run(plugin.execute())
+                    if not finished:
+                        self.logger.warning(f"{plugin.get_name()} was cancelled at the end of its {budget.seconds:g}s "
+                                            f"time budget, keeping the results completed so far")
+                        data = plugin.partial_results()
+                    run_meta = self._run_meta(plugin, budget, finished, data, dropped_before)
+                    if run_meta["partial"]:
+                        self.logger.warning(
+                            f"Partial results of {plugin.get_name()}: {run_meta['exported']} exported, "
+                            f"{run_meta.get('completed', '?')}/{run_meta.get('planned', '?')} "
+                            f"{run_meta.get('unit', 'items')} completed in {run_meta['elapsed']:.1f}s"
+                        )
 
-            # Step 3: Export plugin results
+            # Step 3: Record wallet snapshots and export plugin results
+            self.services.record_snapshots(data)
             if self.config.export_enabled:
                 self.logger.info("Exporting plugin results..")
-                self.export_data(data)
+                with self._stage(plugin, "export"), memory_stage("export"):
+                    data_path = self.export_data(data, export_format=self.config.export_format, file_prefix=file_prefix)
+                    if budget is not None:
+                        self.file_utils.export_run_meta(run_meta, data_path, file_prefix=file_prefix)
             else:
                 self.logger.info("Exporting data has been set to False in the config file. Skipping export function.")
 
             # Step 4: Finalize the plugin
             self.logger.info("Finalizing plugin...")
-            plugin.finalize()
+            with self._stage(plugin, "finalize"):
+                plugin.finalize()
         except Exception as e:
             self.logger.error(f"An error occurred while running the plugin: {e}")
 
-    def export_data(self, data, export_format = 'csv'):
+    async def run_plugins(self, plugins: list):
+        """
+        Executes the plugins concurrently, then releases the shared services.
+        With several plugins every plugin exports to its own file.
+        :param plugins: Plugin objects loaded with this app's services.
+        """
+        file_prefixes = [
+            "wallet_list" if len(plugins) == 1 else f"{plugin.plugin_class}_{index}"
+            for index, plugin in enumerate(plugins)
+        ]
+        if self.profiler:
+            self.profiler.start()
+        if self.memory_profiler:
+            self.memory_profiler.start()
+        try:
+            await asyncio.gather(*(
+                self.execute(plugin, file_prefix=file_prefix)
+                for plugin, file_prefix in zip(plugins, file_prefixes)
+            ))
+        finally:
+            await self.services.aclose()
+            self.services.write_metrics()
+            if self.profiler:
+                self.profiler.report()
+            if self.memory_profiler:
+                self.memory_profiler.report()
+
+    def export_data(self, data, export_format = 'csv', file_prefix = 'wallet_list'):
         """
         Wrapper method to export data using FileUtils.
         """
         self.logger.info("Exporting wallet data...")
-        self.file_utils.export_wallet_data(data, export_format=export_format)
+        return self.file_utils.export_wallet_data(data, export_format=export_format, file_prefix=file_prefix)
 
 
 def main():
@@ -65,6 +188,10 @@ def main():
       - Command line argument parsing
       - Configuration management
       - Logging initialization
+      - Coordinator/worker work queue modes
+      - Scheduler daemon mode
+      - Wallet snapshot queries
+      - Headless plugin runs
       - Menu interaction
       - Plugin execution
     """
@@ -79,24 +206,59 @@ def main():
         # Passes configuration settings to logging_utils
         init_logging(manager.config)
 
+        # Startup is done, print the import-time breakdown if requested
+        if _startup_profiler:
+            _startup_profiler.report()
+
+        # Subcommand modules (and the client stack they need) are only imported when used
+        # Distributed work queue modes (cluster.py)
+        if args.command == "coordinator":
+            from WalletWave.cluster import coordinator_command
+            coordinator_command(manager, args)
+            return
+        if args.command == "worker":
+            from WalletWave.cluster import worker_command
+            worker_command(manager, args)
+            return
+
+        # Scheduler daemon mode (daemon.py)
+        if args.command == "serve":
+            from WalletWave.daemon import daemon_command
+            daemon_command(manager, args)
+            return
+
+        # Snapshot queries (history.py), no client is needed
+        if args.command in ("history", "movers"):
+            from WalletWave.history import history_command
+            history_command(manager, args)
+            return
+
+        # Headless batch mode (runner.py)
+        if args.command == "run":
+            from WalletWave.runner import run_command
+            run_command(manager, args)
+            return
+
+        # Create main application instance (main.py - WalletWave::class)
+        # it owns the services the selected plugin is loaded with
+        app = WalletWave(manager)
+
         # Display menu and get user selection
         # CLI - menu.py
-        action = menu(manager)
+        action = menu(manager, services=app.services)
 
         # exit if prompted
         if action == "exit":
             return
 
-        # Create main application instance (main.py - WalletWave::class)
-        app = WalletWave(manager)
-
         # Extract the selected plugin from menu action
         # menu.py returns ["plugin", selected_plugin] to action variable
         selected_plugin = action[1]
 
         # Execute the selected plugin asynchronously
-        asyncio.run(app.execute(selected_plugin))
+        asyncio.run(app.run_plugins([selected_plugin]))
     except ValueError as e:
+        get_logger("WalletWave").error(e)
         exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List
+
+from WalletWave.plugins.utils.plugin_interface import PluginInterface
+from WalletWave.utils.holder_crawler import HolderGraphCrawler
+from WalletWave.utils.logging_utils import get_logger
+from WalletWave.utils.mem_profile import memory_stage
+from WalletWave.config import ConfigManager
+
+if TYPE_CHECKING:
+    from WalletWave.services import ServiceContainer
+
+from WalletWave.utils.config_validators import *
+
+# Version: 1.0.0
+
+
+class HolderCrawler(PluginInterface):
+    name = "Holder Crawler"
+    description = "Discovers wallets through the top holders of tokens bought by smart money"
+    version = "1.0.0"
+
+    def __init__(self, config_manager: ConfigManager, services: "ServiceContainer" = None):
+        super().__init__(config_manager, services)
+        self.plugin_settings = config_manager.plugins.get(self.plugin_class) or {}
+        self.logger = get_logger("HolderCrawler")
+        self.recent_tokens: Dict[str, List[str]] = {}  # wallet address -> recently bought tokens, from the rank
+        self.crawler = None  # crawler of the current run
+
+    async def initialize(self) -> None:
+        self.logger.info("HolderCrawler plugin initialized.")
+
+    async def execute(self) -> list:
+        """
+        Crawls the holder graph and returns the summaries of the wallets found.
+        """
+        try:
+            timeframe = validate_timeframe(self.plugin_settings.get("timeframe", "7d"))
+            wallet_tag = validate_wallet_tag(self.plugin_settings.get("wallet_tag", "smart_degen"))
+        except Exception as e:
+            self.logger.critical(f"Config validation error: {e}")
+            timeframe, wallet_tag = "7d", "smart_degen"
+            self.logger.warning(f"Falling back to default values: timeframe={timeframe}, wallet_tag={wallet_tag}")
+        period = timeframe if timeframe in ("7d", "30d") else "7d"
+
+        # the trending rank seeds the crawl and tells which tokens its wallets bought recently
+        rank = await self.gmgn.get_trending_wallets(timeframe, wallet_tag)
+        ranked = rank.rank if rank else []
+        self.recent_tokens = {
+            entry.wallet_address: [
+                token.get("address") for token in entry.recent_buy_tokens
+                if isinstance(token, dict) and token.get("address")
+            ]
+            for entry in ranked
+        }
+
+        seed_tokens = self.plugin_settings.get("seed_tokens") or self._most_bought_tokens(
+            self.plugin_settings.get("seeds", 5)
+        )
+        if not seed_tokens:
+            self.logger.error("No seed tokens configured and none found in the trending rank.")
+            return []
+        self.logger.info(f"Crawling from {len(seed_tokens)} seed tokens")
+
+        crawler = self.crawler = HolderGraphCrawler(
+            self.gmgn,
+            self.wallet_tokens,
+            max_depth=self.plugin_settings.get("max_depth", 2),
+            budget=self.plugin_settings.get("budget", 500),
+            concurrency=self.plugin_settings.get("concurrency", 4),
+            holders_per_token=self.plugin_settings.get("holders_per_token", 100),
+            max_wallets=self.plugin_settings.get("max_wallets"),
+            period=period,
+        )
+        wallets = await crawler.crawl(seed_tokens)
+
+        min_winrate = self._get_win_rate()
+        summaries = self.summarize(wallets, min_winrate)
+        self.logger.info(f"Found {len(summaries)} wallets with winrate >= {min_winrate:.0%} "
+                         f"({sum(not summary['in_trending_rank'] for summary in summaries)} outside the trending rank)")
+        return summaries
+
+    def summarize(self, wallets: list, min_winrate: float) -> List[dict]:
+        """
+        :param wallets: CrawledWallet objects.
+        :return: Summaries of the wallets with a winrate of at least min_winrate, with their crawl fields.
+        """
+        summaries = []
+        with memory_stage("summarize", wallets=len(wallets)):
+            for wallet in wallets:
+                if (wallet.wallet_info.wallet_data.winrate or 0) < min_winrate:
+                    continue
+                summaries.append({
+                    **wallet.wallet_info.to_summary(wallet.wallet_address),
+                    "crawl_depth": wallet.depth,
+                    "found_via_token": wallet.via_token,
+                    "holder_profit": wallet.holder_profit,
+                    "in_trending_rank": wallet.wallet_address in self.recent_tokens,
+                })
+        return summaries
+
+    def partial_results(self) -> List[dict]:
+        """ Summaries of the wallets crawled so far """
+        return self.summarize(list(self.crawler.wallets), self._get_win_rate()) if self.crawler else []
+
+    def coverage(self) -> dict:
+        if self.crawler is None:
+            return {}
+        return {"planned": self.crawler.budget, "completed": self.crawler.requests, "unit": "requests"}
+
+    def finalize(self) -> None:
+        self.logger.info("HolderCrawler plugin finalized")
+
+    def wallet_tokens(self, wallet_address: str) -> List[str]:
+        """
+        Tokens a crawled wallet bought recently, used to expand the crawl past its holders.
+
+        GMGN only reports recent buys for wallets in the trending rank, so other wallets are leaves
+        of the crawl. Override this to expand from another source.
+        """
+        return self.recent_tokens.get(wallet_address, [])
+
+    def _most_bought_tokens(self, count: int) -> List[str]:
+        bought = Counter(token for tokens in self.recent_tokens.values() for token in tokens)
+        return [token for token, _ in bought.most_common(count)]
+
+    def _get_win_rate(self) -> float:
+        """
+        Returns the validated minimum win rate from the plugin settings, 0 if unset.
+        """
+        try:
+            return validate_win_rate(self.plugin_settings.get("win_rate", 0))
+        except Exception as e:
+            self.logger.warning(f"Invalid win rate in setting: {e}, keeping every wallet")
+            return 0.0
@@ -1,12 +1,20 @@
 import asyncio
+import logging
 import time
-from typing import List
+from typing import TYPE_CHECKING, List
 
 from WalletWave.plugins.utils.plugin_interface import PluginInterface
-from WalletWave.repositories.gmgn_repo import GmgnRepo
-from WalletWave.utils.logging_utils import get_logger
+from WalletWave.utils.daily_profit import daily_profit_metrics, passes_daily_profit_filters
+from WalletWave.utils.gmgn_client.utils.rate_limiter import deadline_passed
+from WalletWave.utils.logging_utils import get_logger, PER_WALLET
+from WalletWave.utils.mem_profile import memory_stage
+from WalletWave.utils.scoring import ScoringEngine, Shortlist
+from WalletWave.utils.worker_pool import ShardedWalletScanner
 from WalletWave.config import ConfigManager
 
+if TYPE_CHECKING:
+    from WalletWave.services import ServiceContainer
+
 from WalletWave.utils.config_validators import *
 
 # Author: LetsStartWithPurple
@@ -24,24 +32,41 @@ def custom_summary(wallet_address, wallet_data):
     }
 
 
+def bought_tokens_summary(token_addresses: List[str], token_infos: dict) -> dict:
+    """
+    Summarizes the risk of the tokens a wallet bought recently.
+
+    :param token_addresses: Contract addresses from the wallet's recent_buy_tokens.
+    :param token_infos: Contract address to TokenInfo, as returned by GmgnRepo.get_token_infos.
+    :return: Dictionary of bought_* fields added to the wallet summary.
+    """
+    tokens = [token_infos[address] for address in token_addresses if token_infos.get(address)]
+    liquidity = [token.liquidity for token in tokens if token.liquidity is not None]
+    holder_rates = [token.top_10_holder_rate for token in tokens if token.top_10_holder_rate is not None]
+    return {
+        "bought_tokens": len(token_addresses),
+        "bought_min_liquidity": min(liquidity) if liquidity else None,
+        "bought_honeypots": sum(1 for token in tokens if token.is_honeypot),
+        "bought_max_top10_holder_rate": max(holder_rates) if holder_rates else None,
+    }
+
+
 class TopWallets(PluginInterface):
+    name = "Top Wallets"
+    description = "Plugin that gathers Top performing wallets"
+    version = "2.0.0"
 
-    def __init__(self, config_manager: ConfigManager):
-        super().__init__(config_manager)
+    def __init__(self, config_manager: ConfigManager, services: "ServiceContainer" = None):
+        super().__init__(config_manager, services)
         self.plugin_settings = config_manager.TopWallets #dynamically get plugin settings
-        self.gmgn = GmgnRepo()
         self.logger = get_logger("TopWallets")
+        self.daily_profit = {}  # wallet address -> daily profit metrics of the rank
+        self.seen_in = {}  # wallet address -> "tag/timeframe" ranks it appeared in, when sweeping
+        self.shortlist = None  # wallets of the current run that passed the filters
+        self.planned = 0  # wallets of the current run to analyze
+        self.analyzed = 0  # wallets of the current run whose info was fetched
         self.logger.debug("Initializing TOPWALLETS")
 
-    def get_name(self) -> str:
-        return "Top Wallets"
-
-    def get_description(self) -> str:
-        return "Plugin that gathers Top performing wallets"
-
-    def get_version(self) -> str:
-        return "2.0.0"
-
     async def initialize(self) -> None:
         self.logger.info("TopWallets plugin initialized.")
 
@@ -60,19 +85,50 @@ class TopWallets(PluginInterface):
 
         filtered_wallets = []
         try:
-            # Step 1: Get the top wallets
-            self.logger.debug(f"Fetching top wallets with params: timeframe={timeframe}, wallet_tag={wallet_tag}")
-            top_wallets = await self.get_top_wallets(timeframe=timeframe, wallet_tag=wallet_tag)
+            # Step 1: Get the top wallets, of every swept tag x timeframe merged by address
+            combinations = self.get_sweep_combinations(timeframe, wallet_tag)
+            if len(combinations) > 1:
+                top_wallets = await self.sweep_top_wallets(combinations)
+            else:
+                self.logger.debug(f"Fetching top wallets with params: timeframe={timeframe}, wallet_tag={wallet_tag}")
+                top_wallets = await self.get_top_wallets(timeframe=timeframe, wallet_tag=wallet_tag)
             if not top_wallets:
                 self.logger.error("No top wallets found.")
                 return []
 
             self.logger.debug(f"Found {len(top_wallets)} top wallets to analyze")
 
-            wallet_tuples = []
+            # daily profit consistency comes with the rank, filter on it before fetching any wallet info
+            with memory_stage("filter"):
+                top_wallets = self.filter_by_daily_profit(top_wallets)
+            if not top_wallets:
+                self.logger.error("No top wallets passed the daily profit filters.")
+                return []
+
+            # wallets passing the winrate filter are scored as they arrive, the best top_k are kept
+            shortlist = self.shortlist = self.get_shortlist()
+            self.planned, self.analyzed = len(top_wallets), 0
+
+            workers = self.config_manager.workers
+            if workers > 1:
+                # Step 2 + 3: Analyze the wallets across worker processes, filtering each summary as it is merged
+                scanner = ShardedWalletScanner(workers, logging_config=self.config_manager.config,
+                                               metrics=self.services.metrics)
+                await scanner.scan(
+                    [wallet.wallet_address for wallet in top_wallets], period=timeframe,
+                    on_result=self._add_scanned_summary,
+                )
+                filtered_wallets = shortlist.items()
+                self.logger.info(f"Filtered {len(filtered_wallets)} wallets.")
+                self.add_rank_fields(filtered_wallets)
+                await self.enrich_with_token_info(filtered_wallets, top_wallets)
+                return filtered_wallets
 
-            # Step 2: Analyze each wallet activity
+            # Step 2 + 3: Analyze each wallet activity and filter it by winrate
             for wallet in top_wallets:
+                if deadline_passed():
+                    self.logger.warning(f"Time budget nearly spent, stopping after {self.analyzed} of {self.planned} wallets")
+                    break
                 wallet_address = wallet.wallet_address
                 self.logger.debug(f"Analyzing wallet: {wallet_address}")
                 wallet_activity = await self.analyze_wallet_activity(wallet_address, period=timeframe)
@@ -82,22 +138,29 @@ class TopWallets(PluginInterface):
                         f"Skipping wallet {wallet_address} due to empty or invalid data: {wallet_activity}"
                     )
                     continue
+                self.analyzed += 1
 
-                # log wallet info
-                self.logger.info(wallet_activity.to_summary(
-                    wallet_address, summary_func=custom_summary)
-                )
+                # log wallet info, only built when debugging since it is a full summary per wallet
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    with memory_stage("summarize"):
+                        self.logger.debug(wallet_activity.to_summary(
+                            wallet_address, summary_func=custom_summary)
+                        )
 
                 # create a tuple that combines the activity and wallet address
                 # wallet activity endpoint does not return the wallet address so we will combine it here
-                wallet_tuples.append((wallet_activity, wallet_address))
+                with memory_stage("filter"):
+                    shortlist.extend(await self.filter_by_winrate([(wallet_activity, wallet_address)]))
 
-            # Step 3: Filter wallets by winrate
-            filtered_wallets = await self.filter_by_winrate(wallet_tuples)
+            filtered_wallets = shortlist.items()
 
             # log the result
             self.logger.info(f"Filtered {len(filtered_wallets)} wallets.")
 
+            # Step 4: Add the rank fields and the risk of the tokens they bought recently
+            self.add_rank_fields(filtered_wallets)
+            await self.enrich_with_token_info(filtered_wallets, top_wallets)
+
             #rate limiter
             return filtered_wallets
 
@@ -105,9 +168,27 @@ class TopWallets(PluginInterface):
             self.logger.critical(f"Error running plugin: {e}", exc_info=True)
             return filtered_wallets
 
+    def partial_results(self) -> List[dict]:
+        """
+        The wallets shortlisted so far, with their rank fields. Token info is not fetched.
+        """
+        if self.shortlist is None:
+            return []
+        wallets = self.shortlist.items()
+        self.add_rank_fields(wallets)
+        return wallets
+
+    def coverage(self) -> dict:
+        return {"planned": self.planned, "completed": self.analyzed, "unit": "wallets"}
+
     def finalize(self) -> None:
         self.logger.info("TopWallets plugin finalized")
 
+    def _add_scanned_summary(self, summary: dict) -> None:
+        """ Filters and scores a summary merged from the scan workers """
+        self.analyzed += 1
+        self.shortlist.extend(self.filter_summaries_by_winrate([summary]))
+
     #custom function
     async def analyze_wallet_activity(self, wallet_address, period="7d"):
         """
@@ -149,12 +230,7 @@ class TopWallets(PluginInterface):
         :return: List of dictionaries with filtered wallet data.
         """
 
-        try:
-            user_defined_win_rate = validate_win_rate(self.plugin_settings.get("win_rate"))
-        except Exception as e:
-            self.logger.warning(f"Invalid win rate in setting: {e}")
-            user_defined_win_rate = validate_win_rate(60)
-            self.logger.info(f"Using default win rate: {user_defined_win_rate}")
+        user_defined_win_rate = self._get_win_rate()
 
         filtered_wallets = []
 
@@ -164,8 +240,184 @@ class TopWallets(PluginInterface):
             if winrate is not None and winrate >= user_defined_win_rate:
                 wallet_dict = wallet_activity.to_summary(wallet_address)
                 filtered_wallets.append(wallet_dict)
-                self.logger.info(f"Wallet {wallet_address} passed with winrate: {winrate}.")
+                self.logger.info(f"Wallet {wallet_address} passed with winrate: {winrate}.", extra=PER_WALLET)
             else:
-                self.logger.info(f"Wallet {wallet_address} failed with winrate: {winrate}.")
+                self.logger.info(f"Wallet {wallet_address} failed with winrate: {winrate}.", extra=PER_WALLET)
 
         return filtered_wallets
+
+    # custom function
+    def filter_by_daily_profit(self, top_wallets: list) -> list:
+        """
+        Computes the daily profit metrics of the whole rank in one pass and drops the wallets that miss
+        the min_daily_sharpe, max_losing_days or max_profit_concentration thresholds.
+
+        :param top_wallets: Rank entries.
+        :return: The rank entries that passed, in rank order.
+        """
+        self.daily_profit = daily_profit_metrics(top_wallets)
+        try:
+            thresholds = validate_daily_profit_filters(self.plugin_settings)
+        except Exception as e:
+            self.logger.warning(f"Invalid daily profit filter in setting: {e}, not filtering on daily profit")
+            return top_wallets
+        if all(threshold is None for threshold in thresholds.values()):
+            return top_wallets
+
+        passed = [
+            wallet for wallet in top_wallets
+            if passes_daily_profit_filters(self.daily_profit[wallet.wallet_address], **thresholds)
+        ]
+        self.logger.info(f"{len(passed)} of {len(top_wallets)} top wallets passed the daily profit filters")
+        return passed
+
+    # custom function
+    def add_rank_fields(self, wallet_summaries: List[dict]) -> None:
+        """
+        Adds the daily profit metrics computed from the rank, and the swept ranks each wallet was
+        seen in, to each wallet summary, in place.
+        """
+        for summary in wallet_summaries:
+            wallet_address = summary.get("wallet_address")
+            metrics = self.daily_profit.get(wallet_address)
+            if metrics:
+                summary.update(metrics)
+            if wallet_address in self.seen_in:
+                summary["seen_in"] = ",".join(self.seen_in[wallet_address])
+                summary["seen_count"] = len(self.seen_in[wallet_address])
+
+    # custom function
+    def get_sweep_combinations(self, timeframe: str, wallet_tag: str) -> List[tuple]:
+        """
+        Returns the (timeframe, wallet_tag) ranks to fetch: every sweep_timeframes x sweep_tags pair,
+        the configured timeframe/wallet_tag standing in for an empty list. The configured pair comes first.
+        """
+        try:
+            timeframes = [validate_timeframe(value) for value in self.plugin_settings.get("sweep_timeframes") or []]
+            tags = [validate_wallet_tag(value) for value in self.plugin_settings.get("sweep_tags") or []]
+        except Exception as e:
+            self.logger.warning(f"Invalid sweep setting: {e}, fetching the {wallet_tag}/{timeframe} rank only")
+            return [(timeframe, wallet_tag)]
+
+        combinations = [(timeframe, wallet_tag)]
+        for sweep_timeframe in timeframes or [timeframe]:
+            for tag in tags or [wallet_tag]:
+                if (sweep_timeframe, tag) not in combinations:
+                    combinations.append((sweep_timeframe, tag))
+        return combinations
+
+    # custom function
+    async def sweep_top_wallets(self, combinations: List[tuple]) -> list:
+        """
+        Fetches the rank of every (timeframe, wallet_tag) combination concurrently and merges them
+        by wallet address, so each wallet is analyzed once whatever the number of ranks it is in.
+
+        :param combinations: (timeframe, wallet_tag) pairs, the first one is the primary rank.
+        :return: Unique rank entries, in the order first seen; seen_in records where each appeared.
+        """
+        self.logger.info(f"Sweeping {len(combinations)} ranks: "
+                         f"{', '.join(f'{tag}/{timeframe}' for timeframe, tag in combinations)}")
+        ranks = await asyncio.gather(*(
+            self.get_top_wallets(timeframe=timeframe, wallet_tag=tag) for timeframe, tag in combinations
+        ))
+
+        merged = {}
+        self.seen_in = {}
+        entries = 0
+        for (timeframe, tag), rank in zip(combinations, ranks):
+            for entry in rank or []:
+                entries += 1
+                merged.setdefault(entry.wallet_address, entry)
+                self.seen_in.setdefault(entry.wallet_address, []).append(f"{tag}/{timeframe}")
+        self.logger.info(f"Sweep found {len(merged)} unique wallets in {entries} rank entries "
+                         f"({entries - len(merged)} duplicate wallet lookups saved)")
+        return list(merged.values())
+
+    # custom function
+    def get_shortlist(self) -> Shortlist:
+        """
+        Builds the shortlist of scored wallets from the score_weights and top_k settings.
+        Scoring is off unless one of them is set: wallets then keep the rank order and get no score.
+        Wallets are scored but keep the rank order when top_k is 0, otherwise the best top_k are kept,
+        highest score first.
+        """
+        try:
+            top_k = validate_top_k(self.plugin_settings.get("top_k", 0))
+        except Exception as e:
+            self.logger.warning(f"Invalid top_k in setting: {e}, keeping every wallet")
+            top_k = 0
+        if not top_k and not self.plugin_settings.get("score_weights"):
+            return Shortlist(None)
+
+        try:
+            weights = validate_score_weights(self.plugin_settings.get("score_weights"))
+            engine = ScoringEngine(weights)
+        except Exception as e:
+            self.logger.warning(f"Invalid score weights in setting: {e}, using the default weights")
+            engine = ScoringEngine()
+        return Shortlist(engine, top_k or None)
+
+    # custom function
+    async def enrich_with_token_info(self, wallet_summaries: List[dict], top_wallets: list) -> None:
+        """
+        Adds the liquidity, honeypot and holder concentration of each wallet's recent buys to its summary,
+        if enrich_tokens is enabled. Tokens bought by several wallets are fetched once.
+
+        :param wallet_summaries: Filtered wallet summaries, updated in place.
+        :param top_wallets: Rank entries of the wallets, holding their recent_buy_tokens.
+        """
+        if not self.plugin_settings.get("enrich_tokens", False) or not wallet_summaries:
+            return
+
+        bought = {
+            entry.wallet_address: [
+                token.get("address") for token in entry.recent_buy_tokens
+                if isinstance(token, dict) and token.get("address")
+            ]
+            for entry in top_wallets
+        }
+        summary_tokens = [bought.get(summary.get("wallet_address"), []) for summary in wallet_summaries]
+        token_infos = await self.gmgn.get_token_infos(
+            address for addresses in summary_tokens for address in addresses
+        )
+        self.logger.info(f"Fetched token info for {len(token_infos)} distinct tokens bought by "
+                         f"{len(wallet_summaries)} wallets")
+
+        for summary, addresses in zip(wallet_summaries, summary_tokens):
+            summary.update(bought_tokens_summary(addresses, token_infos))
+
+    # custom function
+    def filter_summaries_by_winrate(self, wallet_summaries: List[dict]) -> List[dict]:
+        """
+        Filters wallet summary dictionaries (as returned by the scan workers) based on win rate.
+
+        :param wallet_summaries: List of wallet summary dictionaries.
+        :return: List of dictionaries with filtered wallet data.
+        """
+        user_defined_win_rate = self._get_win_rate()
+
+        filtered_wallets = []
+
+        self.logger.debug(f"Filtering wallets with win rate >= {user_defined_win_rate}")
+        for wallet_summary in wallet_summaries:
+            wallet_address = wallet_summary.get("wallet_address")
+            winrate = wallet_summary.get("winrate")
+            if winrate is not None and winrate >= user_defined_win_rate:
+                filtered_wallets.append(wallet_summary)
+                self.logger.info(f"Wallet {wallet_address} passed with winrate: {winrate}.", extra=PER_WALLET)
+            else:
+                self.logger.info(f"Wallet {wallet_address} failed with winrate: {winrate}.", extra=PER_WALLET)
+
+        return filtered_wallets
+
+    def _get_win_rate(self) -> float:
+        """
+        Returns the validated win rate threshold from the plugin settings, falling back to 60%.
+        """
+        try:
+            return validate_win_rate(self.plugin_settings.get("win_rate"))
+        except Exception as e:
+            self.logger.warning(f"Invalid win rate in setting: {e}")
+            user_defined_win_rate = validate_win_rate(60)
+            self.logger.info(f"Using default win rate: {user_defined_win_rate}")
+            return user_defined_win_rate
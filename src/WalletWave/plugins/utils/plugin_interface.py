@@ -1,42 +1,69 @@
 from abc import ABC, abstractmethod
-from typing import List, Union, Dict, Any
+from typing import TYPE_CHECKING, List, Union, Dict, Any, Optional
 
 from WalletWave.config import ConfigManager
 
+if TYPE_CHECKING:
+    from WalletWave.services import ServiceContainer
+
 
 class PluginInterface(ABC):
     """
     Abstract base class for all plugins. Every plugin must implement the following methods.
+
+    Plugins describe themselves with the name, description and version class attributes so the
+    menu can list them without importing or instantiating them.
+
+    Shared services (the GMGN repository) come from the ServiceContainer owned by WalletWave;
+    plugins use self.gmgn instead of building their own client.
     """
 
-    def __init__(self, config_manager: ConfigManager):
+    name: str = None
+    description: str = ""
+    version: str = ""
+
+    def __init__(self, config_manager: ConfigManager, services: "ServiceContainer" = None):
         """
         Initializes the plugin with a ConfigManager instance.
         :param config_manager: The configuration manager for the plugin.
+        :param services: Shared services of the process. A private container is created if omitted.
         """
+        from WalletWave.services import ServiceContainer
+
         self.config_manager = config_manager
         self.plugin_class = self.__class__.__name__
+        self.services = services or ServiceContainer(config_manager)
+        self._gmgn = None
+
+    @property
+    def gmgn(self):
+        """
+        The GMGN repository shared through the service container.
+        """
+        return self._gmgn or self.services.gmgn_repo
+
+    @gmgn.setter
+    def gmgn(self, repo):
+        # plugins may still assign their own repository
+        self._gmgn = repo
 
-    @abstractmethod
     def get_name(self) -> str:
         """
         Returns the name of the plugin.
         """
-        pass
+        return self.name or self.plugin_class
 
-    @abstractmethod
     def get_description(self) -> str:
         """
         Returns a brief description of the plugin.
         """
-        pass
+        return self.description
 
-    @abstractmethod
     def get_version(self) -> str:
         """
         Returns plugin version
         """
-        pass
+        return self.version
 
     @abstractmethod
     def initialize(self) -> None:
@@ -55,6 +82,20 @@ class PluginInterface(ABC):
         """
         pass
 
+    def partial_results(self) -> Optional[List[Union[Dict, Any]]]:
+        """
+        Returns the data completed so far by a running execute, exported when the run is cancelled at
+        the end of its time budget. Plugins that cannot tell keep the default, None, and export nothing.
+        """
+        return None
+
+    def coverage(self) -> Dict[str, Any]:
+        """
+        Returns the progress of the current run, written to the run metadata of time budgeted runs:
+        {"planned": ..., "completed": ..., "unit": "wallets"}, or an empty dict if unknown.
+        """
+        return {}
+
     @abstractmethod
     def finalize(self) -> None:
         """
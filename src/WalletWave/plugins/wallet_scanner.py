@@ -1,41 +1,56 @@
 from WalletWave.plugins.utils.plugin_interface import PluginInterface
-from WalletWave.repositories.gmgn_repo import GmgnRepo
-from WalletWave.utils.logging_utils import get_logger
+from WalletWave.utils.gmgn_client.utils.rate_limiter import deadline_passed
+from WalletWave.utils.logging_utils import get_logger, PER_WALLET
+from WalletWave.utils.mem_profile import memory_stage
+from WalletWave.utils.worker_pool import ShardedWalletScanner
 from WalletWave.config import ConfigManager
+from WalletWave.utils.config_validators import validate_request_timeout
+import asyncio
 import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from WalletWave.services import ServiceContainer
 
 # Author: LetsStartWithPurple
 # Version: 1.0.1
 
 class SolanaWalletScanner(PluginInterface):
-    def __init__(self, config_manager: ConfigManager):
-        super().__init__(config_manager)
-        self.gmgn = GmgnRepo()
+    # name shown in the plugin menu and a short description of your plugin
+    name = "Solana Wallet Scanner"
+    description = "Scans a list of wallets and exports performance"
+    version = "1.0.1"
+
+    def __init__(self, config_manager: ConfigManager, services: "ServiceContainer" = None):
+        super().__init__(config_manager, services)
         self.timeframe = config_manager.get_plugin_setting(self.plugin_class, "timeframe", "7d")
         self.wallets = []
-        self.logger = None
-
-    async def initialize(self):
-        self.logger = await get_logger("SolanaWalletScanner")
-
-    def get_name(self) -> str:
-        # return the name you want to show in the plugin menu
-        return "Solana Wallet Scanner"
-
-    def get_description(self) -> str:
-        # return a short description of your plugin
-        return "Scans a list of wallets and exports performance"
-
-    def get_version(self) -> str:
-        return "1.0.1"
+        self.wallet_data = []  # summaries of the current run
+        self.logger = get_logger("SolanaWalletScanner")
 
     async def initialize(self) -> None:
         # Step 1 of plugin lifecycle
         self.logger.info("Solana Wallet Scanner initialized")
 
+        # Unattended runs (e.g. daemon jobs) provide the wallet file in the plugin settings
+        wallet_file_path = self.config_manager.get_plugin_setting(self.plugin_class, "wallet_file")
+        if not wallet_file_path and not self.config_manager.interactive:
+            raise RuntimeError("The 'wallet_file' setting is required when running without prompts")
+        if wallet_file_path:
+            self._load_wallets(wallet_file_path)
+            if not self.wallets:
+                self.logger.error("No wallets loaded. Stopping plugin execution")
+                raise RuntimeError(f"No wallets found in {wallet_file_path}. Plugin cannot proceed")
+            self.logger.info(f"Solana Wallet Scanner initialized with {len(self.wallets)} wallets")
+            return
+
         # Loop until the user inputs the correct file path
         while True:
-            wallet_file_path = input("Please provide the path to the wallet list file: ").strip()
+            # prompt from a worker thread so the event loop is not blocked
+            wallet_file_path = await asyncio.get_running_loop().run_in_executor(
+                None, input, "Please provide the path to the wallet list file: "
+            )
+            wallet_file_path = wallet_file_path.strip()
             try:
                 self._load_wallets(wallet_file_path)
                 if not self.wallets:
@@ -52,40 +67,72 @@ class SolanaWalletScanner(PluginInterface):
                 print(f"An error occurred: {str(e)}. Please try again.")
 
     async def execute(self) -> list:
-        while True:
-            user_input = input("Type desired timeout between requests in seconds. Press 0 to omit: ").strip()
-            try:
-                timeout = int(user_input)
-
-                if timeout < 0:
-                    self.logger.info("Please enter a number 0 or greater.")
-                    continue
-
-                timeout = None if timeout == 0 else timeout
-                break
-
-            except ValueError:
-                self.logger.info(f"'{user_input}' is invalid. Please enter a number 0 or greater")
+        timeout = self.config_manager.get_plugin_setting(self.plugin_class, "timeout")
+        if timeout is None and self.config_manager.interactive:
+            timeout = await self._prompt_timeout()
+        else:
+            timeout = validate_request_timeout(timeout or 0) or None
 
 
         # Step 2 execute the plugin
-        wallet_data = []
+        wallet_data = self.wallet_data = []
         self.logger.info("Executing Solana Wallet Scanner...")
 
+        workers = self.config_manager.workers
+        if workers > 1:
+            scanner = ShardedWalletScanner(workers, logging_config=self.config_manager.config,
+                                           metrics=self.services.metrics)
+            await scanner.scan(self.wallets, period=self.timeframe, timeout=timeout, on_result=wallet_data.append)
+            self.logger.info(f"Scanned {len(wallet_data)}")
+            return wallet_data
+
         for wallet in self.wallets:
+            if deadline_passed():
+                self.logger.warning(f"Time budget nearly spent, stopping after {len(wallet_data)} of {len(self.wallets)} wallets")
+                break
             try:
                 wallet_info = await self.gmgn.get_wallet_info(wallet, timeout, period=self.timeframe)
-                wallet_data.append(wallet_info.to_summary(wallet))
-                self.logger.info(f"Fetched data for wallet: {wallet}")
+                with memory_stage("summarize"):
+                    wallet_data.append(wallet_info.to_summary(wallet))
+                self.logger.info(f"Fetched data for wallet: {wallet}", extra=PER_WALLET)
             except Exception as e:
                 self.logger.error(f"Error fetching data for wallet {wallet}: {e}")
 
         self.logger.info(f"Scanned {len(wallet_data)}")
         return wallet_data
 
+    def partial_results(self) -> list:
+        return list(self.wallet_data)
+
+    def coverage(self) -> dict:
+        return {"planned": len(self.wallets), "completed": len(self.wallet_data), "unit": "wallets"}
+
     def finalize(self) -> None:
         self.logger.info("Solana Wallet Scanner finalized")
 
+    async def _prompt_timeout(self):
+        """
+        Asks the user for the timeout between requests.
+
+        :return: Timeout in seconds, or None to use the default delay between requests.
+        """
+        while True:
+            user_input = await asyncio.get_running_loop().run_in_executor(
+                None, input, "Type desired timeout between requests in seconds. Press 0 to omit: "
+            )
+            user_input = user_input.strip()
+            try:
+                timeout = int(user_input)
+
+                if timeout < 0:
+                    self.logger.info("Please enter a number 0 or greater.")
+                    continue
+
+                return None if timeout == 0 else timeout
+
+            except ValueError:
+                self.logger.info(f"'{user_input}' is invalid. Please enter a number 0 or greater")
+
     def _load_wallets(self, file_path: str) -> None:
         """
             Load wallets address from a text file
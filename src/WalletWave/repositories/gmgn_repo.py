@@ -1,19 +1,44 @@
-from WalletWave.utils.gmgn_client.schemas import WalletsResponse, WalletInfoResponse
+import asyncio
+from typing import TYPE_CHECKING, Dict, Iterable
+
 from WalletWave.utils.gmgn_client.client import Gmgn
 from WalletWave.utils.gmgn_client.utils.gmgn_endpoints import GmgnEndpoints
+from WalletWave.utils.gmgn_client.utils.ttl_cache import TTLCache
+from WalletWave.utils.logging_utils import get_logger
+from WalletWave.utils.mem_profile import memory_stage
 
 from datetime import datetime
 
+# the pydantic schemas are imported when the first response is parsed
+if TYPE_CHECKING:
+    from WalletWave.utils.gmgn_client.schemas import WalletsResponse, WalletInfoResponse, TokenInfoResponse, TopHoldersResponse
+    from WalletWave.utils.gmgn_client.schemas.token_info import TokenInfo
+
+# token info changes slowly and is shared by many wallets, so it is cached for an hour
+TOKEN_INFO_TTL = 3600
+
 class GmgnRepo:
-    def __init__(self):
+    def __init__(self, client: Gmgn = None, cache_ttl: float = None, token_cache_ttl: float = TOKEN_INFO_TTL):
         """
         Initializes the GmgnRepo object.
+
+        :param client: Gmgn client to send requests with. A new client is created if omitted.
+        :param cache_ttl: Seconds to keep parsed responses cached. Caching is disabled if omitted.
+        :param token_cache_ttl: Seconds to keep token info cached.
         """
-        self.client = Gmgn()
+        self.client = client or Gmgn()
+        self.logger = get_logger("GmgnRepo")
         self.endpoint = GmgnEndpoints
+        self.cache = TTLCache(cache_ttl) if cache_ttl else None
+        self.token_cache = TTLCache(token_cache_ttl, max_entries=100_000)
+        self._token_requests: Dict[str, "asyncio.Future"] = {}  # token info requests in flight
+
+    async def aclose(self):
+        """ Releases the client's connection pool """
+        await self.client.aclose()
 
 
-    async def get_trending_wallets(self, timeframe: str, wallet_tag: str, order: str = "desc") -> WalletsResponse:
+    async def get_trending_wallets(self, timeframe: str, wallet_tag: str, order: str = "desc") -> "WalletsResponse":
         """
         Fetches trending wallets for a given timeframe and wallet tag.
 
@@ -23,7 +48,7 @@ class GmgnRepo:
             order (str): Order to sort the wallets ("desc", "asc") Default: "desc"
 
         Returns:
-            WalletsResponse: The response from the GMGN API containing trending wallet data.
+            WalletsResponse: The response from the GMGN API containing trending wallet data, or None if the request failed.
 
         Raises:
             ValueError: If the provided timeframe or wallet tag is invalid.
@@ -40,42 +65,146 @@ class GmgnRepo:
             "direction": order,
         }
 
+        cache_key = ("trending_wallets", timeframe, wallet_tag, order)
+        if self.cache is not None and (cached := self.cache.get(cache_key)) is not None:
+            return cached
+
         # Build the endpoint URL
         url = self.endpoint.get_url(self.endpoint.TRENDING_WALLETS, timeframe=timeframe)
 
-        self.client.queue_request(url, params)
-
         # Make the request
-        response = await self.client.execute_requests()
+        with memory_stage("fetch"):
+            response = await self.client.request(url, params)
+        if not response:
+            return None
+
+        from WalletWave.utils.gmgn_client.schemas import WalletsResponse
+
+        with memory_stage("parse"):
+            wallets = WalletsResponse.model_validate(response)
+        if self.cache is not None:
+            self.cache.set(cache_key, wallets)
+        return wallets
 
-        return WalletsResponse.model_validate(response)
+    async def get_token_info(self, contract_address: str) -> "TokenInfoResponse":
+        """
+        Fetches the token info of a contract address.
+
+        Responses are kept in the token cache, and concurrent calls for the same token share one request.
 
-    async def get_token_info(self, contract_address: str) -> dict:
+        :param contract_address: Token contract address.
+        :return: The parsed response, or None if the request failed.
+        """
         if not contract_address:
             raise ValueError("Must provide a contract address")
+
+        if (cached := self.token_cache.get(contract_address)) is not None:
+            return cached
+
+        pending = self._token_requests.get(contract_address)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_token_info(contract_address))
+            self._token_requests[contract_address] = pending
+            pending.add_done_callback(lambda _: self._token_requests.pop(contract_address, None))
+        # shielded so a cancelled caller does not cancel the request shared with the others
+        return await asyncio.shield(pending)
+
+    async def _fetch_token_info(self, contract_address: str) -> "TokenInfoResponse":
         url = self.endpoint.get_url(self.endpoint.TOKEN_INFO, contract_address=contract_address)
 
-        #make request
-        return self.client.queue_request(url)
+        with memory_stage("fetch"):
+            response = await self.client.request(url)
+        if not response:
+            return None
+
+        from WalletWave.utils.gmgn_client.schemas import TokenInfoResponse
 
-    async def get_wallet_info(self, wallet_address: str, timeout: int = 0, period: str = "7d") -> WalletInfoResponse:
+        with memory_stage("parse"):
+            token_info = TokenInfoResponse.model_validate(response)
+        self.token_cache.set(contract_address, token_info)
+        return token_info
+
+    async def get_token_infos(self, contract_addresses: Iterable[str]) -> Dict[str, "TokenInfo"]:
+        """
+        Fetches the token info of many tokens concurrently, one request per distinct token.
+
+        :param contract_addresses: Token contract addresses, duplicates are fetched once.
+        :return: Dictionary of contract address to TokenInfo, None for tokens that could not be fetched.
+        """
+        addresses = list(dict.fromkeys(address for address in contract_addresses if address))
+        responses = await asyncio.gather(
+            *(self.get_token_info(address) for address in addresses), return_exceptions=True
+        )
+
+        token_infos = {}
+        for address, response in zip(addresses, responses):
+            if isinstance(response, BaseException):
+                self.logger.error(f"Error fetching token info for {address}: {response!r}")
+                token_infos[address] = None
+                continue
+            if not response or not response.data:
+                token_infos[address] = None
+                continue
+            token_infos[address] = next((token for token in response.data if token.address == address), response.data[0])
+        return token_infos
+
+    async def get_top_holders(self, contract_address: str, limit: int = 100) -> "TopHoldersResponse":
+        """
+        Fetches the top holders of a token.
+
+        :param contract_address: Token contract address.
+        :param limit: Number of holders to return.
+        :return: The parsed response, or None if the request failed.
+        """
+        if not contract_address:
+            raise ValueError("Must provide a contract address")
+
+        cache_key = ("top_holders", contract_address, limit)
+        if self.cache is not None and (cached := self.cache.get(cache_key)) is not None:
+            return cached
+
+        url = self.endpoint.get_url(self.endpoint.TOP_HOLDERS, contract_address=contract_address)
+
+        with memory_stage("fetch"):
+            response = await self.client.request(url, {"limit": limit})
+        if not response:
+            return None
+
+        from WalletWave.utils.gmgn_client.schemas import TopHoldersResponse
+
+        with memory_stage("parse"):
+            holders = TopHoldersResponse.model_validate(response)
+        if self.cache is not None:
+            self.cache.set(cache_key, holders)
+        return holders
+
+    async def get_wallet_info(self, wallet_address: str, timeout: int = 0, period: str = "7d") -> "WalletInfoResponse":
         valid_periods = ["7d", "30d"]
         if not wallet_address:
             raise ValueError("Must provide a wallet address")
         if period not in valid_periods:
             raise ValueError(f"Invalid period: {period}")
 
+        cache_key = ("wallet_info", wallet_address, period)
+        if self.cache is not None and (cached := self.cache.get(cache_key)) is not None:
+            return cached
+
         params = {"period": period}
         # build the endpoint url
-        #url = self.endpoint.get_url(self.endpoint.WALLET_INFO, wallet_address=wallet_address)
-        
-        # Easier 
-        url = f"https://gmgn.ai/defi/quotation/v1/smartmoney/sol/walletNew/{wallet_address}"
-        
-        # Append the request to later on parallelize it
-        self.client.queue_request(url, params, timeout)
-        response = await self.client.execute_requests()
-        return WalletInfoResponse.model_validate(response)
+        url = self.endpoint.get_url(self.endpoint.WALLET_INFO, wallet_address=wallet_address)
+
+        with memory_stage("fetch"):
+            response = await self.client.request(url, params, timeout)
+        if not response:
+            return None
+
+        from WalletWave.utils.gmgn_client.schemas import WalletInfoResponse
+
+        with memory_stage("parse", wallets=1):
+            wallet_info = WalletInfoResponse.model_validate(response)
+        if self.cache is not None:
+            self.cache.set(cache_key, wallet_info)
+        return wallet_info
         # response = self.client.queue_request(url, timeout, params)
         # print(f"Request was made at {datetime.now()}")
         # return transform(response, WalletInfoResponse)
@@ -0,0 +1,77 @@
+import asyncio
+from typing import Dict, List
+
+import yaml
+
+from CLI.plugin_manager import PluginManager
+from WalletWave.config import ConfigManager
+from WalletWave.utils.logging_utils import get_logger
+
+logger = get_logger("Runner")
+
+
+def parse_params(params: List[str], plugin_classes: List[str]) -> Dict[str, dict]:
+    """
+    Parses --param overrides into plugin settings.
+
+    "key=value" applies to every selected plugin, "Plugin.key=value" only to that plugin.
+    Values are parsed as YAML scalars, so "70" is an int and "true" a bool.
+
+    :param params: Raw --param values.
+    :param plugin_classes: Class names of the selected plugins.
+    :return: Settings per plugin class name.
+    """
+    settings = {plugin_class: {} for plugin_class in plugin_classes}
+    lookup = {plugin_class.lower(): plugin_class for plugin_class in plugin_classes}
+    for param in params:
+        key, separator, value = param.partition("=")
+        if not separator or not key:
+            raise ValueError(f"Invalid --param '{param}', expected [PLUGIN.]KEY=VALUE")
+
+        value = yaml.safe_load(value) if value else None
+        plugin, dot, setting = key.rpartition(".")
+        if dot:
+            if plugin.lower() not in lookup:
+                raise ValueError(f"--param '{param}' targets a plugin that is not selected: {plugin}")
+            settings[lookup[plugin.lower()]][setting] = value
+        else:
+            for plugin_settings in settings.values():
+                plugin_settings[setting] = value
+    return settings
+
+
+def run_command(manager: ConfigManager, args) -> None:
+    """
+    Entry point of `walletwave run`.
+
+    Plugins take their settings from the config file and --param overrides and never prompt.
+    All selected plugins run concurrently in one process and share the app's GMGN client.
+    """
+    # imported here: main.py imports this module to dispatch `walletwave run`
+    from WalletWave.main import WalletWave
+
+    manager.interactive = False
+
+    plugin_manager = PluginManager(config_manager=manager)
+    plugin_manager.load_plugins()
+
+    selected = []
+    for name in args.plugins:
+        plugin_spec = plugin_manager.get_plugin(name)
+        if plugin_spec is None:
+            raise ValueError(f"Unknown plugin: {name}")
+        selected.append(plugin_spec)
+
+    settings = parse_params(args.param, [plugin_spec.class_name for plugin_spec in selected])
+    app = WalletWave(manager)
+
+    plugins = [
+        plugin_spec.load(
+            manager.with_plugin_settings(plugin_spec.class_name, settings[plugin_spec.class_name]),
+            app.services,
+        )
+        for plugin_spec in selected
+    ]
+
+    logger.info(f"Running {', '.join(plugin.get_name() for plugin in plugins)}")
+    asyncio.run(app.run_plugins(plugins))
@@ -0,0 +1,108 @@
+from typing import Optional
+
+from WalletWave.config import ConfigManager
+from WalletWave.repositories.gmgn_repo import GmgnRepo
+from WalletWave.repositories.snapshot_repo import SnapshotRepo
+from WalletWave.utils.gmgn_client.client import Gmgn
+from WalletWave.utils.gmgn_client.metrics import ClientMetrics
+from WalletWave.utils.gmgn_client.utils.hedging import HedgePolicy
+from WalletWave.utils.gmgn_client.utils.rate_limiter import RateLimiter
+from WalletWave.utils.logging_utils import get_logger
+
+
+class ServiceContainer:
+    """
+    Shared services of one WalletWave process.
+
+    Builds a single GMGN client and repository on first use and hands the same instances to every
+    plugin, so plugins running in one process share one connection pool, one header identity,
+    one response cache and one rate budget (program_settings.request_delay), split between the
+    request priorities by program_settings.lane_weights. Client metrics are kept for the lifetime
+    of the container, and so is the rate budget, across client rebuilds.
+
+    With --record every response is archived to a session file, with --replay requests are answered
+    from one and the rate budget is lifted.
+
+    Wallet summaries returned by plugins are appended to the snapshot database
+    (program_settings.snapshot_db), except when replaying a session.
+    """
+
+    def __init__(self, config: Optional[ConfigManager] = None, cache_ttl: Optional[float] = None):
+        """
+        :param config: The configuration manager. Defaults apply if omitted.
+        :param cache_ttl: Seconds to keep GMGN responses cached. Caching is disabled if omitted.
+        """
+        self.config = config
+        self.cache_ttl = cache_ttl
+        self.logger = get_logger("ServiceContainer")
+        self.metrics = ClientMetrics()
+        self.transport = None
+        self.replaying = bool(config and config.replay_session)
+        if config and (config.record_session or config.replay_session):
+            # imported here, the session archive pulls in httpx
+            from WalletWave.utils.gmgn_client.utils.session_archive import session_transport
+            self.transport = session_transport(config.record_session, config.replay_session)
+        self.rate_limiter = RateLimiter(0 if self.replaying else config.request_delay if config else 2,
+                                        config.lane_weights if config else None)
+        # latencies seen by the hedging policy are kept across client rebuilds, like the rate budget
+        self.hedging = HedgePolicy(**config.hedge_policy) if config and config.hedge_policy else None
+        self._gmgn_repo: Optional[GmgnRepo] = None
+        self._snapshot_repo: Optional[SnapshotRepo] = None
+
+    @property
+    def gmgn_repo(self) -> GmgnRepo:
+        """ The shared GMGN repository, created on first use """
+        if self._gmgn_repo is None:
+            retry_policy = self.config.retry_policy if self.config else {}
+            client = Gmgn(persistent=True, rate_limiter=self.rate_limiter, metrics=self.metrics,
+                          transport=self.transport, hedging=self.hedging, **retry_policy)
+            self._gmgn_repo = GmgnRepo(client, cache_ttl=self.cache_ttl)
+            self.logger.debug(f"Created shared GMGN client (request delay {self.rate_limiter.interval}s)")
+        return self._gmgn_repo
+
+    @property
+    def snapshot_repo(self) -> Optional[SnapshotRepo]:
+        """ The snapshot database, opened on first use. None if snapshots are disabled or a session is replayed """
+        if self._snapshot_repo is None and self.config and self.config.snapshot_db and not self.replaying:
+            self._snapshot_repo = SnapshotRepo(self.config.snapshot_db)
+        return self._snapshot_repo
+
+    def record_snapshots(self, summaries) -> int:
+        """
+        Appends the wallet summaries of a plugin run to the snapshot database, if enabled.
+
+        :return: Number of snapshots written.
+        """
+        repo = self.snapshot_repo
+        if repo is None or not isinstance(summaries, list):
+            return 0
+        try:
+            recorded = repo.record(summaries)
+        except Exception as e:
+            self.logger.error(f"Failed to record wallet snapshots to {repo.path}: {e}")
+            return 0
+        self.logger.debug(f"Recorded {recorded} wallet snapshots to {repo.path}")
+        return recorded
+
+    async def aclose(self) -> None:
+        """ Releases the shared client and snapshot database; they are reopened if used again """
+        if self._gmgn_repo is not None:
+            await self._gmgn_repo.aclose()
+            self._gmgn_repo = None
+        if self._snapshot_repo is not None:
+            self._snapshot_repo.close()
+            self._snapshot_repo = None
+        if self.replaying and self.transport.misses:
+            self.logger.warning(f"{self.transport.misses} requests were not found in session "
+                                f"{self.transport.archive.path} ({self.transport.hits} replayed)")
+
+    def write_metrics(self) -> None:
+        """ Writes the client metrics to --metrics-out, if set """
+        if self.config and self.config.metrics_out:
+            self.metrics.write(self.config.metrics_out)
+
+    async def __aenter__(self) -> "ServiceContainer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
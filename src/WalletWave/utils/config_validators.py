@@ -9,6 +9,19 @@ def validate_verbose(verbose):
         raise ValueError("Verbose must be a boolean")
     return verbose
 
+def validate_interactive(interactive):
+    if not isinstance(interactive, bool):
+        raise ValueError("Interactive must be a boolean")
+    return interactive
+
+def validate_snapshot_db(path):
+    """
+    Returns the snapshot database path, None if snapshots are disabled (empty or null)
+    """
+    if not path:
+        return None
+    return validate_path(path)
+
 def validate_export_enabled(export_enabled_setting):
     if not isinstance(export_enabled_setting, bool):
         raise ValueError("Export Enabled setting must be True or False")
@@ -20,6 +33,182 @@ def validate_export_format(export_format):
         raise ValueError("Export format must be 'csv' or 'txt'")
     return export_format
 
+def validate_workers(workers):
+    if not isinstance(workers, int) or isinstance(workers, bool):
+        raise ValueError("Workers must be an integer")
+    elif workers < 1:
+        raise ValueError("Workers must be 1 or greater")
+    return workers
+
+def validate_request_delay(delay):
+    if not isinstance(delay, (int, float)) or isinstance(delay, bool):
+        raise ValueError("Request delay must be a number")
+    elif delay < 0:
+        raise ValueError("Request delay must be 0 or greater")
+    return delay
+
+def validate_log_format(log_format):
+    if log_format not in ["text", "json"]:
+        raise ValueError("Log format must be either text or json")
+    return log_format
+
+def validate_wallet_log_sample(sample):
+    if not isinstance(sample, int) or isinstance(sample, bool):
+        raise ValueError("Wallet log sample must be an integer")
+    elif sample < 1:
+        raise ValueError("Wallet log sample must be 1 or greater")
+    return sample
+
+def validate_retry_policy(policy):
+    """
+    Validates program_settings.retry and converts it to Gmgn client arguments
+    """
+    policy = policy or {}
+    if not isinstance(policy, dict):
+        raise ValueError("Retry settings must be a mapping")
+
+    backoff = policy.get("backoff", [5, 10])
+    if (not isinstance(backoff, (list, tuple)) or len(backoff) != 2
+            or not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in backoff)
+            or not 0 <= backoff[0] <= backoff[1]):
+        raise ValueError("Retry backoff must be [min, max] seconds with 0 <= min <= max")
+
+    max_retries = policy.get("max_retries")
+    if max_retries is not None and (not isinstance(max_retries, int) or isinstance(max_retries, bool) or max_retries < 0):
+        raise ValueError("Max retries must be an integer of 0 or greater, or null to retry until success")
+
+    cookie_clear_after = policy.get("cookie_clear_after", 3)
+    if not isinstance(cookie_clear_after, int) or isinstance(cookie_clear_after, bool) or cookie_clear_after < 1:
+        raise ValueError("Cookie clear threshold must be an integer of 1 or greater")
+
+    respect_retry_after = policy.get("respect_retry_after", False)
+    if not isinstance(respect_retry_after, bool):
+        raise ValueError("Respect Retry-After must be True or False")
+
+    request_timeout = policy.get("request_timeout", 0)
+    if not isinstance(request_timeout, (int, float)) or isinstance(request_timeout, bool) or request_timeout < 0:
+        raise ValueError("Request timeout must be 0 or greater")
+
+    return {
+        "backoff_range": tuple(backoff),
+        "max_retries": max_retries,
+        "cookie_clear_after": cookie_clear_after,
+        "respect_retry_after": respect_retry_after,
+        "request_timeout": request_timeout or None,
+    }
+
+def validate_hedging_policy(policy):
+    """
+    Validates program_settings.hedging and converts it to HedgePolicy arguments, None if hedging is disabled
+    """
+    policy = policy or {}
+    if not isinstance(policy, dict):
+        raise ValueError("Hedging settings must be a mapping")
+    if not policy.get("enabled", False):
+        return None
+
+    quantile = policy.get("quantile", 0.99)
+    if not isinstance(quantile, (int, float)) or isinstance(quantile, bool) or not 0 < quantile < 1:
+        raise ValueError("Hedging quantile must be between 0 and 1")
+
+    max_ratio = policy.get("max_ratio", 0.05)
+    if not isinstance(max_ratio, (int, float)) or isinstance(max_ratio, bool) or not 0 < max_ratio <= 1:
+        raise ValueError("Hedging max_ratio must be greater than 0 and at most 1")
+
+    endpoints = policy.get("endpoints", ["wallet_info"]) or []
+    if not isinstance(endpoints, list) or not all(isinstance(endpoint, str) for endpoint in endpoints):
+        raise ValueError("Hedging endpoints must be a list of endpoint names, empty for every endpoint")
+
+    min_samples = policy.get("min_samples", 20)
+    if not isinstance(min_samples, int) or isinstance(min_samples, bool) or min_samples < 1:
+        raise ValueError("Hedging min_samples must be an integer of 1 or greater")
+
+    return {"quantile": quantile, "max_ratio": max_ratio, "endpoints": endpoints, "min_samples": min_samples}
+
+def validate_lane_weights(weights):
+    """
+    Validates program_settings.lane_weights, the share of the rate budget of each request priority
+    """
+    weights = weights or {}
+    if not isinstance(weights, dict):
+        raise ValueError("Lane weights must be a mapping of priority to weight")
+    for lane, weight in weights.items():
+        if lane not in ["interactive", "normal", "bulk"]:
+            raise ValueError(f"Unknown lane {lane}, expected interactive, normal or bulk")
+        if not isinstance(weight, (int, float)) or isinstance(weight, bool) or weight <= 0:
+            raise ValueError(f"Weight of lane {lane} must be a number greater than 0")
+    return weights
+
+def validate_request_priority(settings):
+    """
+    Validates the priority and request_max_wait of a plugin and converts them to request_priority arguments
+    """
+    settings = settings or {}
+    lane = settings.get("priority", "normal")
+    if lane not in ["interactive", "normal", "bulk"]:
+        raise ValueError("Priority must be 'interactive', 'normal' or 'bulk'")
+    max_wait = settings.get("request_max_wait")
+    if max_wait is not None and (not isinstance(max_wait, (int, float)) or isinstance(max_wait, bool) or max_wait <= 0):
+        raise ValueError("request_max_wait must be a number of seconds greater than 0, or null")
+    return {"lane": lane, "max_wait": max_wait}
+
+def validate_time_budget(seconds):
+    """
+    Returns the time budget of a plugin run in seconds, None if unlimited (null or 0)
+    """
+    if not seconds:
+        return None
+    if not isinstance(seconds, (int, float)) or isinstance(seconds, bool) or seconds < 0:
+        raise ValueError("Time budget must be a number of seconds, 0 or null for no limit")
+    return seconds
+
+def validate_top_k(top_k):
+    if not isinstance(top_k, int) or isinstance(top_k, bool):
+        raise ValueError("Top K must be an integer")
+    elif top_k < 0:
+        raise ValueError("Top K must be 0 or greater")
+    return top_k
+
+def validate_score_weights(weights):
+    weights = weights or {}
+    if not isinstance(weights, dict):
+        raise ValueError("Score weights must be a mapping of feature to weight")
+    for feature, weight in weights.items():
+        if not isinstance(weight, (int, float)) or isinstance(weight, bool):
+            raise ValueError(f"Score weight of {feature} must be a number")
+    return weights
+
+def validate_daily_profit_filters(settings):
+    """
+    Validates the daily profit thresholds of a plugin and converts them to passes_daily_profit_filters arguments
+    """
+    def optional_number(key, minimum=None):
+        value = settings.get(key)
+        if value is None:
+            return None
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise ValueError(f"{key} must be a number or null")
+        if minimum is not None and value < minimum:
+            raise ValueError(f"{key} must be {minimum} or greater")
+        return value
+
+    settings = settings or {}
+    max_concentration = optional_number("max_profit_concentration", 0)
+    if max_concentration is not None and max_concentration > 1:
+        raise ValueError("max_profit_concentration must be between 0 and 1")
+    return {
+        "min_sharpe": optional_number("min_daily_sharpe"),
+        "max_losing_days": optional_number("max_losing_days", 0),
+        "max_concentration": max_concentration,
+    }
+
+def validate_request_timeout(timeout):
+    if not isinstance(timeout, int) or isinstance(timeout, bool):
+        raise ValueError("Timeout must be an integer")
+    elif timeout < 0:
+        raise ValueError("Timeout must be 0 or greater")
+    return timeout
+
 def validate_timeframe(timeframe):
     valid_timeframes = ["1d", "7d", "30d"]
     if timeframe not in valid_timeframes:
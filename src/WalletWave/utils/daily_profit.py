@@ -0,0 +1,145 @@
+import math
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency: pip install WalletWave[analytics]
+    np = None
+
+# fields added to wallet summaries, None when a wallet has no daily profit series.
+# Named so the export formats them right: currency for *profit*, percentage for *ratio*
+DAILY_PROFIT_FIELDS = (
+    "daily_profit_mean",          # mean profit per day
+    "daily_profit_std",           # standard deviation of the daily profit
+    "daily_sharpe",               # mean / std, None if the profit never varies
+    "daily_profit_max_drawdown",  # largest drop of the cumulative profit from a previous high, >= 0
+    "losing_days",                # days with a negative profit
+    "daily_gain_concentration",   # share of the gains made on the best day, 1 = all on one day
+)
+
+
+def daily_profit_series(entry) -> List[float]:
+    """
+    :param entry: RankEntry of the trending wallets endpoint.
+    :return: Daily profits of the entry, oldest day first.
+    """
+    return [day.profit for day in sorted(entry.daily_profit_7d, key=lambda day: day.timestamp)]
+
+
+def pack_daily_profits(entries: list, days: int = 7):
+    """
+    Packs the daily profit series of a rank list into one (wallets, days) float array.
+
+    Series are aligned on their most recent day; shorter series are padded with NaN on the left.
+    Days are ordered with one lexsort over the whole rank list instead of a sort per wallet.
+    """
+    series = [entry.daily_profit_7d for entry in entries]
+    timestamps = [day.timestamp for days_ in series for day in days_]
+    profits = [day.profit for days_ in series for day in days_]
+
+    matrix = np.full((len(entries), days), np.nan)
+    if not timestamps:
+        return matrix
+    rows = np.repeat(np.arange(len(entries)), [len(days_) for days_ in series])
+    order = np.lexsort((timestamps, rows))  # by wallet, then oldest day first
+    rows = rows[order]
+    profits = np.asarray(profits, dtype=float)[order]
+    # column counted from the most recent day of each wallet
+    ends = np.cumsum(np.bincount(rows, minlength=len(entries)))
+    from_end = ends[rows] - 1 - np.arange(len(rows))
+    recent = from_end < days
+    matrix[rows[recent], days - 1 - from_end[recent]] = profits[recent]
+    return matrix
+
+
+def _metrics_numpy(entries: list, days: int) -> List[dict]:
+    profits = pack_daily_profits(entries, days)
+    observed = ~np.isnan(profits)
+    counts = observed.sum(axis=1)
+    filled = np.where(observed, profits, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=1) / counts
+        std = np.sqrt((np.where(observed, profits - mean[:, None], 0.0) ** 2).sum(axis=1) / counts)
+        sharpe = np.where(std > 0, mean / std, np.nan)
+
+        cumulative = np.cumsum(filled, axis=1)
+        peaks = np.maximum(np.maximum.accumulate(cumulative, axis=1), 0.0)  # the series starts from 0
+        max_drawdown = (peaks - cumulative).max(axis=1)
+
+        losing_days = (filled < 0).sum(axis=1)
+        gains = np.clip(filled, 0.0, None)
+        total_gains = gains.sum(axis=1)
+        concentration = np.where(total_gains > 0, gains.max(axis=1) / total_gains, np.nan)
+
+    # back to Python floats one column at a time, NaN (x != x) becomes None
+    columns = [column.tolist() for column in (mean, std, sharpe, max_drawdown, losing_days, concentration)]
+    return [
+        {field: None if value != value else value for field, value in zip(DAILY_PROFIT_FIELDS, values)}
+        if observed_days else dict.fromkeys(DAILY_PROFIT_FIELDS)
+        for observed_days, values in zip(counts.tolist(), zip(*columns))
+    ]
+
+
+def _metrics_python(entries: list, days: int) -> List[dict]:
+    results = []
+    for entry in entries:
+        series = daily_profit_series(entry)[-days:]
+        if not series:
+            results.append(dict.fromkeys(DAILY_PROFIT_FIELDS))
+            continue
+
+        mean = sum(series) / len(series)
+        std = math.sqrt(sum((profit - mean) ** 2 for profit in series) / len(series))
+        cumulative = peak = max_drawdown = 0.0
+        for profit in series:
+            cumulative += profit
+            peak = max(peak, cumulative)
+            max_drawdown = max(max_drawdown, peak - cumulative)
+        gains = [profit for profit in series if profit > 0]
+        results.append(dict(zip(DAILY_PROFIT_FIELDS, (
+            mean,
+            std,
+            mean / std if std > 0 else None,
+            max_drawdown,
+            sum(1 for profit in series if profit < 0),
+            max(gains) / sum(gains) if gains else None,
+        ))))
+    return results
+
+
+def daily_profit_metrics(entries: list, days: int = 7) -> Dict[str, dict]:
+    """
+    Computes the consistency metrics of the daily profit series of a rank list.
+
+    Uses one vectorized pass over the packed series when numpy is installed, a per-wallet loop otherwise.
+
+    :param entries: RankEntry objects of the trending wallets endpoint.
+    :param days: Number of most recent days used.
+    :return: Wallet address to a dictionary of DAILY_PROFIT_FIELDS.
+    """
+    if not entries:
+        return {}
+    metrics = _metrics_numpy(entries, days) if np is not None else _metrics_python(entries, days)
+    return {entry.wallet_address: values for entry, values in zip(entries, metrics)}
+
+
+def passes_daily_profit_filters(metrics: dict, min_sharpe: Optional[float] = None,
+                                max_losing_days: Optional[int] = None,
+                                max_concentration: Optional[float] = None) -> bool:
+    """
+    :return: True if the metrics meet every threshold that is set. A wallet without a daily profit
+             series fails any threshold.
+    """
+    checks = (
+        (min_sharpe, "daily_sharpe", lambda value, limit: value >= limit),
+        (max_losing_days, "losing_days", lambda value, limit: value <= limit),
+        (max_concentration, "daily_gain_concentration", lambda value, limit: value <= limit),
+    )
+    for limit, field, check in checks:
+        if limit is None:
+            continue
+        value = metrics.get(field)
+        if value is None or not check(value, limit):
+            return False
+    return True
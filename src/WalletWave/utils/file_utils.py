@@ -1,5 +1,7 @@
 import csv
+import json
 from dataclasses import asdict
+from functools import lru_cache
 from pathlib import Path
 
 from WalletWave.utils.formatting_utils import *
@@ -16,6 +18,48 @@ def _flatten_nested_dicts(item: dict) -> dict:
             flattened[key] = value
     return flattened
 
+def _format_timestamp_value(value):
+    return format_timestamp(value) if value else value
+
+def _format_percentage_value(value):
+    return format_percentage(value) if value is not None else value
+
+def _format_currency_value(value):
+    return format_currency(value) if value is not None else value
+
+def _format_period_value(value):
+    return format_gmgn_time_period(value) if value else value
+
+def _resolve_formatter(key: str):
+    """
+    Classifies a column by its field name and returns the formatter for it.
+
+    :param key: Flattened field name.
+    :return: Formatter callable, or None if the value is exported as-is.
+    """
+    if "timestamp" in key or "date" in key:
+        return _format_timestamp_value
+    elif any(keyword in key for keyword in ["winrate", "pnl", "ratio"]):
+        return _format_percentage_value
+    elif any(keyword in key for keyword in ["profit", "value", "cost"]):
+        return _format_currency_value
+    elif any(keyword in key for keyword in ["period", "peroid"]):
+        return _format_period_value
+    return None
+
+@lru_cache(maxsize=256)
+def _column_plan(keys: tuple) -> tuple:
+    """
+    Resolves the formatter of every column of a schema once.
+
+    Rows of the same export share the same key set, so the plan is cached on the
+    tuple of keys and the field name classification only runs once per schema.
+
+    :param keys: Tuple of flattened field names, in row order.
+    :return: Tuple of (key, formatter) pairs.
+    """
+    return tuple((key, _resolve_formatter(key)) for key in keys)
+
 def _apply_formatting(item: dict) -> dict:
     """
     Applies formatting based on field names.
@@ -27,19 +71,34 @@ def _apply_formatting(item: dict) -> dict:
     item = _flatten_nested_dicts(item)
 
     formatted_item = {}
-    for key, value in item.items():
-        if "timestamp" in key or "date" in key:
-            formatted_item[key] = format_timestamp(value) if value else value
-        elif any(keyword in key for keyword in ["winrate", "pnl", "ratio"]):
-            formatted_item[key] = format_percentage(value) if value is not None else value
-        elif any(keyword in key for keyword in ["profit", "value", "cost"]):
-            formatted_item[key] = format_currency(value) if value is not None else value
-        elif any(keyword in key for keyword in ["period", "peroid"]):
-            formatted_item[key] = format_gmgn_time_period(value) if value else value
-        else:
-            formatted_item[key] = value
+    for key, formatter in _column_plan(tuple(item)):
+        value = item[key]
+        formatted_item[key] = formatter(value) if formatter else value
     return formatted_item
 
+def _apply_column_formatting(columns: dict) -> dict:
+    """
+    Applies formatting to columnar data, one column at a time.
+
+    :param columns: A dictionary mapping field names to lists of values.
+    :return: A dictionary mapping field names to lists of formatted values.
+    """
+    formatted_columns = {}
+    for key, formatter in _column_plan(tuple(columns)):
+        values = columns[key]
+        formatted_columns[key] = list(map(formatter, values)) if formatter else list(values)
+    return formatted_columns
+
+def _columns_to_rows(columns: dict) -> list:
+    """
+    Transposes columnar data into a list of row dictionaries.
+
+    :param columns: A dictionary mapping field names to equally sized lists of values.
+    :return: List of row dictionaries.
+    """
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
 def _sort_fieldnames(fieldnames: set[list]) -> list:
     custom_order = ["wallet_address", "winrate"]
     sorted_remaining_fields = sorted(field for field in fieldnames if field not in custom_order)
@@ -56,28 +115,35 @@ class FileUtils:
         self.import_path = Path(import_path) if import_path else None
         self.logger = get_logger("FileUtils")
 
-    def _generate_file_path(self, export_format: str, timestamp_format: str) -> Path:
+    def _generate_file_path(self, export_format: str, timestamp_format: str, file_prefix: str = "wallet_list") -> Path:
         timestamp = datetime.now().strftime(timestamp_format)
-        file_name = f"wallet_list_{timestamp}.{export_format}"
+        file_name = f"{file_prefix}_{timestamp}.{export_format}"
         return self.export_path / file_name
 
-    def export_wallet_data(self, data: list, export_format: str, timestamp_format: str = "%Y%m%d_%H%M%S"):
+    def export_wallet_data(self, data: list, export_format: str, timestamp_format: str = "%Y%m%d_%H%M%S",
+                           file_prefix: str = "wallet_list"):
         """
         Export the wallet analysis data to the specified format.
 
-        :param data: List of wallet data dictionaries.
+        :param data: List of wallet data dictionaries, or a columnar dictionary mapping field names to lists of values.
         :param export_format: csv or txt file format.
         :param timestamp_format: Format string for the timestamp in the filename (default: "%Y%m%d_%H%M%S").
+        :param file_prefix: Prefix of the exported file name (default: "wallet_list").
+        :return: Path of the exported file, or None if nothing was exported.
         """
         if not data:
             self.logger.warning("No data to export")
-            return
+            return None
 
-        # Convert all entries to dictionaries and apply formatting in one step
-        data_dicts = [
-            _apply_formatting(asdict(entry)) if hasattr(entry, "__dataclass_fields__") else _apply_formatting(entry)
-            for entry in data
-        ]
+        if isinstance(data, dict):
+            # Columnar data is formatted one column at a time
+            data_dicts = _columns_to_rows(_apply_column_formatting(data))
+        else:
+            # Convert all entries to dictionaries and apply formatting in one step
+            data_dicts = [
+                _apply_formatting(asdict(entry)) if hasattr(entry, "__dataclass_fields__") else _apply_formatting(entry)
+                for entry in data
+            ]
 
         # make sure fieldnames include all keys (flattened dicts)
         all_fieldnames = set()
@@ -89,7 +155,7 @@ class FileUtils:
         self.export_path.mkdir(parents=True, exist_ok=True)
 
         # Generate file export_path
-        file_path = self._generate_file_path(export_format, timestamp_format)
+        file_path = self._generate_file_path(export_format, timestamp_format, file_prefix)
 
         if export_format == "csv":
             try:
@@ -99,7 +165,7 @@ class FileUtils:
                     writer.writerows(data_dicts)
             except Exception as e:
                 self.logger.error(f"Failed to export CSV: {e}")
-                return
+                return None
         elif export_format == "txt":
             try:
                 with file_path.open(mode="w", encoding="utf-8") as file:
@@ -109,13 +175,31 @@ class FileUtils:
                         file.write("\n")
             except Exception as e:
                 self.logger.error(f"Failed to export TXT: {e}")
-                return
+                return None
         else:
             self.logger.error(f"Unsupported export format: {export_format}")
-            return
+            return None
 
         self.logger.info(f"Exporting {len(data_dicts)} entries to {export_format} format.")
         self.logger.info(f"Data exported successfully to {file_path}")
+        return file_path
+
+    def export_run_meta(self, meta: dict, data_path: Path = None, timestamp_format: str = "%Y%m%d_%H%M%S",
+                        file_prefix: str = "wallet_list") -> Path:
+        """
+        Writes the metadata of a run (partial flag, coverage) as JSON next to its exported file.
+
+        :param meta: JSON-serialisable metadata.
+        :param data_path: Exported file the metadata describes, <name>.meta.json is written next to it.
+                          A new <prefix>_<timestamp>.meta.json is written if omitted.
+        :return: Path of the metadata file.
+        """
+        self.export_path.mkdir(parents=True, exist_ok=True)
+        path = data_path.with_suffix(".meta.json") if data_path else \
+            self._generate_file_path("meta.json", timestamp_format, file_prefix)
+        path.write_text(json.dumps(meta, indent=2))
+        self.logger.info(f"Run metadata written to {path}")
+        return path
 
 
 
@@ -1,14 +1,23 @@
 import asyncio
 import random
-from typing import Dict, List, Tuple, Optional
-
-import httpx
-import tls_client
+from collections import deque
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from contextlib import asynccontextmanager
+from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
 
+from WalletWave.utils.gmgn_client.metrics import ClientMetrics, endpoint_label
 from WalletWave.utils.gmgn_client.utils.agent_mapper import AgentMapper
-from WalletWave.utils.logging_utils import LogConfig
+from WalletWave.utils.gmgn_client.utils.hedging import HedgePolicy
+from WalletWave.utils.gmgn_client.utils.rate_limiter import RateLimiter, current_request_policy
+from WalletWave.utils.logging_utils import LogConfig, PER_WALLET
 from WalletWave.utils.logging_utils import get_logger
 
+# httpx and tls_client are imported on first use to keep startup fast
+if TYPE_CHECKING:
+    import httpx
+
 
 # TODO: Implement additional features like fetching transaction history or token analytics if supported by the API.
 # TODO: Add support for other blockchain networks in addition to Solana.
@@ -30,21 +39,47 @@ class Gmgn:
     # TODO: Validate wallet address format in `get_wallet_info` to avoid unnecessary API calls.
     # TODO: Explore rate-limiting compliance for `gmgn_client.ai` API to avoid potential issues. (2 seconds)
 
-    def __init__(self, max_requests_range: tuple = (1, 10)):
+    def __init__(self, max_requests_range: tuple = (1, 10), persistent: bool = False,
+                 request_delay: float = 2, rate_limiter: Optional[RateLimiter] = None,
+                 metrics: Optional[ClientMetrics] = None, backoff_range: Tuple[float, float] = (5, 10),
+                 max_retries: Optional[int] = None, cookie_clear_after: int = 3,
+                 respect_retry_after: bool = False, request_timeout: Optional[float] = None,
+                 transport: Optional["httpx.AsyncBaseTransport"] = None, hedging: Optional[HedgePolicy] = None):
         self.logger = get_logger("GMGN_Client")
-        self.log_config = LogConfig()
-        self.gmgn_logger = self.log_config.get_gmgn_api_logger()
+        self.gmgn_logger = get_logger(LogConfig.GMGN_API_LOGGER)
         self.agent_mapper = AgentMapper()
         self.pending_requests: List[Tuple[str, dict, int]] = []
-        self.session = tls_client.Session(random_tls_extension_order=True)
+        self._session = None
         self.client, self.agent, self.headers = None, None, None
+        self._recent_agents = deque(maxlen=8)  # user agents of the last identities, reused by hedged requests
         self.request_count = 0
         self.max_requests_range = max_requests_range
         self.max_requests = random.randint(*self.max_requests_range)
         self.error_count = 0
+        self.persistent = persistent  # keep one connection pool open between requests
+        self._http: Optional["httpx.AsyncClient"] = None
+        self._hedge_http: Optional["httpx.AsyncClient"] = None  # persistent client of the hedged requests
+        # minimum spacing between request starts, shared by every caller of this client
+        self.rate_limiter = rate_limiter or RateLimiter(request_delay)
+        self.metrics = metrics or ClientMetrics()
+        # retry policy for rejected requests (HTTP 4xx/5xx), see program_settings.retry
+        self.backoff_range = backoff_range
+        self.max_retries = max_retries  # None retries until a request succeeds
+        self.cookie_clear_after = cookie_clear_after
+        self.respect_retry_after = respect_retry_after
+        self.request_timeout = request_timeout  # bounds the whole request, body included
+        self.transport = transport  # httpx transport, e.g. session record/replay (None = network)
+        self.hedging = hedging  # duplicates slow requests through another identity, see program_settings.hedging
 
         self.logger.debug("Initiating Gmgn Client...")
-        self._rotate_headers()
+
+    @property
+    def session(self):
+        """ tls_client session, created on first use since tls_client loads a native library """
+        if self._session is None:
+            import tls_client
+            self._session = tls_client.Session(random_tls_extension_order=True)
+        return self._session
 
     def _generate_headers(self) -> Dict[str, str]:
         self.logger.debug("Generating headers for the request.")
@@ -61,15 +96,134 @@ class Gmgn:
     def _rotate_headers(self):
         # todo add timeout method
         self.client, self.agent = self.agent_mapper.get_random_client_and_agent()
+        self._recent_agents.append(self.agent)
         self.headers = self._generate_headers()
+        self.metrics.record_rotation()
 
     def _clear_cookies(self):
         self.logger.warning("Lets destroy cookies!")
         self.session.cookies.clear()
+        self.metrics.record_cookie_clear()
         self.logger.info("Cookies cleared...")
 
-    async def _make_request(self, client: httpx.AsyncClient, url: str, params: Optional[dict] = None, timeout: int = 0):
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        """
+        :return: Seconds requested by the Retry-After header of a response (delay or HTTP date), or None.
+        """
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff(self, response, timeout: int) -> float:
+        """
+        :return: Seconds to wait before retrying a rejected request.
+        """
+        if timeout:
+            return timeout
+        if self.respect_retry_after:
+            retry_after = self._retry_after(response)
+            if retry_after is not None:
+                return retry_after
+        return random.uniform(*self.backoff_range)
+
+    async def _send(self, client: "httpx.AsyncClient", url: str, params: Optional[dict], timeout: int,
+                    headers: Optional[Dict[str, str]] = None):
+        import httpx
+
+        headers = headers or self.headers
+        if timeout:
+            request = client.get(url, headers=headers, params=params, timeout=timeout)
+        else:
+            request = client.get(url, headers=headers, params=params)
+        if self.request_timeout:
+            # httpx timeouts apply per read, a response trickling in never trips them
+            try:
+                return await asyncio.wait_for(request, self.request_timeout)
+            except asyncio.TimeoutError:
+                raise httpx.ReadTimeout(f"No complete response within {self.request_timeout}s")
+        return await request
+
+    def _hedge_headers(self) -> Dict[str, str]:
+        """
+        Headers of another identity than the current one, which stays in place for the next requests.
+        A recent identity is reused when possible: drawing a new user agent can take tens of milliseconds.
+        """
+        agent = next((agent for agent in reversed(self._recent_agents) if agent != self.agent), None)
+        if agent is None:
+            _, agent = self.agent_mapper.get_random_client_and_agent()
+        return {**self.headers, "user-agent": agent}
+
+    async def _send_hedge(self, url: str, params: Optional[dict], timeout: int):
+        """
+        The duplicate of a slow request: takes its own rate limit slot, then goes out under another identity
+        on a separate httpx client, so it neither queues behind the stalled connection nor shares its cookies.
+        """
+        if not timeout and not await self.rate_limiter.acquire(current_request_policy().lane, self._request_deadline()):
+            raise RuntimeError("No rate limit slot for the hedged request")
+        async with self._http_client(hedge=True) as client:
+            return await self._send(client, url, params, timeout, headers=self._hedge_headers())
+
+    async def _send_hedged(self, client: "httpx.AsyncClient", url: str, params: Optional[dict], timeout: int,
+                           endpoint: str):
+        """
+        Sends a request and, if it is still running after the hedge delay of its endpoint, a duplicate
+        through another identity. The first response wins and the other request is cancelled. If both
+        fail, the error of the original request is raised.
+        """
+        if self.hedging is None or not self.hedging.covers(endpoint):
+            return await self._send(client, url, params, timeout)
+
+        self.hedging.requests += 1
+        primary = asyncio.ensure_future(self._send(client, url, params, timeout))
+        tasks = [primary]
+        try:
+            delay = self.hedging.delay(endpoint)
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self.hedging.try_hedge():
+                    self.logger.debug(f"Hedging request to {url} after {delay:.2f}s")
+                    self.metrics.record_hedge(endpoint)
+                    tasks.append(asyncio.ensure_future(self._send_hedge(url, params, timeout)))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.index):  # the original request wins a tie
+                    if not task.cancelled() and task.exception() is None:
+                        if task is not primary:
+                            self.metrics.record_hedge_win(endpoint)
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _request_deadline(self) -> Optional[float]:
+        """ :return: time.monotonic() after which the request is dropped, from the request policy of the task """
+        policy = current_request_policy()
+        deadline = policy.deadline
+        if policy.max_wait is not None:
+            waited_until = time.monotonic() + policy.max_wait
+            deadline = waited_until if deadline is None else min(deadline, waited_until)
+        return deadline
+
+    async def _make_request(self, client: "httpx.AsyncClient", url: str, params: Optional[dict] = None, timeout: int = 0,
+                            attempt: int = 0, deadline: Optional[float] = None):
+        import httpx
+
         self.logger.debug(f"Preparing request to URL: {url} with params: {params}")
+        if self.headers is None:
+            self._rotate_headers()  # first request, pick an identity
         self.request_count += 1
 
         if self.request_count % self.max_requests == 0:
@@ -79,39 +233,64 @@ class Gmgn:
             self.max_requests = random.randint(*self.max_requests_range)
             self.request_count = 0
 
-        if not timeout:
-            await asyncio.sleep(2)
+        endpoint = endpoint_label(url)
+        if attempt == 0:
+            deadline = self._request_deadline()  # retries keep the deadline of the first attempt
+        if timeout:
+            sent = deadline is None or time.monotonic() < deadline
+        else:
+            sent = await self.rate_limiter.acquire(current_request_policy().lane, deadline)
+        if not sent:
+            self.metrics.record_dropped(endpoint)
+            self.logger.warning(f"Dropped request to {url}: deadline passed before it could be sent", extra=PER_WALLET)
+            return None
 
         self.logger.debug("Sending request...")
+        started = self.metrics.request_started(endpoint)
+        status = "error"
 
         try:
-            if timeout:
-                response = await client.get(url, headers=self.headers, params=params, timeout=timeout)
-            else:
-                response = await client.get(url, headers=self.headers, params=params)
+            try:
+                response = await self._send_hedged(client, url, params, timeout, endpoint)
+            except httpx.TimeoutException:
+                status = "timeout"
+                raise
+            except (httpx.NetworkError, httpx.RemoteProtocolError):
+                status = "connection_error"
+                raise
+            status = response.status_code
+            latency = time.perf_counter() - started
+            self.metrics.request_finished(endpoint, started, status, len(response.content))
+            started = None
 
             response.raise_for_status() # Raise for bad response (4xx or 5xx)
+            if self.hedging is not None:
+                self.hedging.observe(endpoint, latency)
 
             return response
 
         except httpx.HTTPStatusError as e:
             self.error_count += 1
-            self.logger.warning(f"Received HTTP {e.response.status_code} for {url}, rotating headers and retrying...")
             self.gmgn_logger.error(f"Received HTTP {e.response.status_code} for {url}")
+            if self.max_retries is not None and attempt >= self.max_retries:
+                self.logger.error(f"Received HTTP {e.response.status_code} for {url}, giving up after {attempt} retries")
+                return None
 
+            self.metrics.record_retry(endpoint)
+            self.logger.warning(f"Received HTTP {e.response.status_code} for {url}, rotating headers and retrying...")
             self._rotate_headers()
-            if self.error_count >= 3:
+            if self.error_count >= self.cookie_clear_after:
                 self.logger.error("Multiple consecutive failures, clearing cookies and retrying...")
                 self._clear_cookies()
                 self.error_count = 0
-            if not timeout:
-                await asyncio.sleep(random.randint(5, 10)) # backoff
-            else:
-                await asyncio.sleep(timeout)
 
-            return await self._make_request(client, url, params, timeout) # we're retrying
+            backoff = self._backoff(e.response, timeout)
+            self.metrics.record_backoff(backoff)
+            await asyncio.sleep(backoff)
+
+            return await self._make_request(client, url, params, timeout, attempt + 1, deadline) # we're retrying
 
-        except (httpx.TimeoutException, httpx.ConnectError) as e:
+        except (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError) as e:
             self.logger.error(f"Request to {url} timed out or connection error: {e}")
             return None
 
@@ -119,10 +298,69 @@ class Gmgn:
             self.logger.error(f"Failed {url}: {e}")
             return None
 
+        finally:
+            if started is not None:  # no response received (or the request was cancelled)
+                self.metrics.request_finished(endpoint, started, status)
+
     def queue_request(self, url: str, params: Optional[dict] = None, timeout: Optional[int] = None):
         self.pending_requests.append((url, params, timeout))
         self.logger.debug(f"Queued request: {url} with params: {params}, timeout: {timeout}")
 
+    @asynccontextmanager
+    async def _http_client(self, hedge: bool = False):
+        """
+        Yields the httpx client used to send requests, or with `hedge` the one of hedged requests,
+        which has its own connection pool and cookie jar.
+
+        A persistent client keeps its connection pool warm until aclose() is called, otherwise
+        a new client is opened and closed around every call. A custom transport (session
+        record/replay) holds the connections itself, so hedges then only get their own cookies.
+        """
+        import httpx
+
+        if not self.persistent:
+            async with httpx.AsyncClient(transport=self.transport) as client:
+                yield client
+            return
+
+        attr = "_hedge_http" if hedge else "_http"
+        client = getattr(self, attr)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(transport=self.transport)
+            setattr(self, attr, client)
+        yield client
+
+    async def aclose(self):
+        """ Closes the persistent connection pools, if any """
+        for attr in ("_http", "_hedge_http"):
+            client = getattr(self, attr)
+            if client is not None:
+                await client.aclose()
+                setattr(self, attr, None)
+
+    def _decode_response(self, url: str, response) -> Optional[dict]:
+        if response:
+            self.logger.info(f"Request to {url} was successful", extra=PER_WALLET)
+            return response.json()
+        self.logger.error(f"Request to {url} failed: {response.text if response else 'No response received'}")
+        return None
+
+    async def request(self, url: str, params: Optional[dict] = None, timeout: Optional[int] = None) -> Optional[dict]:
+        """
+        Sends a single request without going through the pending request queue.
+
+        Safe to call from concurrent coroutines sharing one client.
+
+        :param url: Endpoint URL.
+        :param params: Query parameters.
+        :param timeout: Request timeout in seconds. Disables the default delay between requests when set.
+        :return: Decoded JSON response, or None if the request failed or was dropped at its deadline
+                 (see request_priority).
+        """
+        async with self._http_client() as client:
+            response = await self._make_request(client, url, params, timeout)
+            return self._decode_response(url, response)
+
     async def execute_requests(self):
         if not self.pending_requests:
             self.logger.warning("No pending requests to execute.")
@@ -131,7 +369,7 @@ class Gmgn:
         self.logger.info(f"Executing {len(self.pending_requests)} queued requests...")
 
         results = []
-        async with httpx.AsyncClient() as client:
+        async with self._http_client() as client:
             tasks = []
             for url, params, timeout in self.pending_requests:
                 tasks.append(self._make_request(client, url, params, timeout))
@@ -139,13 +377,7 @@ class Gmgn:
             responses = await asyncio.gather(*tasks)
 
             for (url, params, timeout), response in zip(self.pending_requests, responses):
-                if response:
-                    json_response = response.json() if response else None
-                    results.append(json_response)
-                    self.logger.info(f"Request to {url} was successful")
-                else:
-                    self.logger.error(f"Request to {url} failed: {response.text if response else 'No response received'}")
-                    results.append(None)
+                results.append(self._decode_response(url, response))
 
         self.pending_requests.clear()
         return results
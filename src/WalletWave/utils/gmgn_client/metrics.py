@@ -0,0 +1,297 @@
+import asyncio
+import json
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from WalletWave.utils.gmgn_client.utils.gmgn_endpoints import GmgnEndpoints
+from WalletWave.utils.logging_utils import get_logger
+
+# latency histogram bucket bounds in seconds, +Inf is implied
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# one pattern per endpoint template, path parameters match a single path segment
+_ENDPOINT_PATTERNS = [
+    (endpoint.name.lower(), re.compile(re.sub(r"\\{\w+\\}", "[^/]+", re.escape(endpoint.value)) + "$"))
+    for endpoint in GmgnEndpoints
+    if endpoint is not GmgnEndpoints.BASE_URL
+]
+
+
+def endpoint_label(url: str) -> str:
+    """
+    :return: The GmgnEndpoints name of a request URL ("wallet_info"), or its path for unknown URLs.
+    """
+    path = urlparse(url).path
+    for name, pattern in _ENDPOINT_PATTERNS:
+        if pattern.search(path):
+            return name
+    return path or url
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """ Upper bound of the bucket holding the q-quantile (None above the last bound) """
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def merge(self, data: dict) -> None:
+        self.counts = [a + b for a, b in zip(self.counts, data["buckets"])]
+        self.total += data["sum"]
+        self.count += data["count"]
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "buckets": list(self.counts),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _EndpointMetrics:
+    def __init__(self):
+        self.latency = _Histogram()
+        self.status = defaultdict(int)  # HTTP status code, or "timeout" / "connection_error" / "error"
+        self.retries = 0
+        self.dropped = 0  # requests never sent because their deadline passed
+        self.hedges = 0  # duplicates sent for slow requests
+        self.hedge_wins = 0  # hedged requests answered by the duplicate first
+        self.bytes_received = 0
+        self.in_flight = 0
+
+
+class ClientMetrics:
+    """
+    Per-endpoint instrumentation of the Gmgn client.
+
+    The client records latency, status codes, retries and bytes received for every request. It also
+    counts the requests dropped at their deadline, the hedged requests, the header rotations and
+    cookie clears of its identity and the time spent backing off. The counters can be written to a
+    Prometheus text file or a JSON summary, or served live (see serve_metrics).
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.endpoints: Dict[str, _EndpointMetrics] = defaultdict(_EndpointMetrics)
+        self.header_rotations = 0
+        self.cookie_clears = 0
+        self.backoff_seconds = 0.0  # time spent waiting before retries
+
+    # --- recording hooks called by the client ---
+
+    def request_started(self, endpoint: str) -> float:
+        """
+        :return: The start time to pass to request_finished.
+        """
+        self.endpoints[endpoint].in_flight += 1
+        return time.perf_counter()
+
+    def request_finished(self, endpoint: str, started: float, status, bytes_received: int = 0) -> None:
+        """
+        :param status: HTTP status code, or the kind of failure when no response was received.
+        """
+        metrics = self.endpoints[endpoint]
+        metrics.in_flight -= 1
+        metrics.latency.observe(time.perf_counter() - started)
+        metrics.status[str(status)] += 1
+        metrics.bytes_received += bytes_received
+
+    def record_retry(self, endpoint: str) -> None:
+        self.endpoints[endpoint].retries += 1
+
+    def record_dropped(self, endpoint: str) -> None:
+        self.endpoints[endpoint].dropped += 1
+
+    def record_hedge(self, endpoint: str) -> None:
+        self.endpoints[endpoint].hedges += 1
+
+    def record_hedge_win(self, endpoint: str) -> None:
+        self.endpoints[endpoint].hedge_wins += 1
+
+    def record_rotation(self) -> None:
+        self.header_rotations += 1
+
+    def record_cookie_clear(self) -> None:
+        self.cookie_clears += 1
+
+    def record_backoff(self, seconds: float) -> None:
+        self.backoff_seconds += seconds
+
+    def request_seconds(self) -> float:
+        """
+        :return: Seconds spent waiting on GMGN responses so far, summed over all requests.
+        """
+        return sum(metrics.latency.total for metrics in self.endpoints.values())
+
+    def dropped_requests(self) -> int:
+        """
+        :return: Requests dropped at their deadline so far, over all endpoints.
+        """
+        return sum(metrics.dropped for metrics in self.endpoints.values())
+
+    # --- export ---
+
+    def to_dict(self) -> dict:
+        """
+        :return: JSON-serialisable summary of every counter.
+        """
+        return {
+            "started": self.started,
+            "uptime": time.time() - self.started,
+            "header_rotations": self.header_rotations,
+            "cookie_clears": self.cookie_clears,
+            "backoff_seconds": self.backoff_seconds,
+            "latency_buckets": list(LATENCY_BUCKETS),
+            "endpoints": {
+                name: {
+                    "requests": metrics.latency.count,
+                    "latency": metrics.latency.to_dict(),
+                    "status": dict(metrics.status),
+                    "retries": metrics.retries,
+                    "dropped": metrics.dropped,
+                    "hedges": metrics.hedges,
+                    "hedge_wins": metrics.hedge_wins,
+                    "bytes_received": metrics.bytes_received,
+                    "in_flight": metrics.in_flight,
+                }
+                for name, metrics in sorted(self.endpoints.items())
+            },
+        }
+
+    def merge(self, data: dict) -> None:
+        """
+        Adds the counters of a to_dict() summary, e.g. one sent back by a worker process.
+        """
+        self.header_rotations += data.get("header_rotations", 0)
+        self.cookie_clears += data.get("cookie_clears", 0)
+        self.backoff_seconds += data.get("backoff_seconds", 0.0)
+        for name, endpoint in data.get("endpoints", {}).items():
+            metrics = self.endpoints[name]
+            metrics.latency.merge(endpoint["latency"])
+            for status, count in endpoint["status"].items():
+                metrics.status[status] += count
+            metrics.retries += endpoint["retries"]
+            metrics.dropped += endpoint.get("dropped", 0)
+            metrics.hedges += endpoint.get("hedges", 0)
+            metrics.hedge_wins += endpoint.get("hedge_wins", 0)
+            metrics.bytes_received += endpoint["bytes_received"]
+
+    def to_prometheus(self) -> str:
+        """
+        :return: The counters in the Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP walletwave_gmgn_request_seconds GMGN request latency per endpoint.",
+            "# TYPE walletwave_gmgn_request_seconds histogram",
+        ]
+        for name, metrics in sorted(self.endpoints.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), metrics.latency.counts):
+                cumulative += count
+                lines.append(f'walletwave_gmgn_request_seconds_bucket{{endpoint="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'walletwave_gmgn_request_seconds_sum{{endpoint="{name}"}} {metrics.latency.total:.6f}')
+            lines.append(f'walletwave_gmgn_request_seconds_count{{endpoint="{name}"}} {metrics.latency.count}')
+
+        lines += [
+            "# HELP walletwave_gmgn_responses_total GMGN responses per endpoint and status.",
+            "# TYPE walletwave_gmgn_responses_total counter",
+        ]
+        for name, metrics in sorted(self.endpoints.items()):
+            for status, count in sorted(metrics.status.items()):
+                lines.append(f'walletwave_gmgn_responses_total{{endpoint="{name}",status="{status}"}} {count}')
+
+        for metric, kind, help_text, attribute in (
+            ("walletwave_gmgn_retries_total", "counter", "GMGN requests retried after an HTTP error.", "retries"),
+            ("walletwave_gmgn_dropped_total", "counter", "GMGN requests dropped at their deadline.", "dropped"),
+            ("walletwave_gmgn_hedges_total", "counter", "Duplicate GMGN requests sent for slow requests.", "hedges"),
+            ("walletwave_gmgn_hedge_wins_total", "counter", "Hedged GMGN requests answered by the duplicate first.",
+             "hedge_wins"),
+            ("walletwave_gmgn_received_bytes_total", "counter", "GMGN response bytes received.", "bytes_received"),
+            ("walletwave_gmgn_in_flight_requests", "gauge", "GMGN requests currently in flight.", "in_flight"),
+        ):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+            for name, metrics in sorted(self.endpoints.items()):
+                lines.append(f'{metric}{{endpoint="{name}"}} {getattr(metrics, attribute)}')
+
+        lines += [
+            "# HELP walletwave_gmgn_header_rotations_total Header identity rotations.",
+            "# TYPE walletwave_gmgn_header_rotations_total counter",
+            f"walletwave_gmgn_header_rotations_total {self.header_rotations}",
+            "# HELP walletwave_gmgn_cookie_clears_total Cookie jar resets after repeated failures.",
+            "# TYPE walletwave_gmgn_cookie_clears_total counter",
+            f"walletwave_gmgn_cookie_clears_total {self.cookie_clears}",
+            "# HELP walletwave_gmgn_backoff_seconds_total Seconds spent waiting before retrying rejected requests.",
+            "# TYPE walletwave_gmgn_backoff_seconds_total counter",
+            f"walletwave_gmgn_backoff_seconds_total {self.backoff_seconds:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """
+        Writes the metrics to path: a JSON summary for *.json files, Prometheus text otherwise.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            path.write_text(json.dumps(self.to_dict(), indent=2))
+        else:
+            path.write_text(self.to_prometheus())
+        get_logger("ClientMetrics").info(f"Client metrics written to {path}")
+
+
+async def serve_metrics(metrics: ClientMetrics, host: str = "127.0.0.1", port: int = 9464) -> asyncio.AbstractServer:
+    """
+    Serves the metrics over HTTP: Prometheus text on /metrics, the JSON summary on /metrics.json.
+
+    :return: The running server, close it with server.close().
+    """
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?")[0] if len(parts) > 1 else ""
+            if path == "/metrics":
+                status, content_type, body = "200 OK", "text/plain; version=0.0.4", metrics.to_prometheus()
+            elif path == "/metrics.json":
+                status, content_type, body = "200 OK", "application/json", json.dumps(metrics.to_dict())
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", "Not found\n"
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
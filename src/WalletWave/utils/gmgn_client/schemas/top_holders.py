@@ -35,6 +35,11 @@ class HolderInfo(BaseModel):
     status: str
     maker_token_tags: List[str]
     tags: List[str]
+    # profit on the token, in USD
+    profit: Optional[float] = None
+    realized_profit: Optional[float] = None
+    unrealized_profit: Optional[float] = None
+    total_cost: Optional[float] = None
 
 
 class HoldersData(BaseModel):
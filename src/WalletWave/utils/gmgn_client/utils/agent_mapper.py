@@ -1,7 +1,5 @@
 import random
 
-from fake_useragent import UserAgent
-
 from WalletWave.utils.logging_utils import get_logger
 
 
@@ -13,12 +11,14 @@ class AgentMapper:
 
     # TODO: Expand `identifier_mapping` to include more browser and platform options if needed.
     # TODO: Write unit tests for `AgentMapper` to ensure correct mapping and user-agent generation.
-    # TODO: Consider caching user-agent results to improve performance if the same identifier is used multiple times.
 
     def __init__(self):
         # setup logger
         self.logger = get_logger("AgentMapper")
 
+        # fake_useragent generators per (browser, platform, os), building one filters its whole dataset
+        self._user_agents = {}
+
         # Mapping of tls_client identifiers to browser, platform, and OS
         self.identifier_mapping = {
             # Chrome (desktop only)
@@ -79,8 +79,13 @@ class AgentMapper:
         platform = mapping["platform"]
         os_type = mapping["os"]
 
-        # generate user-agent
-        ua = UserAgent(browsers=[browser], platforms=[platform], os=[os_type])
+        # generate user-agent (fake_useragent loads its dataset on import, so import on first use)
+        ua = self._user_agents.get((browser, platform, os_type))
+        if ua is None:
+            from fake_useragent import UserAgent
+            ua = self._user_agents[(browser, platform, os_type)] = UserAgent(
+                browsers=[browser], platforms=[platform], os=[os_type]
+            )
         user_agent = ua.random
         self.logger.debug(f"Generated user-agent: {user_agent}")
         return user_agent
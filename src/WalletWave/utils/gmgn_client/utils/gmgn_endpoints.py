@@ -1,10 +1,22 @@
+import os
 from enum import Enum
 
+# points the client at another server, e.g. the local stand-in of the benchmarks
+BASE_URL_ENV = "WALLETWAVE_GMGN_BASE_URL"
+
 class GmgnEndpoints(Enum):
     BASE_URL = "https://gmgn.ai/defi/quotation"
     TOKEN_INFO = "/v1/tokens/sol/{contract_address}"
     TRENDING_WALLETS = "/v1/rank/sol/wallets/{timeframe}"
     WALLET_INFO = "/v1/smartmoney/sol/walletNew/{wallet_address}"
+    TOP_HOLDERS = "/v1/tokens/top_holders/sol/{contract_address}"
+
+    @staticmethod
+    def base_url() -> str:
+        """
+        Returns the API base URL, overridden by the WALLETWAVE_GMGN_BASE_URL environment variable.
+        """
+        return os.environ.get(BASE_URL_ENV) or GmgnEndpoints.BASE_URL.value
 
     @staticmethod
     def _token_info(contract_address: str) -> str:
@@ -17,7 +29,7 @@ class GmgnEndpoints(Enum):
         Returns:
             str: The full URL for the TOKEN_INFO endpoint.
         """
-        return f"{GmgnEndpoints.BASE_URL.value}{GmgnEndpoints.TOKEN_INFO.value.format(contract_address=contract_address)}"
+        return f"{GmgnEndpoints.base_url()}{GmgnEndpoints.TOKEN_INFO.value.format(contract_address=contract_address)}"
 
     @staticmethod
     def _trending_wallets(timeframe: str) -> str:
@@ -30,7 +42,7 @@ class GmgnEndpoints(Enum):
         Returns:
             str: The full URL for the TRENDING_WALLETS endpoint
         """
-        return f"{GmgnEndpoints.BASE_URL.value}{GmgnEndpoints.TRENDING_WALLETS.value.format(timeframe=timeframe)}"
+        return f"{GmgnEndpoints.base_url()}{GmgnEndpoints.TRENDING_WALLETS.value.format(timeframe=timeframe)}"
 
     @staticmethod
     def _wallet_info(wallet_address: str) -> str:
@@ -43,7 +55,20 @@ class GmgnEndpoints(Enum):
         Returns:
             str: The full URL for the WALLET_INFO endpoint
         """
-        return f"{GmgnEndpoints.BASE_URL.value}{GmgnEndpoints.WALLET_INFO.value.format(wallet_address=wallet_address)}"
+        return f"{GmgnEndpoints.base_url()}{GmgnEndpoints.WALLET_INFO.value.format(wallet_address=wallet_address)}"
+
+    @staticmethod
+    def _top_holders(contract_address: str) -> str:
+        """
+        Constructs the URL for the TOP_HOLDERS endpoint
+
+        Args:
+            contract_address (str): The contract address for the token.
+
+        Returns:
+            str: The full URL for the TOP_HOLDERS endpoint
+        """
+        return f"{GmgnEndpoints.base_url()}{GmgnEndpoints.TOP_HOLDERS.value.format(contract_address=contract_address)}"
 
     @classmethod
     def get_url(cls, endpoint: "GmgnEndpoints", **kwargs) -> str:
@@ -65,6 +90,7 @@ class GmgnEndpoints(Enum):
             cls.TOKEN_INFO: cls._token_info,
             cls.TRENDING_WALLETS: cls._trending_wallets,
             cls.WALLET_INFO: cls._wallet_info,
+            cls.TOP_HOLDERS: cls._top_holders,
         }
 
         # Check if the endpoint is supported
@@ -0,0 +1,62 @@
+import math
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterable, Optional
+
+
+class HedgePolicy:
+    """
+    Decides when a slow GMGN request gets a duplicate ("hedge") sent through another identity.
+
+    A request is hedged once it has been running longer than the `quantile` of the recent latencies
+    of its endpoint. Hedges are capped at `max_ratio` of the requests sent, so at the default 5% they
+    never take more than a small share of the rate budget even when the whole endpoint slows down.
+    The default p99 keeps that budget for real stragglers: at p95 the ordinary tail alone asks for
+    about 5% of the requests and uses up the cap before a hanging request comes along.
+    """
+
+    def __init__(self, quantile: float = 0.99, max_ratio: float = 0.05, endpoints: Optional[Iterable[str]] = None,
+                 window: int = 200, min_samples: int = 20):
+        """
+        :param quantile: Latency quantile of the endpoint after which a request is hedged.
+        :param max_ratio: Maximum number of hedges, as a share of the requests sent.
+        :param endpoints: Endpoint names (metrics labels, e.g. "wallet_info") that may be hedged, all if empty.
+        :param window: Number of recent latencies per endpoint the quantile is taken from.
+        :param min_samples: Latencies an endpoint needs before its requests are hedged.
+        """
+        self.quantile = quantile
+        self.max_ratio = max_ratio
+        self.endpoints = frozenset(endpoints or ())
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedges = 0
+        self._latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._delays: Dict[str, Optional[float]] = {}  # cached quantile per endpoint, reset by observe
+
+    def covers(self, endpoint: str) -> bool:
+        return not self.endpoints or endpoint in self.endpoints
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        """ Records the latency of a completed request """
+        self._latencies[endpoint].append(seconds)
+        self._delays.pop(endpoint, None)
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """
+        :return: Seconds after which a request to the endpoint is hedged, None if there are too few samples.
+        """
+        if endpoint not in self._delays:
+            latencies = self._latencies.get(endpoint)
+            if not latencies or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+            self._delays[endpoint] = ordered[min(math.ceil(self.quantile * len(ordered)) - 1, len(ordered) - 1)]
+        return self._delays[endpoint]
+
+    def try_hedge(self) -> bool:
+        """
+        :return: True and counts the hedge if the cap allows one more.
+        """
+        if self.hedges + 1 > self.max_ratio * self.requests:
+            return False
+        self.hedges += 1
+        return True
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, NamedTuple, Optional
+
+# priority classes of the rate budget, most urgent first
+LANES = ("interactive", "normal", "bulk")
+# share of the slots each lane gets while every lane has requests waiting
+DEFAULT_LANE_WEIGHTS = {"interactive": 8, "normal": 4, "bulk": 1}
+
+
+class RequestPolicy(NamedTuple):
+    lane: str = "normal"
+    deadline: Optional[float] = None  # time.monotonic() after which requests are dropped
+    max_wait: Optional[float] = None  # seconds a single request may wait for its slot
+
+
+_request_policy: ContextVar[RequestPolicy] = ContextVar("request_policy", default=RequestPolicy())
+
+
+def current_request_policy() -> RequestPolicy:
+    """ :return: The policy of requests sent from the current task """
+    return _request_policy.get()
+
+
+def deadline_passed() -> bool:
+    """ :return: True once the deadline of the current request policy passed, no new work should be started """
+    deadline = _request_policy.get().deadline
+    return deadline is not None and time.monotonic() >= deadline
+
+
+@contextmanager
+def request_priority(lane: Optional[str] = None, deadline: Optional[float] = None, max_wait: Optional[float] = None):
+    """
+    Sets the lane and deadline of every GMGN request sent inside the block, including from tasks
+    created inside it. Nested blocks keep the earliest deadline.
+
+        with request_priority("interactive", max_wait=5):
+            info = await gmgn.get_wallet_info(address)
+
+    :param lane: One of LANES, unchanged if omitted.
+    :param deadline: time.monotonic() after which requests are dropped instead of sent.
+    :param max_wait: Seconds each request may wait for a rate limit slot before it is dropped.
+    """
+    if lane is not None and lane not in LANES:
+        raise ValueError(f"Unknown request priority: {lane}, expected one of {list(LANES)}")
+    outer = _request_policy.get()
+    if deadline is not None and outer.deadline is not None:
+        deadline = min(deadline, outer.deadline)
+    token = _request_policy.set(RequestPolicy(
+        lane or outer.lane,
+        outer.deadline if deadline is None else deadline,
+        outer.max_wait if max_wait is None else max_wait,
+    ))
+    try:
+        yield
+    finally:
+        _request_policy.reset(token)
+
+
+class RateLimiter:
+    """
+    Spaces request starts at least `interval` seconds apart.
+
+    Every coroutine sharing the limiter draws from the same budget. Callers waiting for a slot are
+    queued per lane and slots are shared between the lanes by weight (stride scheduling): with the
+    default weights a waiting interactive request gets the next slot even behind a long bulk queue,
+    while bulk requests still get 1 slot out of 13 when every lane is busy.
+    """
+
+    def __init__(self, interval: float, weights: Optional[Dict[str, float]] = None):
+        """
+        :param interval: Minimum number of seconds between two request starts.
+        :param weights: Lane weights, merged over DEFAULT_LANE_WEIGHTS.
+        """
+        self.interval = interval
+        self.weights = {**DEFAULT_LANE_WEIGHTS, **(weights or {})}
+        self.waited = 0.0  # total seconds callers spent waiting for a slot
+        self.dropped = dict.fromkeys(LANES, 0)  # requests whose deadline passed while waiting
+        self._next_slot = 0.0
+        self._queues: Dict[str, Deque[asyncio.Future]] = {lane: deque() for lane in LANES}
+        self._pass = dict.fromkeys(LANES, 0.0)  # virtual time of the next slot of each lane
+        self._virtual = 0.0  # pass of the lane served last
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _waiting(self) -> bool:
+        for queue in self._queues.values():
+            while queue and queue[0].done():  # waiters gone past their deadline or cancelled
+                queue.popleft()
+        return any(self._queues.values())
+
+    def _take_slot(self, now: float) -> None:
+        self._next_slot = max(now, self._next_slot) + self.interval
+
+    async def _dispatch(self) -> None:
+        """ Hands out slots to the queued waiters, lowest lane pass first, until no one is waiting """
+        while self._waiting():
+            delay = self._next_slot - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue  # waiters may have arrived or left meanwhile
+
+            lane = min((lane for lane in LANES if self._queues[lane]), key=lambda lane: self._pass[lane])
+            self._virtual = self._pass[lane]
+            self._pass[lane] += 1 / self.weights[lane]
+            self._take_slot(time.monotonic())
+            self._queues[lane].popleft().set_result(None)
+        self._dispatcher = None
+
+    async def acquire(self, lane: str = "normal", deadline: Optional[float] = None) -> bool:
+        """
+        Waits for the next free slot of the lane.
+
+        :param lane: One of LANES.
+        :param deadline: time.monotonic() after which the caller stops waiting.
+        :return: True once a slot was taken, False if the deadline passed first.
+        """
+        if lane not in self._queues:
+            raise ValueError(f"Unknown request priority: {lane}, expected one of {list(LANES)}")
+        now = time.monotonic()
+        if deadline is not None and deadline <= now:
+            self.dropped[lane] += 1
+            return False
+        if now >= self._next_slot and not self._waiting():
+            self._take_slot(now)
+            return True
+
+        queue = self._queues[lane]
+        if not queue:
+            # an idle lane does not bank slots it did not use
+            self._pass[lane] = max(self._pass[lane], self._virtual)
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        try:
+            await asyncio.wait_for(waiter, None if deadline is None else deadline - now)
+            return True
+        except asyncio.TimeoutError:
+            self.dropped[lane] += 1
+            return False
+        finally:
+            self.waited += time.monotonic() - now
@@ -0,0 +1,145 @@
+import json
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+import httpx
+
+from WalletWave.utils.gmgn_client.utils.gmgn_endpoints import GmgnEndpoints
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL,
+    params TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_key ON responses(path, params, recorded_at);
+"""
+
+# headers describing the body as sent over the wire, they no longer apply once it is decoded
+_WIRE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def request_key(url: httpx.URL) -> Tuple[str, str]:
+    """
+    :return: (endpoint path, canonical query params) of a request. The path is taken relative to the
+             API base URL so a session recorded against one base URL replays against any other.
+    """
+    prefix = httpx.URL(GmgnEndpoints.base_url()).path.rstrip("/")
+    path = url.path[len(prefix):] if prefix and url.path.startswith(prefix + "/") else url.path
+    return path, json.dumps(sorted(url.params.multi_items()))
+
+
+class SessionArchive:
+    """
+    GMGN responses captured during a run, stored zlib-compressed in one SQLite file.
+
+    Every response, rejected ones included, is indexed by request path, query params and the time
+    it was received. Replays serve the latest successful response of a request.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Path to the session file. Created if missing.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def record(self, url: httpx.URL, status: int, body: bytes) -> None:
+        path, params = request_key(url)
+        self._conn.execute(
+            "INSERT INTO responses (path, params, recorded_at, url, status, body) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, params, time.time(), str(url), status, zlib.compress(body)),
+        )
+
+    def lookup(self, url: httpx.URL) -> Optional[Tuple[int, bytes]]:
+        """
+        :return: (status, body) of the latest successful response to the request, or None if the
+                 request never succeeded while recording.
+        """
+        path, params = request_key(url)
+        row = self._conn.execute(
+            "SELECT status, body FROM responses WHERE path = ? AND params = ? AND status < 400 "
+            "ORDER BY recorded_at DESC LIMIT 1",
+            (path, params),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], zlib.decompress(row[1])
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that sends requests over the network and archives every response.
+    """
+
+    def __init__(self, archive: SessionArchive):
+        self.archive = archive
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport()
+        response = await self._transport.handle_async_request(request)
+        body = await response.aread()  # decoded: gzip/brotli is undone by httpx
+        self.archive.record(request.url, response.status_code, body)
+        headers = [(name, value) for name, value in response.headers.multi_items() if name.lower() not in _WIRE_HEADERS]
+        return httpx.Response(response.status_code, headers=headers, content=body, extensions=response.extensions)
+
+    async def aclose(self) -> None:
+        # clients opened per request close their transport, the next request opens a new pool
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that answers requests from a SessionArchive, without any network access.
+
+    Requests missing from the archive fail like a connection error, so the client neither retries
+    nor backs off.
+    """
+
+    def __init__(self, archive: SessionArchive):
+        self.archive = archive
+        self.hits = 0
+        self.misses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self.archive.lookup(request.url)
+        if entry is None:
+            self.misses += 1
+            raise httpx.ConnectError(f"{request.url.path} is not in session {self.archive.path}", request=request)
+        self.hits += 1
+        status, body = entry
+        return httpx.Response(status, headers={"Content-Type": "application/json"}, content=body, request=request)
+
+
+def session_transport(record: Optional[str] = None, replay: Optional[str] = None) -> Optional[httpx.AsyncBaseTransport]:
+    """
+    :return: The transport for --record or --replay, or None to use the network as usual.
+    """
+    if replay:
+        if not Path(replay).exists():
+            raise FileNotFoundError(f"Session file not found: {replay}")
+        return ReplayTransport(SessionArchive(replay))
+    if record:
+        return RecordingTransport(SessionArchive(record))
+    return None
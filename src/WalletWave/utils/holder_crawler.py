@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+from typing import Callable, Iterable, List, Optional
+
+from WalletWave.utils.gmgn_client.utils.rate_limiter import deadline_passed
+from WalletWave.utils.logging_utils import get_logger, PER_WALLET
+
+# frontier node kinds
+TOKEN = "token"
+WALLET = "wallet"
+
+
+class VisitedSet:
+    """
+    Set of visited keys stored as 64-bit blake2b digests.
+
+    An int digest takes about a third of the memory of a 44 character address string, and a
+    collision (about 1 in 10^10 for a million keys) only skips one node of the crawl.
+    """
+
+    def __init__(self):
+        self._digests = set()
+
+    @staticmethod
+    def _digest(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+
+    def add(self, key: str) -> bool:
+        """
+        :return: True if the key was not visited before.
+        """
+        digest = self._digest(key)
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        return self._digest(key) in self._digests
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+
+class CrawledWallet:
+    """ A wallet found by the crawl, with the wallet info fetched for it """
+
+    def __init__(self, wallet_address: str, depth: int, via_token: str, holder_profit: float, wallet_info):
+        self.wallet_address = wallet_address
+        self.depth = depth
+        self.via_token = via_token
+        self.holder_profit = holder_profit
+        self.wallet_info = wallet_info
+
+
+class HolderGraphCrawler:
+    """
+    Discovers wallets by expanding the token/holder graph breadth-first from seed tokens.
+
+    A token expands to its top holders, a holder wallet to the tokens it bought recently (from
+    wallet_tokens), up to max_depth token hops. The frontier is a priority queue ordered by the
+    holder's profit on the token that led to it, so the most profitable holders and the tokens they
+    bought are visited first when the request budget, or the time budget of the run, runs out.
+    Requests are sent by `concurrency` coroutines that all go through the repository's shared rate
+    limiter.
+    """
+
+    def __init__(self, repo, wallet_tokens: Callable[[str], Iterable[str]], max_depth: int = 2,
+                 budget: int = 500, concurrency: int = 4, holders_per_token: int = 100,
+                 max_wallets: Optional[int] = None, period: str = "7d"):
+        """
+        :param repo: GmgnRepo used to fetch top holders and wallet info.
+        :param wallet_tokens: Returns the contract addresses a wallet bought recently.
+        :param max_depth: Token hops from the seed tokens (0 only visits the seeds' holders).
+        :param budget: Maximum number of API requests of the crawl.
+        :param concurrency: Number of requests in flight.
+        :param holders_per_token: Top holders fetched per token.
+        :param max_wallets: Stop once this many wallets were fetched.
+        :param period: Wallet info period (7d, 30d).
+        """
+        self.repo = repo
+        self.wallet_tokens = wallet_tokens
+        self.max_depth = max_depth
+        self.budget = budget
+        self.concurrency = max(concurrency, 1)
+        self.holders_per_token = holders_per_token
+        self.max_wallets = max_wallets
+        self.period = period
+        self.logger = get_logger("HolderGraphCrawler")
+
+        self.visited = VisitedSet()
+        self.requests = 0
+        self.wallets: List[CrawledWallet] = []
+        self._frontier = []  # (-priority, sequence, kind, address, depth, via token, holder profit)
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._changed: Optional[asyncio.Condition] = None
+
+    def _push(self, kind: str, address: str, depth: int, priority: float, via_token: str = None,
+              holder_profit: float = 0.0) -> None:
+        if self.visited.add(f"{kind}:{address}"):
+            heapq.heappush(self._frontier, (-priority, next(self._sequence), kind, address, depth, via_token,
+                                            holder_profit))
+
+    def _exhausted(self) -> bool:
+        return (self.requests >= self.budget or (self.max_wallets is not None and len(self.wallets) >= self.max_wallets)
+                or deadline_passed())
+
+    async def crawl(self, seed_tokens: Iterable[str]) -> List[CrawledWallet]:
+        """
+        :param seed_tokens: Contract addresses to start from.
+        :return: The wallets found, in the order they were fetched.
+        """
+        self._changed = asyncio.Condition()
+        for token in seed_tokens:
+            self._push(TOKEN, token, 0, float("inf"))
+
+        await asyncio.gather(*(self._worker() for _ in range(self.concurrency)))
+        self.logger.info(f"Crawl finished: {len(self.wallets)} wallets, {self.requests} requests, "
+                         f"{len(self.visited)} nodes seen, {len(self._frontier)} left in the frontier")
+        return self.wallets
+
+    async def _worker(self) -> None:
+        while True:
+            async with self._changed:
+                while not self._frontier and self._in_flight and not self._exhausted():
+                    await self._changed.wait()
+                if not self._frontier or self._exhausted():
+                    self._changed.notify_all()
+                    return
+                node = heapq.heappop(self._frontier)
+                self._in_flight += 1
+                self.requests += 1
+
+            try:
+                await self._visit(*node[2:])
+            except Exception as e:
+                self.logger.error(f"Error crawling {node[2]} {node[3]}: {e}")
+            finally:
+                async with self._changed:
+                    self._in_flight -= 1
+                    self._changed.notify_all()
+
+    async def _visit(self, kind: str, address: str, depth: int, via_token: str, holder_profit: float) -> None:
+        if kind == TOKEN:
+            response = await self.repo.get_top_holders(address, limit=self.holders_per_token)
+            holders = response.data.holderInfo if response else []
+            for holder in holders:
+                profit = holder.profit if holder.profit is not None else (holder.realized_profit or 0.0)
+                self._push(WALLET, holder.wallet_address, depth, profit, via_token=address, holder_profit=profit)
+            self.logger.debug(f"Token {address} (depth {depth}): {len(holders)} holders")
+            return
+
+        wallet_info = await self.repo.get_wallet_info(address, period=self.period)
+        if not wallet_info:
+            return
+        self.wallets.append(CrawledWallet(address, depth, via_token, holder_profit, wallet_info))
+        self.logger.info(f"Found wallet {address} via {via_token} (depth {depth})", extra=PER_WALLET)
+
+        if depth < self.max_depth:
+            for token in self.wallet_tokens(address):
+                self._push(TOKEN, token, depth + 1, holder_profit)
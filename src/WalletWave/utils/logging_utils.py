@@ -1,6 +1,77 @@
+import atexit
+import json
 import logging
+import queue
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+# pass as extra= on records logged once per wallet, they are sampled by wallet_log_sample
+PER_WALLET = {"per_wallet": True}
+
+# listener writing the records of the process, started once by LogConfig
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        # records from the queue carry the traceback already rendered, see TracebackQueueHandler
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TracebackQueueHandler(QueueHandler):
+    """
+    Queue handler that renders tracebacks into record.exc_text before enqueueing, while the traceback
+    objects are still alive, and leaves the message itself unformatted.
+
+    QueueHandler.prepare folds the traceback into the message instead, so the listener's formatters
+    could no longer tell them apart (JsonFormatter writes it to its own "exception" field).
+    """
+
+    _formatter = logging.Formatter()
+
+    def prepare(self, record):
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._formatter.formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)  # a copy, other handlers may see the original
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class WalletSampleFilter(logging.Filter):
+    """
+    Keeps one in every `rate` per-wallet records below WARNING, so large scans don't spend their
+    time writing one line per wallet. Warnings and errors always pass.
+    """
+
+    def __init__(self, rate: int = 1):
+        super().__init__()
+        self.rate = max(int(rate), 1)
+        self._seen = 0
+
+    def filter(self, record):
+        if self.rate == 1 or record.levelno >= logging.WARNING or not getattr(record, "per_wallet", False):
+            return True
+        self._seen += 1
+        return (self._seen - 1) % self.rate == 0
+
+
 class LogConfig:
     DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     DEFAULT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -11,6 +82,7 @@ class LogConfig:
         "ERROR": logging.ERROR,
         "CRITICAL": logging.CRITICAL
     }
+    GMGN_API_LOGGER = "gmgn_api"
 
     def __init__(self, log_level=None, log_dir="logs", config=None):
         self.config = config
@@ -25,43 +97,73 @@ class LogConfig:
             return self.LOG_LEVELS.get(level, logging.INFO)
         return default_level or logging.INFO
 
+    def _formatter(self):
+        if self.config and self.config.get("log_format") == "json":
+            return JsonFormatter()
+        return logging.Formatter(fmt=self.DEFAULT_FORMAT, datefmt=self.DEFAULT_DATE_FORMAT)
+
     def _configure_root_logger(self):
-        root_logger = logging.getLogger()
-        root_logger.setLevel(self.log_level)
-        root_logger.handlers.clear()
-        
+        """
+        Routes every record through a queue: the event loop only enqueues records, the console and
+        file handlers run on the listener thread. Calling this again replaces the previous setup,
+        so handlers are never attached twice.
+        """
+        global _listener
+        shutdown_logging()
+
+        formatter = self._formatter()
+
         # Handler to output logs to console
         console_handler = logging.StreamHandler()
-        console_handler.setFormatter(logging.Formatter(
-            fmt=self.DEFAULT_FORMAT,
-            datefmt=self.DEFAULT_DATE_FORMAT
-        ))
-        root_logger.addHandler(console_handler)
+        console_handler.setFormatter(formatter)
+        handlers = [console_handler]
 
         try:
             # Handler to output logs to file app.log
-            file_handler = logging.FileHandler(
-                self.log_dir / "app.log"
-            )
-            
-            file_handler.setFormatter(logging.Formatter(
-                fmt=self.DEFAULT_FORMAT,
-                datefmt=self.DEFAULT_DATE_FORMAT
-            ))
-            root_logger.addHandler(file_handler)
-            
+            file_handler = logging.FileHandler(self.log_dir / "app.log")
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+
+            # GMGN API errors are also kept in their own file
+            api_handler = logging.FileHandler(self.log_dir / "gmgn_api.log")
+            api_handler.setFormatter(formatter)
+            api_handler.addFilter(logging.Filter(self.GMGN_API_LOGGER))
+            handlers.append(api_handler)
         except Exception as e:
-            console_handler.error(f"Failed to set up file logging: {e}")
-            
-    def get_gmgn_api_logger(self):
-        logger = logging.getLogger('gmgn_api')
-        file_handler = logging.FileHandler(self.log_dir / 'gmgn_api.log')
-        file_handler.setFormatter(logging.Formatter(
-            fmt=self.DEFAULT_FORMAT,
-            datefmt=self.DEFAULT_DATE_FORMAT
-        ))
-        logger.addHandler(file_handler)
-        return logger
+            console_handler.handle(logging.makeLogRecord({
+                "name": __name__, "levelno": logging.ERROR, "levelname": "ERROR",
+                "msg": f"Failed to set up file logging: {e}",
+            }))
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = TracebackQueueHandler(log_queue)
+        sample_rate = self.config.get("wallet_log_sample", 1) if self.config else 1
+        queue_handler.addFilter(WalletSampleFilter(sample_rate))
+
+        root_logger = logging.getLogger()
+        root_logger.setLevel(self.log_level)
+        root_logger.handlers.clear()
+        root_logger.addHandler(queue_handler)
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+
+def shutdown_logging():
+    """
+    Stops the listener thread after writing the queued records, and closes its handlers.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(shutdown_logging)
+
 
 def init_logging(config=None):
     LogConfig(config=config)
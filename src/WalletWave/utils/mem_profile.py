@@ -0,0 +1,191 @@
+import sys
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+from WalletWave.utils.logging_utils import get_logger
+
+# pipeline stages in report order
+STAGES = ("fetch", "parse", "summarize", "filter", "export")
+
+# profiler of the running process, set by MemoryProfiler.start()
+_active: Optional["MemoryProfiler"] = None
+
+
+def memory_stage(name: str, wallets: int = 0):
+    """
+    Marks a pipeline stage for the memory profiler. Does nothing unless --memprofile is set.
+
+    :param name: Stage name (fetch, parse, summarize, filter, export).
+    :param wallets: Number of wallets handled by this call, used for the retained-per-wallet figure.
+    """
+    if _active is None:
+        return nullcontext()
+    return _active.stage(name, wallets)
+
+
+class _StageMemory:
+    def __init__(self):
+        self.calls = 0
+        self.sampled = 0
+        self.net = 0    # bytes still allocated when the stage returned, summed over calls
+        self.peak = 0   # highest bytes allocated above the stage's starting point
+        self.sites = Counter()  # "file:line" -> net bytes, from sampled snapshots
+
+
+class MemoryProfiler:
+    """
+    tracemalloc profiler behind `walletwave --memprofile`.
+
+    Every fetch/parse/summarize/filter/export call records the memory it left allocated and its peak.
+    One in sample_every calls also diffs two snapshots to find the allocation sites, since a snapshot
+    costs time proportional to the number of live allocations. At the end of each plugin run the
+    memory still held is compared to the run's start to report what is retained per wallet.
+
+    Stages of concurrent coroutines overlap, so figures are exact for sequential scans only.
+    """
+
+    def __init__(self, top: int = 10, sample_every: int = 25, frames: int = 1):
+        """
+        :param top: Number of allocation sites to print per stage.
+        :param sample_every: Take allocation-site snapshots on one in this many calls of a stage.
+        :param frames: Number of frames stored per allocation.
+        """
+        self.top = top
+        self.sample_every = max(sample_every, 1)
+        self.frames = frames
+        self.stages = defaultdict(_StageMemory)
+        self.wallets = 0
+        self.runs = []  # (plugin, retained bytes, wallets, top retained sites)
+        # the tracemalloc peak is reset when a stage starts, so the peak seen before every reset is
+        # kept for the whole run and for each stage still open (a list holding its running peak)
+        self.peak = 0
+        self._open = []
+        self.logger = get_logger("MemoryProfiler")
+        # allocation sites left out of the report; module code objects created by imports during
+        # the run are not pipeline data
+        self._ignored = {
+            tracemalloc.__file__,
+            __file__,
+            "<frozen importlib._bootstrap>",
+            "<frozen importlib._bootstrap_external>",
+        }
+
+    def start(self) -> None:
+        global _active
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        _active = self
+
+    def stop(self) -> None:
+        global _active
+        if _active is self:
+            _active = None
+        tracemalloc.stop()
+
+    def _diff(self, before):
+        """
+        :return: Allocation sites that grew or shrank since the before snapshot.
+
+        Sites are filtered after grouping, filter_traces() would match every single trace.
+        """
+        return [
+            stat for stat in tracemalloc.take_snapshot().compare_to(before, "lineno")
+            if stat.size_diff and stat.traceback[0].filename not in self._ignored
+        ]
+
+    def _traced_memory(self):
+        """
+        :return: (current, peak) bytes allocated, with the peak carried into the run and open stages.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        for running_peak in self._open:
+            running_peak[0] = max(running_peak[0], peak)
+        return current, peak
+
+    def _reset_peak(self) -> None:
+        if hasattr(tracemalloc, "reset_peak"):  # python 3.9+
+            self._traced_memory()
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name: str, wallets: int = 0):
+        memory = self.stages[name]
+        memory.calls += 1
+        self.wallets += wallets
+        sampled = (memory.calls - 1) % self.sample_every == 0
+        before_snapshot = tracemalloc.take_snapshot() if sampled else None
+
+        self._reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        running_peak = [before]
+        self._open.append(running_peak)
+        try:
+            yield
+        finally:
+            current, _ = self._traced_memory()
+            self._open.remove(running_peak)
+            memory.net += current - before
+            memory.peak = max(memory.peak, running_peak[0] - before)
+            if before_snapshot is not None:
+                memory.sampled += 1
+                for stat in self._diff(before_snapshot):
+                    memory.sites[str(stat.traceback)] += stat.size_diff
+
+    @contextmanager
+    def run(self, plugin: str):
+        """
+        Measures the memory a plugin run still holds after its execute stage, per wallet fetched.
+        """
+        wallets = self.wallets
+        start_snapshot = tracemalloc.take_snapshot()
+        start, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            retained = tracemalloc.get_traced_memory()[0] - start
+            sites = [
+                (str(stat.traceback), stat.size_diff, stat.count_diff)
+                for stat in self._diff(start_snapshot)
+                if stat.size_diff > 0
+            ][:self.top]
+            self.runs.append((plugin, retained, self.wallets - wallets, sites))
+
+    def report(self, file=None) -> None:
+        """
+        Prints peak and net memory per stage, the top allocation sites and the memory retained per wallet.
+
+        :param file: Output stream (default: stderr).
+        """
+        file = file or sys.stderr
+        current, _ = self._traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        peak = self.peak
+        self.stop()
+
+        print(f"\n=== WalletWave memory profile: peak {peak / 2**20:.1f} MiB, "
+              f"{current / 2**20:.1f} MiB still allocated ===", file=file)
+        print(f"{'stage':<12}{'calls':>8}{'peak KiB':>12}{'net KiB':>12}{'net/call':>12}", file=file)
+        names = [name for name in STAGES if name in self.stages] + sorted(set(self.stages) - set(STAGES))
+        for name in names:
+            memory = self.stages[name]
+            print(f"{name:<12}{memory.calls:>8}{memory.peak / 1024:>12.1f}{memory.net / 1024:>12.1f}"
+                  f"{memory.net / max(memory.calls, 1):>12.0f}", file=file)
+
+        for name in names:
+            memory = self.stages[name]
+            sites = [site for site in memory.sites.most_common(self.top) if site[1] > 0]
+            if not sites:
+                continue
+            print(f"\nTop allocation sites, {name} ({memory.sampled} of {memory.calls} calls sampled):", file=file)
+            for site, size in sites:
+                print(f"  {size / 1024:10.1f} KiB  {site}", file=file)
+
+        for plugin, retained, wallets, sites in self.runs:
+            per_wallet = f", {retained / wallets / 1024:.1f} KiB per wallet" if wallets else ""
+            print(f"\n{plugin}: {retained / 2**20:.2f} MiB retained after execute for {wallets} wallets{per_wallet}",
+                  file=file)
+            for site, size, count in sites:
+                print(f"  {size / 1024:10.1f} KiB {count:>8} blocks  {site}", file=file)
+        print(file=file)
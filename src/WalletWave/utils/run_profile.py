@@ -0,0 +1,117 @@
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+from WalletWave.utils.logging_utils import get_logger
+
+STAGES = ("initialize", "execute", "export", "finalize")
+
+
+class _StageTimes:
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.network = 0.0    # summed GMGN request latency
+        self.throttled = 0.0  # time spent waiting for the shared rate budget
+        self.calls = 0
+
+
+class RunProfiler:
+    """
+    Run profiler behind `walletwave --profile`.
+
+    Records wall and CPU time for every lifecycle stage of every plugin run. Execute time is split
+    into network waits (GMGN request latency from the client metrics), rate-limit waits and the rest,
+    which is plugin code (validation, summaries, filtering). Export time is spent formatting and
+    writing the file. With --profile-pstats the run is also wrapped in cProfile.
+
+    Stages of plugins running concurrently overlap, so their network and throttle times are shared
+    between them and the CPU time is that of the whole process.
+    """
+
+    def __init__(self, metrics=None, rate_limiter=None, pstats_path: Optional[str] = None, top: int = 20):
+        """
+        :param metrics: ClientMetrics of the shared client, used to measure network waits.
+        :param rate_limiter: Shared RateLimiter, used to measure rate-limit waits.
+        :param pstats_path: Write a cProfile .pstats file here and print the top hotspots.
+        :param top: Number of hotspots to print.
+        """
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter
+        self.pstats_path = pstats_path
+        self.top = top
+        self.stages = defaultdict(_StageTimes)  # (plugin, stage) -> times
+        self.logger = get_logger("RunProfiler")
+        self._profile = None
+        self._profiling = False
+        self._started = None
+
+    def start(self) -> None:
+        """ Starts the cProfile profiler, if requested """
+        self._started = time.perf_counter()
+        if self.pstats_path and self._profile is None:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            self._profiling = True
+
+    def stop(self) -> None:
+        """ Stops cProfile and writes the .pstats file """
+        if not self._profiling:
+            return
+        self._profiling = False
+        self._profile.disable()
+        self._profile.dump_stats(self.pstats_path)
+        self.logger.info(f"cProfile stats written to {self.pstats_path}")
+
+    def _network_seconds(self) -> float:
+        return self.metrics.request_seconds() if self.metrics else 0.0
+
+    def _throttled_seconds(self) -> float:
+        return self.rate_limiter.waited if self.rate_limiter else 0.0
+
+    @contextmanager
+    def stage(self, plugin: str, stage: str):
+        """
+        Times a lifecycle stage of a plugin run.
+        """
+        wall, cpu = time.perf_counter(), time.process_time()
+        network, throttled = self._network_seconds(), self._throttled_seconds()
+        try:
+            yield
+        finally:
+            times = self.stages[(plugin, stage)]
+            times.wall += time.perf_counter() - wall
+            times.cpu += time.process_time() - cpu
+            times.network += self._network_seconds() - network
+            times.throttled += self._throttled_seconds() - throttled
+            times.calls += 1
+
+    def report(self, file=None) -> None:
+        """
+        Prints the stage breakdown, and the cProfile hotspots if enabled.
+
+        :param file: Output stream (default: stderr).
+        """
+        self.stop()
+        file = file or sys.stderr
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+
+        print(f"\n=== WalletWave run profile: {elapsed:.2f}s ===", file=file)
+        print(f"{'plugin':<24}{'stage':<12}{'wall s':>9}{'cpu s':>9}{'network s':>11}{'throttle s':>12}{'code s':>9}",
+              file=file)
+        order = {stage: index for index, stage in enumerate(STAGES)}
+        for (plugin, stage), times in sorted(self.stages.items(), key=lambda item: (item[0][0], order.get(item[0][1], 99))):
+            # whatever is not spent waiting on the API or the rate budget is spent in our own code
+            code = max(times.wall - times.network - times.throttled, 0.0)
+            print(f"{plugin:<24}{stage:<12}{times.wall:>9.2f}{times.cpu:>9.2f}{times.network:>11.2f}"
+                  f"{times.throttled:>12.2f}{code:>9.2f}", file=file)
+
+        if self._profile is not None:
+            import pstats
+            print(f"\nTop {self.top} functions by cumulative time ({self.pstats_path}):", file=file)
+            stats = pstats.Stats(self.pstats_path, stream=file)
+            stats.sort_stats("cumulative").print_stats(self.top)
+        print(file=file)
@@ -0,0 +1,179 @@
+import heapq
+import itertools
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+# weight of every feature in the score, features are scaled to about [-1, 1] so weights compare directly
+DEFAULT_WEIGHTS = {
+    "winrate": 3.0,
+    "pnl_7d": 2.0,
+    "pnl_30d": 1.0,
+    "big_wins": 1.5,       # share of traded tokens closed above 2x
+    "big_losses": -1.5,    # share of traded tokens closed below -50%
+    "holding": 0.5,        # longer average holding period, penalizes snipers
+    "risk": -2.0,          # honeypot, no-buy-hold, sell-more-than-bought and fast tx ratios
+    "recency": 1.0,        # 1 if active just now, halves every recency_half_life seconds
+}
+
+RISK_RATIOS = ("token_honeypot_ratio", "no_buy_hold_ratio", "sell_pass_buy_ratio", "fast_tx_ratio")
+
+
+def _squash(value: float) -> float:
+    """ Maps any real number to (-1, 1), keeping small values almost linear """
+    return value / (1 + abs(value))
+
+
+class ScoringEngine:
+    """
+    Weighted score of a wallet summary (WalletInfoResponse.to_summary), higher is better.
+
+    Every feature is scaled from the wallet's own fields only, so a score never changes when other
+    wallets are scanned and wallets can be scored one by one as they arrive.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, holding_scale: float = 3600,
+                 recency_half_life: float = 86400, now: Optional[float] = None):
+        """
+        :param weights: Feature weights, merged over DEFAULT_WEIGHTS. Set a weight to 0 to ignore a feature.
+        :param holding_scale: Average holding period in seconds that scores 0.5 on the holding feature.
+        :param recency_half_life: Seconds of inactivity that halve the recency feature.
+        :param now: Reference timestamp for recency, defaults to the time the engine was created.
+        """
+        unknown = set(weights or {}) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown scoring features: {sorted(unknown)}, expected {list(DEFAULT_WEIGHTS)}")
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.holding_scale = holding_scale
+        self.recency_half_life = recency_half_life
+        self.now = time.time() if now is None else now
+        self._extractors: Dict[str, Callable[[dict], float]] = {
+            "winrate": lambda summary: summary.get("winrate") or 0.0,
+            "pnl_7d": lambda summary: _squash(summary.get("pnl_7d") or 0.0),
+            "pnl_30d": lambda summary: _squash(summary.get("pnl_30d") or 0.0),
+            "big_wins": self._big_wins,
+            "big_losses": self._big_losses,
+            "holding": self._holding,
+            "risk": self._risk,
+            "recency": self._recency,
+        }
+        # features with a zero weight are never computed
+        self._active = [(self._extractors[name], weight) for name, weight in self.weights.items() if weight]
+
+    @staticmethod
+    def _bucket_total(summary: dict) -> int:
+        return sum(summary.get(field) or 0 for field in (
+            "pnl_lt_minus_dot5_num", "pnl_minus_dot5_0x_num", "pnl_lt_2x_num", "pnl_2x_5x_num", "pnl_gt_5x_num"
+        ))
+
+    def _big_wins(self, summary: dict) -> float:
+        total = self._bucket_total(summary)
+        return ((summary.get("pnl_2x_5x_num") or 0) + (summary.get("pnl_gt_5x_num") or 0)) / total if total else 0.0
+
+    def _big_losses(self, summary: dict) -> float:
+        total = self._bucket_total(summary)
+        return (summary.get("pnl_lt_minus_dot5_num") or 0) / total if total else 0.0
+
+    def _holding(self, summary: dict) -> float:
+        holding = max(summary.get("avg_holding_peroid") or 0.0, 0.0)
+        return holding / (holding + self.holding_scale)
+
+    @staticmethod
+    def _risk(summary: dict) -> float:
+        risk = summary.get("risk") or {}
+        ratios = [risk.get(ratio) for ratio in RISK_RATIOS]
+        ratios = [ratio for ratio in ratios if ratio is not None]
+        return sum(ratios) / len(ratios) if ratios else 0.0
+
+    def _recency(self, summary: dict) -> float:
+        last_active = summary.get("last_active_timestamp")
+        if not last_active:
+            return 0.0
+        return math.pow(0.5, max(self.now - last_active, 0) / self.recency_half_life)
+
+    def score(self, summary: dict) -> float:
+        return sum(weight * extractor(summary) for extractor, weight in self._active)
+
+
+class TopK:
+    """
+    Keeps the k highest scored items seen so far in a min-heap of size k.
+
+    Pushing an item is O(log k) and items below the current k-th score are dropped without touching
+    the heap, so a shortlist of k wallets out of n costs O(n log k) instead of sorting all n.
+    """
+
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError("k must be 1 or greater")
+        self.k = k
+        self._heap = []  # (score, sequence, item), the lowest score on top
+        self._sequence = itertools.count()  # ties keep the item seen first
+
+    def push(self, score: float, item) -> bool:
+        """
+        :return: True if the item entered the shortlist.
+        """
+        heap = self._heap
+        if len(heap) < self.k:
+            heapq.heappush(heap, (score, -next(self._sequence), item))
+            return True
+        # a later item never wins a tie, so only a strictly higher score enters a full shortlist
+        if score <= heap[0][0]:
+            return False
+        heapq.heapreplace(heap, (score, -next(self._sequence), item))
+        return True
+
+    def items(self) -> list:
+        """
+        :return: The shortlisted items, highest score first.
+        """
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class Shortlist:
+    """
+    Scores wallet summaries as they arrive and keeps the best top_k, or all of them if top_k is None.
+
+    Every added summary gets a "score" field, unless engine is None: scoring is then disabled and
+    every summary is kept unchanged. items() is always current, so it can be read while a scan is
+    still running.
+    """
+
+    def __init__(self, engine: Optional[ScoringEngine], top_k: Optional[int] = None):
+        if top_k and engine is None:
+            raise ValueError("A top_k shortlist needs a scoring engine")
+        self.engine = engine
+        self.top_k = TopK(top_k) if top_k else None
+        self._all: List[dict] = []
+        self.seen = 0
+
+    def add(self, summary: dict) -> bool:
+        """
+        :return: True if the summary is in the shortlist.
+        """
+        self.seen += 1
+        if self.engine is None:
+            self._all.append(summary)
+            return True
+        summary["score"] = self.engine.score(summary)
+        if self.top_k is None:
+            self._all.append(summary)
+            return True
+        return self.top_k.push(summary["score"], summary)
+
+    def extend(self, summaries: Iterable[dict]) -> None:
+        for summary in summaries:
+            self.add(summary)
+
+    def items(self) -> List[dict]:
+        """
+        :return: The top_k summaries by score, or every summary in the order added if top_k is None.
+        """
+        return self.top_k.items() if self.top_k is not None else list(self._all)
+
+    def __len__(self) -> int:
+        return len(self.top_k) if self.top_k is not None else len(self._all)
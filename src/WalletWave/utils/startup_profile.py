@@ -0,0 +1,192 @@
+import sys
+import time
+from collections import defaultdict
+from importlib.abc import MetaPathFinder
+
+# WalletWave subsystems, matched by module name prefix (first match wins)
+SUBSYSTEMS = [
+    ("WalletWave.utils.gmgn_client", "client"),
+    ("WalletWave.repositories", "repositories"),
+    ("WalletWave.plugins", "plugins"),
+    ("WalletWave.utils", "utils"),
+    ("WalletWave", "core"),
+    ("CLI", "cli"),
+]
+
+
+def get_subsystem(module_name: str):
+    """
+    :return: The WalletWave subsystem a module belongs to, or None for third-party and stdlib modules.
+    """
+    for prefix, subsystem in SUBSYSTEMS:
+        if module_name == prefix or module_name.startswith(prefix + "."):
+            return subsystem
+    return None
+
+
+class _TimedLoader:
+    """
+    Wraps a module loader to time module creation and execution.
+
+    The original loader is put back on the module and its spec once the module is executed.
+    """
+
+    def __init__(self, loader, profiler: "StartupProfiler", name: str):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+
+    def create_module(self, spec):
+        self._profiler._enter(self._name)
+        try:
+            module = self._loader.create_module(spec)
+        except BaseException:
+            self._profiler._exit(self._name)
+            raise
+        self._profiler._pause(self._name)
+        return module
+
+    def exec_module(self, module):
+        self._profiler._resume(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name)
+            module.__loader__ = self._loader
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self._loader
+
+
+class StartupProfiler(MetaPathFinder):
+    """
+    Import-time profiler behind `walletwave --startup-profile`.
+
+    Times every import from install() on, like `python -X importtime`, and summarises the cost per
+    WalletWave subsystem. Third-party and stdlib imports are charged to the WalletWave subsystem
+    that triggered them, so the report shows e.g. how much of the client's cost is httpx.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.self_times = defaultdict(float)     # module -> seconds spent in its own body
+        self.cumulative_times = {}               # module -> seconds including nested imports
+        self.owners = {}                         # module -> WalletWave subsystem that imported it
+        self._stack = []                         # [module, start, child time, paused at]
+        self._finding = False
+
+    @classmethod
+    def install(cls) -> "StartupProfiler":
+        profiler = cls()
+        sys.meta_path.insert(0, profiler)
+        return profiler
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    # built-in and frozen modules are left alone, their loaders are special-cased by importlib
+                    if (spec.origin not in ("built-in", "frozen") and spec.loader is not None
+                            and hasattr(spec.loader, "exec_module")):
+                        spec.loader = _TimedLoader(spec.loader, self, fullname)
+                    return spec
+            return None
+        finally:
+            self._finding = False
+
+    # --- timing stack ---
+
+    def _owner(self, name: str) -> str:
+        subsystem = get_subsystem(name)
+        if subsystem:
+            return subsystem
+        for frame in reversed(self._stack):
+            subsystem = get_subsystem(frame[0])
+            if subsystem:
+                return subsystem
+        return "entry point"
+
+    def _enter(self, name: str) -> None:
+        self.owners[name] = self._owner(name)
+        self._stack.append([name, time.perf_counter(), 0.0, None])
+
+    def _pause(self, name: str) -> None:
+        # between create_module and exec_module the import machinery runs, keep that out of the module
+        frame = self._stack[-1]
+        frame[3] = time.perf_counter()
+
+    def _resume(self, name: str) -> None:
+        frame = self._stack[-1] if self._stack and self._stack[-1][0] == name else None
+        if frame is None:
+            # loader without create_module timing (e.g. reused spec)
+            self._enter(name)
+            return
+        if frame[3] is not None:
+            frame[1] += time.perf_counter() - frame[3]
+            frame[3] = None
+
+    def _exit(self, name: str) -> None:
+        module, start, child_time, _ = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self.cumulative_times[module] = elapsed
+        self.self_times[module] += elapsed - child_time
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    # --- report ---
+
+    def summary(self) -> dict:
+        """
+        :return: Import time per subsystem, with its own modules and dependencies split out.
+        """
+        subsystems = defaultdict(lambda: {"total": 0.0, "own": 0.0, "modules": 0, "dependencies": defaultdict(float)})
+        for module, self_time in self.self_times.items():
+            owner = self.owners.get(module, "entry point")
+            entry = subsystems[owner]
+            entry["total"] += self_time
+            entry["modules"] += 1
+            if get_subsystem(module):
+                entry["own"] += self_time
+            else:
+                entry["dependencies"][module.split(".")[0]] += self_time
+        return subsystems
+
+    def report(self, top: int = 10, file=None) -> None:
+        """
+        Prints the import-time breakdown and stops profiling.
+
+        :param top: Number of slowest modules and dependencies to list.
+        :param file: Output stream (default: stderr).
+        """
+        self.uninstall()
+        file = file or sys.stderr
+        elapsed = time.perf_counter() - self.started
+        subsystems = self.summary()
+        total_import = sum(self.self_times.values())
+
+        print(f"\n=== WalletWave startup profile: {elapsed * 1000:.1f} ms to ready, "
+              f"{total_import * 1000:.1f} ms importing {len(self.self_times)} modules ===", file=file)
+        print(f"{'subsystem':<14}{'total ms':>10}{'own ms':>10}{'modules':>9}  top dependencies", file=file)
+        for name, entry in sorted(subsystems.items(), key=lambda item: item[1]["total"], reverse=True):
+            dependencies = sorted(entry["dependencies"].items(), key=lambda item: item[1], reverse=True)[:3]
+            dependencies = ", ".join(f"{package} {seconds * 1000:.1f}" for package, seconds in dependencies)
+            print(f"{name:<14}{entry['total'] * 1000:>10.1f}{entry['own'] * 1000:>10.1f}"
+                  f"{entry['modules']:>9}  {dependencies}", file=file)
+
+        print(f"\nSlowest modules (self / cumulative ms):", file=file)
+        slowest = sorted(self.self_times.items(), key=lambda item: item[1], reverse=True)[:top]
+        for module, self_time in slowest:
+            print(f"  {self_time * 1000:8.1f} {self.cumulative_times.get(module, 0) * 1000:8.1f}  {module}", file=file)
+        print(file=file)
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from typing import Awaitable, Optional, Tuple
+
+from WalletWave.utils.gmgn_client.utils.rate_limiter import request_priority
+
+
+class TimeBudget:
+    """
+    Wall-clock budget of one plugin run (--time-budget, or the time_budget plugin setting).
+
+    `reserve` seconds before the deadline the run stops issuing new work: GMGN requests are dropped
+    instead of sent and plugin loops stop at their next wallet (see deadline_passed), so most runs
+    return early with what they completed. Whatever is still running at the deadline is cancelled.
+    """
+
+    def __init__(self, seconds: float, reserve: Optional[float] = None):
+        """
+        :param seconds: Budget of the run.
+        :param reserve: Seconds left to in-flight work once no new work is started,
+                        defaults to 10% of the budget, at most 30 seconds.
+        """
+        self.seconds = seconds
+        self.reserve = min(seconds * 0.1, 30) if reserve is None else reserve
+        self.started = time.monotonic()
+
+    @property
+    def deadline(self) -> float:
+        return self.started + self.seconds
+
+    @property
+    def stop_issuing_at(self) -> float:
+        """ time.monotonic() after which no new request is sent """
+        return self.deadline - self.reserve
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def nearly_spent(self) -> bool:
+        return time.monotonic() >= self.stop_issuing_at
+
+    async def run(self, awaitable: Awaitable) -> Tuple[object, bool]:
+        """
+        Runs a coroutine within the budget, counted from the creation of the budget.
+
+        Only the deadline cancels the run: an asyncio.TimeoutError raised by the coroutine itself,
+        e.g. from its own wait_for, is raised like any other error.
+
+        :return: (result, True) if it finished in time, (None, False) if it was cancelled at the deadline.
+        """
+        # the coroutine runs in a task created inside the block, so every request it sends carries the deadline
+        with request_priority(deadline=self.stop_issuing_at):
+            task = asyncio.ensure_future(awaitable)
+        try:
+            done, _ = await asyncio.wait({task}, timeout=max(self.deadline - time.monotonic(), 0))
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if task in done:
+            return task.result(), True
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return None, False
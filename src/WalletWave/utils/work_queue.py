@@ -0,0 +1,290 @@
+import json
+import functools
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from WalletWave.utils.logging_utils import get_logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    lease_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL REFERENCES jobs(job_id),
+    items TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    expires_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_leases_status ON leases(status, expires_at);
+CREATE TABLE IF NOT EXISTS results (
+    job_id INTEGER NOT NULL,
+    wallet_address TEXT NOT NULL,
+    data TEXT,
+    PRIMARY KEY (job_id, wallet_address)
+);
+"""
+
+# Lease states
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+def _synchronized(method):
+    """ Serializes the calls sharing the queue connection, heartbeats run in an executor thread """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@dataclass
+class Lease:
+    """ A batch of wallet addresses claimed by one worker until expires_at """
+    lease_id: int
+    job_id: int
+    kind: str
+    items: List[str]
+    params: Dict = field(default_factory=dict)
+    expires_at: float = 0.0
+    attempts: int = 0
+
+
+class LeaseQueue:
+    """
+    Work queue stored in a shared SQLite file.
+
+    A coordinator splits a job into leases (batches of wallet addresses). Workers on any host that can
+    open the file claim a lease, keep it alive with heartbeats and write their results back. A lease
+    whose owner stops heartbeating expires and is handed to the next worker that asks for work.
+
+    The file uses the rollback journal rather than WAL: WAL needs shared memory, which hosts sharing the
+    file over NFS/SMB do not have. Claims are serialized by BEGIN IMMEDIATE, which only needs the file
+    locks of the network filesystem to work (NFS with lockd, not mounted with `nolock`).
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        """
+        :param path: Path to the SQLite queue file. Created if missing.
+        :param max_attempts: Number of times a lease can be claimed before it is marked as failed.
+        """
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.logger = get_logger("LeaseQueue")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=DELETE")  # not WAL, see above; converts older queue files
+        self._conn.executescript(SCHEMA)
+
+    @_synchronized
+    def close(self) -> None:
+        self._conn.close()
+
+    def _fail_exhausted(self, now: float) -> None:
+        """ Marks the leases that are due to be claimed again but used all their attempts as failed """
+        cursor = self._conn.execute(
+            "UPDATE leases SET status = ?, owner = NULL, expires_at = NULL "
+            "WHERE (status = ? OR (status = ? AND expires_at < ?)) AND attempts >= ?",
+            (FAILED, PENDING, LEASED, now, self.max_attempts),
+        )
+        if cursor.rowcount:
+            self.logger.error(f"{cursor.rowcount} lease(s) failed after {self.max_attempts} attempts")
+
+    @_synchronized
+    def create_job(self, kind: str, wallet_addresses: List[str], lease_size: int = 50, params: dict = None) -> int:
+        """
+        Splits a job into leases of at most lease_size wallet addresses.
+
+        :param kind: Job kind ("wallet_list", "top_wallets").
+        :param wallet_addresses: Addresses to scan.
+        :param lease_size: Number of addresses per lease.
+        :param params: Job parameters shared by every lease (period, timeout, win_rate...).
+        :return: The new job id.
+        """
+        if lease_size < 1:
+            raise ValueError("Lease size must be 1 or greater")
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (kind, params, created_at) VALUES (?, ?, ?)",
+                (kind, json.dumps(params or {}), time.time()),
+            )
+            job_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO leases (job_id, items) VALUES (?, ?)",
+                [
+                    (job_id, json.dumps(wallet_addresses[i:i + lease_size]))
+                    for i in range(0, len(wallet_addresses), lease_size)
+                ],
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+        self.logger.info(f"Created job {job_id} ({kind}) with {len(wallet_addresses)} wallets")
+        return job_id
+
+    @_synchronized
+    def claim(self, owner: str, ttl: float) -> Optional[Lease]:
+        """
+        Claims the next pending or expired lease.
+
+        :param owner: Worker id.
+        :param ttl: Seconds until the lease expires unless renewed with heartbeat().
+        :return: The claimed Lease, or None if there is no work.
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._fail_exhausted(now)
+            row = self._conn.execute(
+                "SELECT l.lease_id, l.job_id, l.items, l.attempts, l.status, j.kind, j.params "
+                "FROM leases l JOIN jobs j ON j.job_id = l.job_id "
+                "WHERE l.status = ? OR (l.status = ? AND l.expires_at < ?) "
+                "ORDER BY l.lease_id LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+
+            if row["status"] == LEASED:
+                self.logger.warning(f"Reclaiming expired lease {row['lease_id']} of job {row['job_id']}")
+
+            expires_at = now + ttl
+            self._conn.execute(
+                "UPDATE leases SET status = ?, owner = ?, expires_at = ?, attempts = attempts + 1 "
+                "WHERE lease_id = ?",
+                (LEASED, owner, expires_at, row["lease_id"]),
+            )
+            self._conn.execute("COMMIT")
+            return Lease(
+                lease_id=row["lease_id"],
+                job_id=row["job_id"],
+                kind=row["kind"],
+                items=json.loads(row["items"]),
+                params=json.loads(row["params"]),
+                expires_at=expires_at,
+                attempts=row["attempts"] + 1,
+            )
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    @_synchronized
+    def heartbeat(self, lease: Lease, owner: str, ttl: float) -> bool:
+        """
+        Extends a lease held by owner.
+
+        :return: False if the lease expired and was claimed by another worker.
+        """
+        expires_at = time.time() + ttl
+        cursor = self._conn.execute(
+            "UPDATE leases SET expires_at = ? WHERE lease_id = ? AND owner = ? AND status = ?",
+            (expires_at, lease.lease_id, owner, LEASED),
+        )
+        if cursor.rowcount == 1:
+            lease.expires_at = expires_at
+            return True
+        return False
+
+    @_synchronized
+    def complete(self, lease: Lease, owner: str, results: List[Tuple[str, Optional[dict]]]) -> bool:
+        """
+        Writes the results of a lease and marks it as done.
+
+        :param lease: The lease being completed.
+        :param owner: Worker id that claimed the lease.
+        :param results: (wallet_address, summary) pairs. A None summary records a failed lookup.
+        :return: False if the lease no longer belongs to owner; its results are then discarded.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self._conn.execute(
+                "UPDATE leases SET status = ?, expires_at = NULL WHERE lease_id = ? AND owner = ? AND status = ?",
+                (DONE, lease.lease_id, owner, LEASED),
+            )
+            if cursor.rowcount != 1:
+                self._conn.execute("ROLLBACK")
+                self.logger.warning(f"Lease {lease.lease_id} was lost before completion, discarding results")
+                return False
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (job_id, wallet_address, data) VALUES (?, ?, ?)",
+                [
+                    (lease.job_id, wallet_address, json.dumps(summary) if summary is not None else None)
+                    for wallet_address, summary in results
+                ],
+            )
+            self._conn.execute("COMMIT")
+            return True
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    @_synchronized
+    def release(self, lease: Lease, owner: str) -> None:
+        """ Hands a lease back to the queue without results (e.g. on worker shutdown) """
+        self._conn.execute(
+            "UPDATE leases SET status = ?, owner = NULL, expires_at = NULL WHERE lease_id = ? AND owner = ? AND status = ?",
+            (PENDING, lease.lease_id, owner, LEASED),
+        )
+
+    @_synchronized
+    def get_job(self, job_id: int) -> Optional[dict]:
+        row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {"job_id": row["job_id"], "kind": row["kind"], "params": json.loads(row["params"]),
+                "created_at": row["created_at"]}
+
+    @_synchronized
+    def job_status(self, job_id: int) -> Dict[str, int]:
+        """
+        Leases that expired on their last attempt are marked as failed first, so a job whose
+        workers are all gone still finishes.
+
+        :return: Number of leases of the job per state, plus the number of stored results.
+        """
+        self._fail_exhausted(time.time())
+        status = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for row in self._conn.execute(
+            "SELECT status, COUNT(*) AS total FROM leases WHERE job_id = ? GROUP BY status", (job_id,)
+        ):
+            status[row["status"]] = row["total"]
+        status["results"] = self._conn.execute(
+            "SELECT COUNT(*) FROM results WHERE job_id = ? AND data IS NOT NULL", (job_id,)
+        ).fetchone()[0]
+        return status
+
+    def is_finished(self, job_id: int) -> bool:
+        status = self.job_status(job_id)
+        return status[PENDING] == 0 and status[LEASED] == 0
+
+    @_synchronized
+    def get_results(self, job_id: int) -> List[dict]:
+        """
+        :return: Wallet summaries stored for the job, skipping failed lookups.
+        """
+        return [
+            json.loads(row["data"])
+            for row in self._conn.execute(
+                "SELECT data FROM results WHERE job_id = ? AND data IS NOT NULL ORDER BY wallet_address", (job_id,)
+            )
+        ]
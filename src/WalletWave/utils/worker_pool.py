@@ -0,0 +1,195 @@
+import asyncio
+import multiprocessing
+import queue
+import time
+from contextlib import nullcontext
+from typing import Callable, List, Optional
+
+from WalletWave.utils.gmgn_client.utils.rate_limiter import current_request_policy, deadline_passed, request_priority
+from WalletWave.utils.logging_utils import get_logger, init_logging, shutdown_logging
+
+# Messages sent from the workers to the parent over the result queue
+RESULT = "result"   # (RESULT, wallet_address, summary)
+DONE = "done"       # (DONE, worker_id, scanned, client metrics summary)
+
+
+def shard_addresses(addresses: List[str], workers: int) -> List[List[str]]:
+    """
+    Splits a list of wallet addresses into round-robin shards.
+
+    :param addresses: Wallet addresses to scan.
+    :param workers: Number of shards to create.
+    :return: List of non-empty shards.
+    """
+    shards = [addresses[i::workers] for i in range(workers)]
+    return [shard for shard in shards if shard]
+
+
+async def _fetch_shard(worker_id: int, shard: List[str], period: str, timeout: Optional[int],
+                       summary_func: Optional[Callable], result_queue, request_delay: float = 2,
+                       retry_policy: Optional[dict] = None, transport=None, hedge_policy: Optional[dict] = None) -> None:
+    """
+    Fetches the wallet info of every address of a shard and streams summaries back to the parent.
+    """
+    # imported here so the parent process never builds a client for the pool
+    from WalletWave.repositories.gmgn_repo import GmgnRepo
+    from WalletWave.utils.gmgn_client.client import Gmgn
+    from WalletWave.utils.gmgn_client.metrics import ClientMetrics
+    from WalletWave.utils.gmgn_client.utils.hedging import HedgePolicy
+
+    logger = get_logger(f"ScanWorker-{worker_id}")
+    metrics = ClientMetrics()
+    # every worker gets its own identity and rate budget
+    hedging = HedgePolicy(**hedge_policy) if hedge_policy else None
+    gmgn = GmgnRepo(Gmgn(request_delay=request_delay, metrics=metrics, transport=transport, hedging=hedging,
+                         **(retry_policy or {})))
+    scanned = 0
+    try:
+        for wallet_address in shard:
+            if deadline_passed():
+                logger.warning(f"Worker {worker_id} reached the time budget of the run")
+                break
+            summary = None
+            try:
+                wallet_info = await gmgn.get_wallet_info(wallet_address, timeout, period=period)
+                if wallet_info:
+                    summary = wallet_info.to_summary(wallet_address, summary_func=summary_func)
+                    scanned += 1
+            except Exception as e:
+                logger.error(f"Error fetching data for wallet {wallet_address}: {e}")
+            result_queue.put((RESULT, wallet_address, summary))
+    finally:
+        logger.info(f"Worker {worker_id} scanned {scanned}/{len(shard)} wallets")
+        result_queue.put((DONE, worker_id, scanned, metrics.to_dict()))
+
+
+def _scan_shard(worker_id: int, shard: List[str], period: str, timeout: Optional[int],
+                summary_func: Optional[Callable], result_queue, logging_config: Optional[dict],
+                time_limit: Optional[float] = None) -> None:
+    """
+    Process entry point of a scan worker.
+
+    :param time_limit: Seconds left to the request deadline of the parent, no new request is sent after it.
+    """
+    init_logging(logging_config)
+    config = logging_config or {}
+    from WalletWave.utils.gmgn_client.utils.session_archive import session_transport
+    transport = session_transport(config.get("record_session"), config.get("replay_session"))
+    request_delay = 0 if config.get("replay_session") else config.get("request_delay", 2)
+    # the parent's request deadline does not cross the process boundary, it is rebuilt from the time left
+    deadline = nullcontext() if time_limit is None else request_priority(deadline=time.monotonic() + time_limit)
+    try:
+        with deadline:
+            asyncio.run(_fetch_shard(worker_id, shard, period, timeout, summary_func, result_queue, request_delay,
+                                     config.get("retry"), transport, config.get("hedging")))
+    finally:
+        shutdown_logging()  # multiprocessing children skip atexit, flush the queued records here
+
+
+class ShardedWalletScanner:
+    """
+    Scans a wallet list across a pool of worker processes.
+
+    The address set is sharded across the workers, each worker runs its own event loop
+    and Gmgn client, and streams its results back to the parent over a queue.
+    """
+
+    def __init__(self, workers: int, logging_config: Optional[dict] = None, poll_interval: float = 1.0,
+                 metrics=None):
+        """
+        :param workers: Number of worker processes.
+        :param logging_config: Program config passed to init_logging in every worker.
+        :param poll_interval: Seconds between liveness checks of the workers while waiting for results.
+        :param metrics: ClientMetrics the client metrics of every worker are merged into.
+        """
+        self.workers = workers
+        self.metrics = metrics
+        self.logging_config = logging_config
+        self.poll_interval = poll_interval
+        self.logger = get_logger("ShardedWalletScanner")
+
+    async def scan(self, wallet_addresses: List[str], period: str = "7d", timeout: Optional[int] = None,
+                   summary_func: Optional[Callable] = None,
+                   on_result: Optional[Callable[[dict], None]] = None) -> List[dict]:
+        """
+        Fetches wallet info for every address and merges the summaries of all workers.
+
+        :param wallet_addresses: Wallet addresses to scan.
+        :param period: Wallet info period ("7d", "30d").
+        :param timeout: Request timeout passed to GmgnRepo.get_wallet_info.
+        :param summary_func: Optional picklable summary function passed to to_summary.
+        :param on_result: Called with every summary as soon as it is merged.
+        :return: List of wallet summaries, in completion order.
+        """
+        shards = shard_addresses(wallet_addresses, self.workers)
+        if not shards:
+            return []
+
+        deadline = current_request_policy().deadline
+        time_limit = None if deadline is None else max(deadline - time.monotonic(), 0)
+
+        context = multiprocessing.get_context("spawn")
+        result_queue = context.Queue()
+        processes = [
+            context.Process(
+                target=_scan_shard,
+                args=(worker_id, shard, period, timeout, summary_func, result_queue, self.logging_config, time_limit),
+                daemon=True,
+            )
+            for worker_id, shard in enumerate(shards)
+        ]
+
+        self.logger.info(f"Scanning {len(wallet_addresses)} wallets with {len(processes)} worker processes")
+        for process in processes:
+            process.start()
+
+        loop = asyncio.get_running_loop()
+        results = []
+        finished = set()
+        failed = 0
+        try:
+            while len(finished) < len(processes):
+                message = await loop.run_in_executor(None, self._next_message, result_queue, processes, finished)
+                if message is None:
+                    continue
+                if message[0] == DONE:
+                    finished.add(message[1])
+                    if self.metrics is not None:
+                        self.metrics.merge(message[3])
+                    continue
+
+                _, wallet_address, summary = message
+                if summary is None:
+                    failed += 1
+                    continue
+                results.append(summary)
+                if on_result is not None:
+                    on_result(summary)
+                self.logger.debug(f"Fetched data for wallet: {wallet_address}")
+        finally:
+            for process in processes:
+                process.join(timeout=self.poll_interval)
+                if process.is_alive():
+                    process.terminate()
+
+        self.logger.info(f"Merged {len(results)} wallet results from {len(processes)} workers ({failed} failed)")
+        return results
+
+    def _next_message(self, result_queue, processes: list, finished: set):
+        """
+        Blocks until the next worker message arrives.
+
+        Workers that exited without reporting DONE (crashed) are marked as finished so the parent never hangs.
+        """
+        try:
+            return result_queue.get(timeout=self.poll_interval)
+        except queue.Empty:
+            for worker_id, process in enumerate(processes):
+                if worker_id not in finished and not process.is_alive():
+                    # drain anything the worker put before exiting
+                    try:
+                        return result_queue.get_nowait()
+                    except queue.Empty:
+                        self.logger.error(f"Worker {worker_id} exited with code {process.exitcode} before finishing")
+                        finished.add(worker_id)
+            return None
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from WalletWave.daemon import CronSchedule, IntervalSchedule
+
+
+def brute_force_next(schedule: CronSchedule, moment: datetime) -> datetime:
+    candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    while not (candidate.minute in schedule.minutes and candidate.hour in schedule.hours
+               and candidate.month in schedule.months and schedule._day_matches(candidate)):
+        candidate += timedelta(minutes=1)
+    return candidate
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("*/15 * * * *", datetime(2025, 1, 31, 23, 45)),
+    ("0 9 * * *", datetime(2025, 2, 1, 9, 0)),
+    ("30 8 * * 1-5", datetime(2025, 2, 3, 8, 30)),       # Jan 31 2025 is a Friday, next weekday is Monday
+    ("0 0 1 * *", datetime(2025, 2, 1, 0, 0)),
+    ("0 12 29 2 *", datetime(2028, 2, 29, 12, 0)),       # next leap day
+    ("0 6 * * 0", datetime(2025, 2, 2, 6, 0)),           # Sunday as 0
+    ("0 6 * * 7", datetime(2025, 2, 2, 6, 0)),           # and as 7
+])
+def test_next_after(expression, expected):
+    assert CronSchedule(expression).next_after(datetime(2025, 1, 31, 23, 40, 12)) == expected
+
+
+def test_restricted_day_fields_match_either():
+    schedule = CronSchedule("0 0 15 * 1")  # the 15th, or any Monday
+    assert schedule.next_after(datetime(2025, 2, 1)) == datetime(2025, 2, 3)
+    assert schedule.next_after(datetime(2025, 2, 14, 1)) == datetime(2025, 2, 15)
+
+
+@pytest.mark.parametrize("expression", ["*/7 */5 * * *", "0-30/10 2,14 * 1-6 *", "5 4 1,15 * 3", "0 */6 10-20 */2 *"])
+def test_next_after_matches_brute_force(expression):
+    schedule = CronSchedule(expression)
+    moment = datetime(2024, 12, 30, 22, 58, 30)
+    for _ in range(30):
+        expected = brute_force_next(schedule, moment)
+        assert schedule.next_after(moment) == expected
+        moment = expected
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "*/0 * * * *",
+                                        "5-1 * * * *", "a * * * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_never_matching_expression():
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 31 2 *").next_after(datetime(2025, 1, 1))
+
+
+def test_interval_schedule():
+    assert IntervalSchedule(90).next_after(datetime(2025, 1, 1)) == datetime(2025, 1, 1, 0, 1, 30)
+    with pytest.raises(ValueError):
+        IntervalSchedule(0)
@@ -0,0 +1,86 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from WalletWave.utils import daily_profit
+from WalletWave.utils.daily_profit import (DAILY_PROFIT_FIELDS, _metrics_python, daily_profit_metrics,
+                                           passes_daily_profit_filters)
+
+DAY = 86400
+
+
+def make_entry(address: str, profits: list, shuffle: random.Random = None):
+    days = [SimpleNamespace(timestamp=1_700_000_000 + index * DAY, profit=profit) for index, profit in enumerate(profits)]
+    if shuffle is not None:
+        shuffle.shuffle(days)  # the API does not promise an order
+    return SimpleNamespace(wallet_address=address, daily_profit_7d=days)
+
+
+def random_entries(count: int = 200):
+    rng = random.Random(0)
+    entries = [
+        make_entry("empty", []),
+        make_entry("flat", [5.0] * 7),
+        make_entry("losses", [-1.0, -2.0, -3.0]),
+        make_entry("single", [10.0]),
+    ]
+    for index in range(count):
+        profits = [rng.uniform(-1000, 1000) for _ in range(rng.randint(0, 9))]
+        entries.append(make_entry(f"w{index}", profits, shuffle=rng))
+    return entries
+
+
+def assert_same_metrics(actual: dict, expected: dict):
+    assert actual.keys() == expected.keys()
+    for address in expected:
+        for field in DAILY_PROFIT_FIELDS:
+            if expected[address][field] is None:
+                assert actual[address][field] is None, (address, field)
+            else:
+                assert actual[address][field] == pytest.approx(expected[address][field], rel=1e-9, abs=1e-9), \
+                    (address, field)
+
+
+def test_known_series():
+    metrics = _metrics_python([make_entry("w", [100.0, -50.0, 150.0, -200.0])], days=7)[0]
+    assert metrics["daily_profit_mean"] == pytest.approx(0.0)
+    assert metrics["daily_profit_max_drawdown"] == pytest.approx(200.0)  # cumulative 100, 50, 200, 0
+    assert metrics["losing_days"] == 2
+    assert metrics["daily_gain_concentration"] == pytest.approx(0.6)
+
+
+def test_edge_cases():
+    metrics = daily_profit_metrics([make_entry("empty", []), make_entry("flat", [5.0] * 3),
+                                    make_entry("losses", [-1.0, -2.0])])
+    assert metrics["empty"] == dict.fromkeys(DAILY_PROFIT_FIELDS)
+    assert metrics["flat"]["daily_sharpe"] is None
+    assert metrics["flat"]["daily_profit_std"] == 0
+    assert metrics["losses"]["daily_gain_concentration"] is None
+    assert metrics["losses"]["daily_profit_max_drawdown"] == pytest.approx(3.0)
+    assert daily_profit_metrics([]) == {}
+
+
+@pytest.mark.parametrize("days", [3, 7])
+def test_numpy_matches_python(days):
+    pytest.importorskip("numpy")
+    entries = random_entries()
+    expected = {entry.wallet_address: values for entry, values in zip(entries, _metrics_python(entries, days))}
+    assert_same_metrics(daily_profit_metrics(entries, days), expected)
+
+
+def test_python_fallback_is_used_without_numpy(monkeypatch):
+    entries = random_entries(20)
+    monkeypatch.setattr(daily_profit, "np", None)
+    fallback = daily_profit_metrics(entries)
+    expected = {entry.wallet_address: values for entry, values in zip(entries, _metrics_python(entries, 7))}
+    assert fallback == expected
+
+
+def test_filters():
+    metrics = {"daily_sharpe": 1.5, "losing_days": 2, "daily_gain_concentration": 0.4}
+    assert passes_daily_profit_filters(metrics)
+    assert passes_daily_profit_filters(metrics, min_sharpe=1, max_losing_days=2, max_concentration=0.5)
+    assert not passes_daily_profit_filters(metrics, min_sharpe=2)
+    assert not passes_daily_profit_filters(metrics, max_losing_days=1)
+    assert not passes_daily_profit_filters(dict.fromkeys(DAILY_PROFIT_FIELDS), max_concentration=1)
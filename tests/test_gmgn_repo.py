@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import random
+
+import pytest
+
+from benchmarks.fixtures import make_token_info_response
+from WalletWave.repositories.gmgn_repo import GmgnRepo
+from WalletWave.utils.gmgn_client.utils.ttl_cache import TTLCache
+
+
+class FakeClient:
+    """ Answers token info requests after `release` is set, counting the requests per token """
+
+    def __init__(self, failing=()):
+        self.requests = {}
+        self.failing = set(failing)
+        self.release = asyncio.Event()
+
+    async def request(self, url, params=None):
+        address = url.rsplit("/", 1)[-1]
+        self.requests[address] = self.requests.get(address, 0) + 1
+        await self.release.wait()
+        if address in self.failing:
+            raise RuntimeError(f"boom {address}")
+        return make_token_info_response(random.Random(0), address)
+
+
+def test_ttl_cache_expires_and_evicts(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("WalletWave.utils.gmgn_client.utils.ttl_cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(ttl=10, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a is now the most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None and len(cache) == 2
+
+    now[0] += 11
+    assert cache.get("a") is None and cache.get("c") is None
+
+
+def test_concurrent_token_lookups_share_one_request():
+    async def scenario():
+        client = FakeClient()
+        repo = GmgnRepo(client)
+        lookups = [asyncio.ensure_future(repo.get_token_info("token")) for _ in range(5)]
+        await asyncio.sleep(0)
+        client.release.set()
+        responses = await asyncio.gather(*lookups)
+        cached = await repo.get_token_info("token")
+        return client, repo, responses, cached
+
+    client, repo, responses, cached = asyncio.run(scenario())
+    assert client.requests == {"token": 1}
+    assert all(response is responses[0] for response in responses)
+    assert cached is responses[0]
+    assert repo._token_requests == {}
+
+
+def test_cancelled_caller_does_not_cancel_shared_request():
+    async def scenario():
+        client = FakeClient()
+        repo = GmgnRepo(client)
+        first = asyncio.ensure_future(repo.get_token_info("token"))
+        second = asyncio.ensure_future(repo.get_token_info("token"))
+        await asyncio.sleep(0)
+        first.cancel()
+        client.release.set()
+        return client, first, await second
+
+    client, first, response = asyncio.run(scenario())
+    assert first.cancelled()
+    assert response is not None and response.data[0].address == "token"
+    assert client.requests == {"token": 1}
+
+
+def test_get_token_infos_dedups_and_logs_failures(caplog):
+    async def scenario():
+        client = FakeClient(failing={"bad"})
+        client.release.set()
+        repo = GmgnRepo(client)
+        return client, await repo.get_token_infos(["good", "bad", "good", None])
+
+    with caplog.at_level(logging.ERROR, logger="GmgnRepo"):
+        client, token_infos = asyncio.run(scenario())
+
+    assert client.requests == {"good": 1, "bad": 1}
+    assert token_infos["good"].address == "good"
+    assert token_infos["bad"] is None
+    assert any("bad" in record.getMessage() and "boom" in record.getMessage() for record in caplog.records)
+
+
+def test_failed_lookup_is_not_cached():
+    async def scenario():
+        client = FakeClient(failing={"token"})
+        client.release.set()
+        repo = GmgnRepo(client)
+        with pytest.raises(RuntimeError):
+            await repo.get_token_info("token")
+        client.failing.clear()
+        return client, await repo.get_token_info("token")
+
+    client, response = asyncio.run(scenario())
+    assert response is not None
+    assert client.requests == {"token": 2}
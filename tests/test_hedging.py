@@ -0,0 +1,82 @@
+import asyncio
+
+import httpx
+import pytest
+
+from WalletWave.utils.config_validators import validate_hedging_policy
+from WalletWave.utils.gmgn_client.client import Gmgn
+from WalletWave.utils.gmgn_client.utils.hedging import HedgePolicy
+
+WALLET_URL = "https://gmgn.ai/defi/quotation/v1/smartmoney/sol/walletNew/abc"
+
+
+def test_no_delay_before_min_samples():
+    policy = HedgePolicy(min_samples=5)
+    for _ in range(4):
+        policy.observe("wallet_info", 0.1)
+    assert policy.delay("wallet_info") is None
+
+    policy.observe("wallet_info", 0.1)
+    assert policy.delay("wallet_info") == 0.1
+
+
+def test_delay_is_the_latency_quantile():
+    policy = HedgePolicy(quantile=0.9, min_samples=1)
+    for ms in range(1, 101):
+        policy.observe("wallet_info", ms / 1000)
+    assert policy.delay("wallet_info") == 0.09
+
+    policy.observe("wallet_info", 5.0)  # a new sample drops the cached quantile
+    assert policy.delay("wallet_info") == 0.091
+
+
+def test_default_quantile_is_p99():
+    policy = HedgePolicy(min_samples=1)
+    for ms in range(1, 101):
+        policy.observe("wallet_info", ms / 1000)
+    assert policy.delay("wallet_info") == 0.099
+    assert validate_hedging_policy({"enabled": True})["quantile"] == 0.99
+
+
+def test_hedges_are_capped_at_max_ratio():
+    policy = HedgePolicy(max_ratio=0.05)
+    granted = 0
+    for _ in range(200):
+        policy.requests += 1
+        granted += policy.try_hedge()
+    assert granted == policy.hedges == 10
+
+
+@pytest.mark.parametrize("endpoints, covered", [(None, True), (["wallet_info"], True), (["token_info"], False)])
+def test_covers(endpoints, covered):
+    assert HedgePolicy(endpoints=endpoints).covers("wallet_info") is covered
+
+
+def test_hedge_goes_out_on_a_separate_client():
+    seen = []
+
+    async def handler(request):
+        seen.append((request.headers["user-agent"], request.headers.get("cookie")))
+        if len(seen) == 1:
+            await asyncio.sleep(5)  # the original request hangs
+        return httpx.Response(200, json={"hedge": len(seen) > 1})
+
+    async def scenario():
+        policy = HedgePolicy(max_ratio=1, min_samples=1)
+        policy.observe("wallet_info", 0.01)
+        gmgn = Gmgn(persistent=True, request_delay=0, transport=httpx.MockTransport(handler), hedging=policy)
+        async with gmgn._http_client() as client:
+            client.cookies.set("session", "primary")
+        try:
+            return gmgn, await asyncio.wait_for(gmgn.request(WALLET_URL), 2)
+        finally:
+            await gmgn.aclose()
+
+    gmgn, data = asyncio.run(scenario())
+
+    assert data == {"hedge": True}
+    (primary_agent, primary_cookie), (hedge_agent, hedge_cookie) = seen
+    assert primary_cookie == "session=primary"
+    assert hedge_cookie is None
+    assert hedge_agent != primary_agent
+    assert gmgn.metrics.endpoints["wallet_info"].hedge_wins == 1
@@ -0,0 +1,76 @@
+import asyncio
+from types import SimpleNamespace
+
+from WalletWave.utils.holder_crawler import HolderGraphCrawler, VisitedSet
+
+# token -> (holder, profit on the token), highest profit first is not assumed
+HOLDERS = {
+    "T0": [("w3", 1.0), ("w1", 10.0), ("w2", 5.0)],
+    "T1": [("w1", 2.0), ("w4", 50.0)],
+}
+# wallet -> tokens it bought recently, w1 leads back to the seed token
+BOUGHT = {"w1": ["T1", "T0"], "w2": ["T1"], "w4": ["T0"]}
+
+
+class FakeRepo:
+    def __init__(self):
+        self.calls = []
+
+    async def get_top_holders(self, contract_address, limit=100):
+        self.calls.append(contract_address)
+        holders = [SimpleNamespace(wallet_address=wallet, profit=profit, realized_profit=None)
+                   for wallet, profit in HOLDERS.get(contract_address, [])]
+        return SimpleNamespace(data=SimpleNamespace(holderInfo=holders))
+
+    async def get_wallet_info(self, wallet_address, period="7d"):
+        self.calls.append(wallet_address)
+        return SimpleNamespace(wallet=wallet_address)
+
+
+def crawl(**kwargs):
+    repo = FakeRepo()
+    crawler = HolderGraphCrawler(repo, lambda wallet: BOUGHT.get(wallet, []), concurrency=1, **kwargs)
+    wallets = asyncio.run(crawler.crawl(["T0"]))
+    return repo, crawler, wallets
+
+
+def test_visited_set():
+    visited = VisitedSet()
+    assert visited.add("wallet:a")
+    assert not visited.add("wallet:a")
+    assert "wallet:a" in visited and "wallet:b" not in visited
+    assert len(visited) == 1
+
+
+def test_most_profitable_nodes_first_and_each_node_once():
+    repo, crawler, wallets = crawl()
+
+    # T1 (reached through w1, profit 10) goes before w2 (5), its holder w4 (50) before w2 too
+    assert repo.calls == ["T0", "w1", "T1", "w4", "w2", "w3"]
+    assert crawler.requests == 6
+    w4 = next(wallet for wallet in wallets if wallet.wallet_address == "w4")
+    assert (w4.depth, w4.via_token, w4.holder_profit) == (1, "T1", 50.0)
+
+
+def test_max_depth_stops_the_expansion():
+    repo, _, wallets = crawl(max_depth=0)
+
+    assert repo.calls == ["T0", "w1", "w2", "w3"]
+    assert {wallet.depth for wallet in wallets} == {0}
+
+
+def test_budget_caps_the_requests():
+    repo, crawler, wallets = crawl(budget=3)
+
+    assert repo.calls == ["T0", "w1", "T1"]
+    assert crawler.requests == 3
+    assert [wallet.wallet_address for wallet in wallets] == ["w1"]
+
+
+def test_max_wallets_with_concurrent_requests():
+    repo = FakeRepo()
+    crawler = HolderGraphCrawler(repo, lambda wallet: BOUGHT.get(wallet, []), concurrency=4, max_wallets=2)
+    wallets = asyncio.run(crawler.crawl(["T0"]))
+
+    assert 2 <= len(wallets) <= 4  # requests already in flight still land
+    assert len(repo.calls) == len(set(repo.calls))
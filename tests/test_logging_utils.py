@@ -0,0 +1,32 @@
+import json
+import logging
+
+from WalletWave.utils import logging_utils
+
+
+def log_exception(tmp_path, config) -> str:
+    logging_utils.LogConfig(log_dir=str(tmp_path), config=config)
+    try:
+        try:
+            raise ValueError("bad response")
+        except ValueError:
+            logging.getLogger("gmgn_api").exception("Request failed for %s", "wallet")
+    finally:
+        logging_utils.shutdown_logging()
+        logging.getLogger().handlers.clear()
+    return (tmp_path / "app.log").read_text()
+
+
+def test_json_log_keeps_traceback_apart_from_message(tmp_path):
+    entry = json.loads(log_exception(tmp_path, {"log_format": "json"}).splitlines()[-1])
+
+    assert entry["message"] == "Request failed for wallet"
+    assert entry["exception"].startswith("Traceback")
+    assert "ValueError: bad response" in entry["exception"]
+
+
+def test_text_log_appends_traceback(tmp_path):
+    text = log_exception(tmp_path, {})
+
+    assert "Request failed for wallet\nTraceback" in text
+    assert (tmp_path / "gmgn_api.log").read_text() == text
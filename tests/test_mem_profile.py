@@ -0,0 +1,49 @@
+import io
+import re
+
+import pytest
+
+from WalletWave.utils.mem_profile import MemoryProfiler
+
+pytestmark = pytest.mark.skipif(not hasattr(__import__("tracemalloc"), "reset_peak"),
+                                reason="tracemalloc.reset_peak needs Python 3.9")
+
+MiB = 2 ** 20
+
+
+def allocate(size: int) -> None:
+    block = bytearray(size)
+    del block
+
+
+def test_run_peak_survives_later_stages():
+    profiler = MemoryProfiler()
+    profiler.start()
+    try:
+        with profiler.stage("fetch"):
+            allocate(8 * MiB)
+        with profiler.stage("parse"):
+            allocate(MiB)
+    finally:
+        output = io.StringIO()
+        profiler.report(output)
+
+    peak = float(re.search(r"peak ([\d.]+) MiB", output.getvalue()).group(1))
+    assert peak >= 8
+    assert profiler.stages["parse"].peak < 2 * MiB
+
+
+def test_nested_stage_keeps_the_enclosing_peak():
+    profiler = MemoryProfiler()
+    profiler.start()
+    try:
+        with profiler.stage("fetch"):
+            allocate(8 * MiB)
+            with profiler.stage("parse"):
+                allocate(MiB)
+    finally:
+        profiler.stop()
+
+    assert profiler.stages["fetch"].peak >= 8 * MiB
+    assert profiler.stages["parse"].peak < 2 * MiB
+    assert profiler.peak >= 8 * MiB
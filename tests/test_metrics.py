@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+from WalletWave.utils.gmgn_client.metrics import (LATENCY_BUCKETS, ClientMetrics, _Histogram, endpoint_label,
+                                                  serve_metrics)
+
+
+def record(metrics: ClientMetrics, endpoint: str, seconds: float, status=200, bytes_received: int = 100) -> None:
+    started = metrics.request_started(endpoint)
+    metrics.request_finished(endpoint, started - seconds, status, bytes_received)
+
+
+def test_endpoint_label():
+    assert endpoint_label("https://gmgn.ai/defi/quotation/v1/smartmoney/sol/walletNew/abc?period=7d") == "wallet_info"
+    assert endpoint_label("http://127.0.0.1:8787/defi/quotation/v1/rank/sol/wallets/7d") == "trending_wallets"
+    assert endpoint_label("https://gmgn.ai/v1/unknown/path") == "/v1/unknown/path"
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = _Histogram()
+    for value in (0.05, 0.3, 0.3, 100.0):
+        histogram.observe(value)
+
+    assert histogram.counts[0] == 1  # bounds are inclusive
+    assert histogram.counts[LATENCY_BUCKETS.index(0.5)] == 2
+    assert histogram.counts[-1] == 1  # above the last bound
+    assert histogram.count == 4 and abs(histogram.total - 100.65) < 1e-9
+    assert histogram.quantile(0.5) == 0.5
+    assert histogram.quantile(0.99) is None
+    assert _Histogram().quantile(0.5) is None
+
+
+def test_prometheus_exposition():
+    metrics = ClientMetrics()
+    record(metrics, "wallet_info", 0.07)
+    record(metrics, "wallet_info", 0.3, status=429)
+    metrics.record_retry("wallet_info")
+    metrics.record_rotation()
+
+    lines = metrics.to_prometheus().splitlines()
+    buckets = [line for line in lines if line.startswith("walletwave_gmgn_request_seconds_bucket")]
+    assert buckets[:4] == [
+        'walletwave_gmgn_request_seconds_bucket{endpoint="wallet_info",le="0.05"} 0',
+        'walletwave_gmgn_request_seconds_bucket{endpoint="wallet_info",le="0.1"} 1',
+        'walletwave_gmgn_request_seconds_bucket{endpoint="wallet_info",le="0.25"} 1',
+        'walletwave_gmgn_request_seconds_bucket{endpoint="wallet_info",le="0.5"} 2',
+    ]
+    assert buckets[-1] == 'walletwave_gmgn_request_seconds_bucket{endpoint="wallet_info",le="+Inf"} 2'
+    assert 'walletwave_gmgn_request_seconds_count{endpoint="wallet_info"} 2' in lines
+    total = next(line for line in lines if line.startswith("walletwave_gmgn_request_seconds_sum"))
+    assert abs(float(total.split()[-1]) - 0.37) < 0.01
+    assert "# TYPE walletwave_gmgn_request_seconds histogram" in lines
+    assert "# TYPE walletwave_gmgn_responses_total counter" in lines
+    assert 'walletwave_gmgn_responses_total{endpoint="wallet_info",status="429"} 1' in lines
+    assert 'walletwave_gmgn_retries_total{endpoint="wallet_info"} 1' in lines
+    assert 'walletwave_gmgn_in_flight_requests{endpoint="wallet_info"} 0' in lines
+    assert "walletwave_gmgn_header_rotations_total 1" in lines
+
+
+def test_merge_adds_the_counters_of_another_instance():
+    first, second = ClientMetrics(), ClientMetrics()
+    record(first, "wallet_info", 0.07)
+    record(second, "wallet_info", 0.07, status=429)
+    record(second, "top_holders", 2.0, bytes_received=50)
+    second.record_retry("wallet_info")
+    second.record_hedge("wallet_info")
+    second.record_backoff(1.5)
+
+    first.merge(json.loads(json.dumps(second.to_dict())))  # as sent back by a worker process
+
+    summary = first.to_dict()
+    wallet_info = summary["endpoints"]["wallet_info"]
+    assert wallet_info["requests"] == 2
+    assert wallet_info["status"] == {"200": 1, "429": 1}
+    assert wallet_info["latency"]["buckets"][LATENCY_BUCKETS.index(0.1)] == 2
+    assert (wallet_info["retries"], wallet_info["hedges"], wallet_info["bytes_received"]) == (1, 1, 200)
+    assert summary["endpoints"]["top_holders"]["requests"] == 1
+    assert summary["backoff_seconds"] == 1.5
+
+
+def test_serve_metrics():
+    metrics = ClientMetrics()
+    record(metrics, "wallet_info", 0.07)
+
+    async def get(port: int, path: str) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+
+    async def scenario():
+        server = await serve_metrics(metrics, port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await get(port, "/metrics"), await get(port, "/metrics.json"), await get(port, "/other")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    prometheus, summary, missing = asyncio.run(scenario())
+
+    head, body = prometheus.split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert b"Content-Type: text/plain; version=0.0.4" in head
+    assert body.decode() == metrics.to_prometheus()
+    assert json.loads(summary.split(b"\r\n\r\n", 1)[1])["endpoints"]["wallet_info"]["requests"] == 1
+    assert missing.startswith(b"HTTP/1.1 404")
@@ -0,0 +1,139 @@
+import ast
+import sys
+
+import pytest
+
+from CLI.plugin_manager import PluginManager, PluginSpec, _is_plugin_class, _read_metadata
+
+PLUGIN_MODULES = ("WalletWave.plugins.top_wallets", "WalletWave.plugins.wallet_scanner",
+                  "WalletWave.plugins.holder_crawler")
+
+SOURCE = '''
+import plugins.utils.plugin_interface as interface
+
+class Attributes(PluginInterface):
+    name = "From attributes"
+    version: str = "1.2"
+    description = some_function()
+
+    def get_name(self):
+        return "ignored, the attribute wins"
+
+    def get_description(self):
+        return "From a getter"
+
+class Getters(interface.PluginInterface):
+    def get_name(self):
+        if self.flag:
+            return "one"
+        return "two"
+
+    def get_version(self):
+        return "0.1"
+
+class NotAPlugin(object):
+    name = "helper"
+'''
+
+
+def parse_classes():
+    return {node.name: node for node in ast.parse(SOURCE).body if isinstance(node, ast.ClassDef)}
+
+
+def test_plugin_classes_are_recognized_by_their_base():
+    classes = parse_classes()
+    assert _is_plugin_class(classes["Attributes"])
+    assert _is_plugin_class(classes["Getters"])
+    assert not _is_plugin_class(classes["NotAPlugin"])
+
+
+def test_metadata_is_read_without_executing_the_class():
+    classes = parse_classes()
+    assert _read_metadata(classes["Attributes"]) == {
+        "name": "From attributes", "version": "1.2", "description": "From a getter",
+    }
+    # a getter with more than one return is not a literal, the class name is used instead
+    assert _read_metadata(classes["Getters"]) == {"version": "0.1"}
+
+
+def test_discovery_does_not_import_plugins(monkeypatch):
+    for module in PLUGIN_MODULES:
+        monkeypatch.delitem(sys.modules, module, raising=False)
+
+    manager = PluginManager()
+    manager.load_plugins()
+
+    assert {plugin.module for plugin in manager.plugins} >= set(PLUGIN_MODULES)
+    assert not any(module in sys.modules for module in PLUGIN_MODULES)
+    assert manager.get_plugin("topwallets") is manager.get_plugin("Top Wallets")
+    assert manager.get_plugin("missing") is None
+
+
+def test_load_instantiates_the_selected_plugin(tmp_path, monkeypatch):
+    from WalletWave.config import ConfigManager, parse_args
+
+    monkeypatch.chdir(tmp_path)
+    manager = PluginManager(config_manager=ConfigManager(parse_args([])))
+    manager.load_plugins()
+    plugin = manager.get_plugin("SolanaWalletScanner").load(manager.config_manager)
+
+    assert type(plugin).__name__ == "SolanaWalletScanner"
+    assert plugin.config_manager is manager.config_manager
+
+
+def test_load_rejects_classes_that_are_not_plugins():
+    with pytest.raises(TypeError):
+        PluginSpec(module="WalletWave.utils.scoring", class_name="TopK", name="TopK").load(None)
+
+
+INDIRECT_PLUGINS = {
+    "base.py": '''
+from abc import abstractmethod
+from WalletWave.plugins.utils.plugin_interface import PluginInterface
+
+class BaseScanPlugin(PluginInterface):
+    @abstractmethod
+    def scan(self):
+        ...
+
+class LocalScan(BaseScanPlugin):
+    name = "Local scan"
+''',
+    "scans.py": '''
+from collections import OrderedDict
+from WalletWave.plugins.utils.plugin_interface import PluginInterface as Interface
+from .base import BaseScanPlugin
+import WalletWave.plugins.base as base_module
+
+class RelativeScan(BaseScanPlugin):
+    name = "Relative scan"
+
+class DottedScan(base_module.BaseScanPlugin):
+    pass
+
+class AliasedScan(Interface):
+    pass
+
+class Helper(dict):
+    pass
+
+class Ordered(OrderedDict):
+    pass
+''',
+}
+
+
+def test_indirect_subclasses_are_discovered(tmp_path, monkeypatch):
+    for file, source in INDIRECT_PLUGINS.items():
+        (tmp_path / file).write_text(source)
+    monkeypatch.delitem(sys.modules, "WalletWave.plugins.base", raising=False)
+
+    manager = PluginManager()
+    manager.plugin_directory = tmp_path
+    manager.load_plugins()
+
+    # the abstract base is not a plugin of its own, helpers are not plugins
+    assert {plugin.class_name for plugin in manager.plugins} == {"LocalScan", "RelativeScan", "DottedScan",
+                                                                   "AliasedScan"}
+    assert manager.get_plugin("Relative scan").module == "WalletWave.plugins.scans"
+    assert "WalletWave.plugins.base" not in sys.modules  # resolved from the sources, not imported
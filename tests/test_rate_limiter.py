@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import pytest
+
+from WalletWave.utils.gmgn_client.utils.rate_limiter import (RateLimiter, current_request_policy, deadline_passed,
+                                                             request_priority)
+
+
+def test_fast_path_without_interval():
+    async def scenario():
+        limiter = RateLimiter(0)
+        results = [await limiter.acquire() for _ in range(1000)]
+        return limiter, results
+
+    limiter, results = asyncio.run(scenario())
+    assert all(results)
+    assert limiter._dispatcher is None
+
+
+def test_slots_are_spaced_by_the_interval():
+    async def scenario():
+        limiter = RateLimiter(0.02)
+        starts = []
+
+        async def request():
+            await limiter.acquire()
+            starts.append(time.monotonic())
+
+        await asyncio.gather(*(request() for _ in range(5)))
+        return starts
+
+    starts = asyncio.run(scenario())
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.015
+
+
+def test_interactive_lane_jumps_a_bulk_queue():
+    async def scenario():
+        limiter = RateLimiter(0.005)
+        order = []
+
+        async def request(lane, name):
+            await limiter.acquire(lane)
+            order.append(name)
+
+        await limiter.acquire("bulk")  # takes the free slot, the next requests queue
+        bulk = [asyncio.ensure_future(request("bulk", f"bulk{i}")) for i in range(20)]
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(request("interactive", "interactive"))
+        await asyncio.gather(interactive, *bulk)
+        return order
+
+    order = asyncio.run(scenario())
+    assert order.index("interactive") <= 1
+
+
+def test_lanes_share_slots_by_weight():
+    async def scenario():
+        limiter = RateLimiter(0.002, weights={"interactive": 3, "normal": 1, "bulk": 1})
+        served = []
+
+        async def request(lane):
+            await limiter.acquire(lane)
+            served.append(lane)
+
+        await limiter.acquire()
+        tasks = [asyncio.ensure_future(request(lane)) for lane in ("interactive", "normal") for _ in range(40)]
+        await asyncio.gather(*tasks)
+        return served
+
+    served = asyncio.run(scenario())
+    # while both lanes are waiting, interactive gets about 3 slots for every normal one
+    first = served[:40]
+    assert 26 <= first.count("interactive") <= 34
+
+
+def test_deadline_drops_waiting_request():
+    async def scenario():
+        limiter = RateLimiter(1)
+        await limiter.acquire()
+        started = time.monotonic()
+        acquired = await limiter.acquire("normal", deadline=started + 0.05)
+        return limiter, acquired, time.monotonic() - started
+
+    limiter, acquired, waited = asyncio.run(scenario())
+    assert not acquired
+    assert waited < 0.5
+    assert limiter.dropped["normal"] == 1
+
+
+def test_passed_deadline_is_dropped_immediately():
+    async def scenario():
+        limiter = RateLimiter(0)
+        return limiter, await limiter.acquire("bulk", deadline=time.monotonic() - 1)
+
+    limiter, acquired = asyncio.run(scenario())
+    assert not acquired and limiter.dropped["bulk"] == 1
+
+
+def test_cancelled_waiter_releases_its_place():
+    async def scenario():
+        limiter = RateLimiter(0.05)
+        await limiter.acquire()
+        cancelled = asyncio.ensure_future(limiter.acquire())
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        started = time.monotonic()
+        await waiting
+        return cancelled, time.monotonic() - started
+
+    cancelled, waited = asyncio.run(scenario())
+    assert cancelled.cancelled()
+    assert waited < 0.09  # the next slot went to the remaining waiter, not to the cancelled one
+
+
+def test_unknown_lane_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(RateLimiter(0).acquire("urgent"))
+    with pytest.raises(ValueError):
+        with request_priority("urgent"):
+            pass
+
+
+def test_request_priority_nests_and_keeps_earliest_deadline():
+    assert current_request_policy().lane == "normal"
+    with request_priority("bulk", deadline=100.0, max_wait=5):
+        with request_priority("interactive", deadline=200.0):
+            policy = current_request_policy()
+            assert policy.lane == "interactive"
+            assert policy.deadline == 100.0
+            assert policy.max_wait == 5
+        assert current_request_policy().lane == "bulk"
+    assert current_request_policy().deadline is None
+
+
+def test_policy_reaches_tasks_created_inside_the_block():
+    async def policy_and_deadline():
+        return current_request_policy().lane, deadline_passed()
+
+    async def scenario():
+        with request_priority("bulk", deadline=time.monotonic() - 1):
+            inner = asyncio.ensure_future(policy_and_deadline())
+        return await inner, await policy_and_deadline()
+
+    assert asyncio.run(scenario()) == (("bulk", True), ("normal", False))
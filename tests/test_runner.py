@@ -0,0 +1,29 @@
+import pytest
+
+from WalletWave.runner import parse_params
+
+
+def test_params_apply_to_every_or_one_plugin():
+    settings = parse_params(
+        ["win_rate=70", "topwallets.top_k=25", "SolanaWalletScanner.timeframe=30d"],
+        ["TopWallets", "SolanaWalletScanner"],
+    )
+    assert settings == {
+        "TopWallets": {"win_rate": 70, "top_k": 25},
+        "SolanaWalletScanner": {"win_rate": 70, "timeframe": "30d"},
+    }
+
+
+def test_values_are_yaml_scalars():
+    settings = parse_params(["a=true", "b=0.5", "c=[1, 2]", "d=", "e=text=with=equals"], ["Plugin"])
+    assert settings["Plugin"] == {"a": True, "b": 0.5, "c": [1, 2], "d": None, "e": "text=with=equals"}
+
+
+def test_later_params_override_earlier_ones():
+    assert parse_params(["win_rate=60", "Plugin.win_rate=80"], ["Plugin"]) == {"Plugin": {"win_rate": 80}}
+
+
+@pytest.mark.parametrize("param", ["win_rate", "=70", "Other.win_rate=70"])
+def test_invalid_params(param):
+    with pytest.raises(ValueError):
+        parse_params([param], ["TopWallets"])
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from WalletWave.utils.scoring import DEFAULT_WEIGHTS, ScoringEngine, Shortlist, TopK
+
+
+def test_top_k_matches_a_full_sort():
+    rng = random.Random(0)
+    scores = [rng.randint(0, 50) for _ in range(500)]
+    top_k = TopK(10)
+    for index, score in enumerate(scores):
+        top_k.push(score, index)
+
+    # highest score first, ties keep the item pushed first
+    expected = sorted(range(len(scores)), key=lambda index: (-scores[index], index))[:10]
+    assert top_k.items() == expected
+    assert len(top_k) == 10
+
+
+def test_top_k_rejects_ties_once_full():
+    top_k = TopK(2)
+    assert top_k.push(1.0, "a") and top_k.push(2.0, "b")
+    assert not top_k.push(1.0, "c")
+    assert top_k.push(1.5, "d")
+    assert top_k.items() == ["b", "d"]
+
+
+def test_top_k_needs_a_positive_size():
+    with pytest.raises(ValueError):
+        TopK(0)
+
+
+def test_score_prefers_winrate_and_penalizes_risk():
+    engine = ScoringEngine(now=1_000_000)
+    base = {"winrate": 0.5, "pnl_7d": 1.0, "last_active_timestamp": 1_000_000}
+    assert engine.score({**base, "winrate": 0.9}) > engine.score(base)
+    assert engine.score({**base, "risk": {"token_honeypot_ratio": 1.0}}) < engine.score(base)
+
+    ignoring_winrate = ScoringEngine({"winrate": 0}, now=0)
+    assert ignoring_winrate.score({"winrate": 1.0}) == ignoring_winrate.score({"winrate": 0.0})
+
+
+def test_unknown_weights_are_rejected():
+    with pytest.raises(ValueError):
+        ScoringEngine({"sharpe": 1.0})
+
+
+def test_shortlist_keeps_best_scored_summaries():
+    winrate_only = ScoringEngine({**dict.fromkeys(DEFAULT_WEIGHTS, 0), "winrate": 1})
+    shortlist = Shortlist(winrate_only, top_k=2)
+    shortlist.extend({"wallet_address": str(winrate), "winrate": winrate} for winrate in (0.2, 0.9, 0.5, 0.7))
+
+    assert [summary["wallet_address"] for summary in shortlist.items()] == ["0.9", "0.7"]
+    assert all("score" in summary for summary in shortlist.items())
+    assert shortlist.seen == 4
+
+
+def test_shortlist_without_engine_keeps_order_and_adds_no_score():
+    shortlist = Shortlist(None)
+    shortlist.extend([{"wallet_address": "b"}, {"wallet_address": "a"}])
+
+    assert shortlist.items() == [{"wallet_address": "b"}, {"wallet_address": "a"}]
+    with pytest.raises(ValueError):
+        Shortlist(None, top_k=5)
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from benchmarks.mock_gmgn import MockGmgnServer, wallet_addresses
+from WalletWave.repositories.gmgn_repo import GmgnRepo
+from WalletWave.utils.gmgn_client.client import Gmgn
+from WalletWave.utils.gmgn_client.utils.gmgn_endpoints import BASE_URL_ENV
+from WalletWave.utils.gmgn_client.utils.session_archive import (RecordingTransport, ReplayTransport, SessionArchive,
+                                                                request_key)
+
+ADDRESS = wallet_addresses(1)[0]
+WALLET_PATH = f"/v1/smartmoney/sol/walletNew/{ADDRESS}"
+
+
+def test_lookup_serves_latest_successful_response(tmp_path):
+    archive = SessionArchive(str(tmp_path / "session.db"))
+    url = httpx.URL("https://gmgn.ai/defi/quotation/v1/smartmoney/sol/walletNew/abc", params={"period": "7d"})
+    archive.record(url, 200, b'{"old": true}')
+    archive.record(url, 200, b'{"new": true}')
+    archive.record(url, 429, b'{"code": 429}')
+
+    assert archive.lookup(url) == (200, b'{"new": true}')
+    assert archive.lookup(url.copy_with(params={"period": "30d"})) is None
+    assert len(archive) == 3
+    archive.close()
+
+
+def test_request_key_ignores_base_url_and_param_order(monkeypatch):
+    monkeypatch.setenv(BASE_URL_ENV, "http://127.0.0.1:8787/defi/quotation")
+    local = request_key(httpx.URL("http://127.0.0.1:8787/defi/quotation/v1/rank/sol/wallets/7d?tag=a&orderby=b"))
+    monkeypatch.setenv(BASE_URL_ENV, "https://gmgn.ai/defi/quotation")
+    remote = request_key(httpx.URL("https://gmgn.ai/defi/quotation/v1/rank/sol/wallets/7d?orderby=b&tag=a"))
+
+    assert local == remote == ("/v1/rank/sol/wallets/7d", local[1])
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_record_and_replay_round_trip(tmp_path, monkeypatch, compressed):
+    archive_path = str(tmp_path / "session.db")
+
+    async def record():
+        server = MockGmgnServer(gzip=compressed)
+        base_url = await server.start()
+        monkeypatch.setenv(BASE_URL_ENV, base_url)
+        transport = RecordingTransport(SessionArchive(archive_path))
+        try:
+            async with httpx.AsyncClient(transport=transport) as client:
+                response = await client.get(base_url + WALLET_PATH, params={"period": "7d"},
+                                            headers={"Accept-Encoding": "gzip"})
+            return response, base_url
+        finally:
+            transport.archive.close()
+            await server.close()
+
+    async def replay(base_url):
+        archive = SessionArchive(archive_path)
+        try:
+            async with httpx.AsyncClient(transport=ReplayTransport(archive)) as client:
+                return await client.get(base_url + WALLET_PATH, params={"period": "7d"})
+        finally:
+            archive.close()
+
+    recorded, base_url = asyncio.run(record())
+    assert "content-encoding" not in recorded.headers
+    data = recorded.json()
+    assert data["code"] == 0
+
+    replayed = asyncio.run(replay(base_url))  # the server is gone, the archive answers
+    assert replayed.json() == data
+
+
+def test_client_records_gzip_responses(tmp_path, monkeypatch):
+    archive_path = str(tmp_path / "session.db")
+
+    async def lookup(transport, server=None):
+        if server is not None:
+            monkeypatch.setenv(BASE_URL_ENV, await server.start())
+        gmgn = GmgnRepo(Gmgn(request_delay=0, max_retries=0, transport=transport))
+        try:
+            return await gmgn.get_wallet_info(ADDRESS, period="7d")
+        finally:
+            await gmgn.aclose()
+            transport.archive.close()
+            if server is not None:
+                await server.close()
+
+    recorded = asyncio.run(lookup(RecordingTransport(SessionArchive(archive_path)), MockGmgnServer(gzip=True)))
+    assert recorded is not None
+
+    replayed = asyncio.run(lookup(ReplayTransport(SessionArchive(archive_path))))
+    assert replayed is not None
+    assert json.dumps(replayed.to_summary(ADDRESS), default=str) == json.dumps(recorded.to_summary(ADDRESS), default=str)
@@ -0,0 +1,66 @@
+import struct
+
+import pytest
+
+from WalletWave.repositories.snapshot_repo import (LAYOUT_VERSION, LAYOUTS, METRICS, SnapshotRepo, _metric_reader,
+                                                   decode_metrics, encode_metrics)
+
+DAY = 86400
+
+
+def test_encode_decode_round_trip():
+    summary = {"winrate": 0.625, "pnl_7d": -1.5, "total_value": 123456.0, "buy_7d": 42, "score": True,
+               "token_num": "12", "wallet_address": "abc"}
+    blob = encode_metrics(summary)
+
+    assert blob[0] == LAYOUT_VERSION
+    assert len(blob) == 1 + 4 * len(METRICS)
+    decoded = decode_metrics(blob)
+    assert list(decoded) == list(METRICS)
+    assert decoded["winrate"] == 0.625 and decoded["pnl_7d"] == -1.5
+    assert decoded["total_value"] == 123456.0 and decoded["buy_7d"] == 42
+    # booleans, strings and missing fields are not metrics
+    assert decoded["score"] is None and decoded["token_num"] is None and decoded["sell_7d"] is None
+
+
+def test_values_are_stored_as_float32():
+    decoded = decode_metrics(encode_metrics({"winrate": 0.1}))
+    assert decoded["winrate"] == pytest.approx(0.1, rel=1e-7)
+    assert decoded["winrate"] == struct.unpack("<f", struct.pack("<f", 0.1))[0]
+
+
+def test_metric_reader_matches_decode():
+    blob = encode_metrics({metric: index for index, metric in enumerate(METRICS)})
+    for metric in METRICS:
+        assert _metric_reader(metric)(blob) == decode_metrics(blob)[metric]
+
+
+def test_older_layouts_stay_readable(monkeypatch):
+    monkeypatch.setitem(LAYOUTS, 0, ("pnl_7d", "winrate"))
+    old_blob = struct.pack("<B2f", 0, 2.0, 0.5)
+
+    assert decode_metrics(old_blob) == {"pnl_7d": 2.0, "winrate": 0.5}
+    assert _metric_reader("winrate")(old_blob) == 0.5
+    assert _metric_reader("score")(old_blob) is None
+
+
+def test_history_and_movers(tmp_path):
+    repo = SnapshotRepo(str(tmp_path / "snapshots.db"))
+    now = 1_700_000_000
+    repo.record([{"wallet_address": "a", "winrate": 0.5}, {"wallet_address": "b", "winrate": 0.5}], now - 10 * DAY)
+    repo.record([{"wallet_address": "a", "winrate": 0.6}, {"wallet_address": "b", "winrate": 0.4}], now - 5 * DAY)
+    repo.record([{"wallet_address": "a", "winrate": 0.9}, {"wallet_address": "b", "winrate": 0.3},
+                 {"wallet_address": "c", "winrate": 0.1}, {"winrate": 1.0}], now)
+
+    assert len(repo) == 7  # the summary without an address is skipped
+    history = repo.history("a")
+    assert [snapshot["timestamp"] for snapshot in history] == [now - 10 * DAY, now - 5 * DAY, now]
+    assert [snapshot["winrate"] for snapshot in repo.history("a", since=now - 6 * DAY)] == pytest.approx([0.6, 0.9])
+
+    movers = repo.movers("winrate", days=7, now=now)
+    assert [mover["wallet_address"] for mover in movers] == ["a", "b"]  # c has a single snapshot
+    assert movers[0]["change"] == pytest.approx(0.3)
+    assert movers[1]["change"] == pytest.approx(-0.1)
+    with pytest.raises(ValueError):
+        repo.movers("unknown")
+    repo.close()
@@ -0,0 +1,115 @@
+import asyncio
+import csv
+import json
+import time
+
+import pytest
+
+from WalletWave.config import ConfigManager, parse_args
+from WalletWave.main import WalletWave
+from WalletWave.plugins.utils.plugin_interface import PluginInterface
+from WalletWave.utils.gmgn_client.utils.rate_limiter import current_request_policy, deadline_passed
+from WalletWave.utils.time_budget import TimeBudget
+
+
+class CountingPlugin(PluginInterface):
+    """ Produces one wallet every 10ms, either stopping at the deadline or ignoring it """
+
+    name = "Counting"
+
+    def __init__(self, config_manager, services=None, planned: int = 1000, honour_deadline: bool = True):
+        super().__init__(config_manager, services)
+        self.planned = planned
+        self.honour_deadline = honour_deadline
+        self.wallets = []
+
+    async def initialize(self):
+        pass
+
+    async def execute(self):
+        for index in range(self.planned):
+            if self.honour_deadline and deadline_passed():
+                break
+            await asyncio.sleep(0.01)
+            self.wallets.append({"wallet_address": f"w{index}", "winrate": 0.5})
+        return list(self.wallets)
+
+    def partial_results(self):
+        return list(self.wallets)
+
+    def coverage(self):
+        return {"planned": self.planned, "completed": len(self.wallets), "unit": "wallets"}
+
+    def finalize(self):
+        pass
+
+
+def test_run_finishes_within_budget():
+    budget = TimeBudget(5)
+    result, finished = asyncio.run(budget.run(asyncio.sleep(0, result="done")))
+    assert (result, finished) == ("done", True)
+    assert budget.reserve == 0.5 and not budget.nearly_spent
+
+
+def test_run_is_cancelled_at_the_deadline_and_carries_it():
+    async def work(seen):
+        seen.append(current_request_policy().deadline)
+        await asyncio.sleep(10)
+
+    seen = []
+    budget = TimeBudget(0.2, reserve=0.1)
+    started = time.monotonic()
+    result, finished = asyncio.run(budget.run(work(seen)))
+
+    assert (result, finished) == (None, False)
+    assert time.monotonic() - started < 1
+    assert seen == [budget.stop_issuing_at]
+
+
+def test_timeout_raised_by_the_work_is_not_the_deadline():
+    async def work():
+        await asyncio.wait_for(asyncio.sleep(10), 0.01)  # the plugin's own timeout, long before the deadline
+
+    budget = TimeBudget(5)
+    started = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(budget.run(work()))
+    assert time.monotonic() - started < 1
+
+
+def run_plugin(tmp_path, monkeypatch, **plugin_kwargs):
+    monkeypatch.chdir(tmp_path)
+    manager = ConfigManager(parse_args(["--export_path", str(tmp_path / "data"), "--time-budget", "0.5"]))
+    manager.interactive = False
+    app = WalletWave(manager)
+    plugin = CountingPlugin(manager, app.services, **plugin_kwargs)
+    asyncio.run(app.run_plugins([plugin]))
+
+    exported = sorted((tmp_path / "data").glob("wallet_list_*.csv"))
+    meta = json.loads(next((tmp_path / "data").glob("*.meta.json")).read_text())
+    rows = list(csv.DictReader(exported[0].open())) if exported else []
+    return plugin, rows, meta
+
+
+def test_soft_stop_exports_partial_results(tmp_path, monkeypatch):
+    plugin, rows, meta = run_plugin(tmp_path, monkeypatch)
+
+    assert 0 < len(rows) < plugin.planned
+    assert meta["partial"] and not meta["cancelled"]
+    assert meta["exported"] == len(rows) == meta["completed"]
+    assert meta["coverage"] == round(len(rows) / plugin.planned, 4)
+    assert meta["elapsed"] < 0.5
+
+
+def test_cancelled_run_exports_what_completed(tmp_path, monkeypatch):
+    plugin, rows, meta = run_plugin(tmp_path, monkeypatch, honour_deadline=False)
+
+    assert meta["partial"] and meta["cancelled"]
+    assert 0 < len(rows) == meta["exported"] < plugin.planned
+
+
+def test_run_within_budget_is_not_partial(tmp_path, monkeypatch):
+    plugin, rows, meta = run_plugin(tmp_path, monkeypatch, planned=5)
+
+    assert len(rows) == 5
+    assert not meta["partial"] and meta["coverage"] == 1
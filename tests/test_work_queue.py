@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+
+from WalletWave.cluster import _heartbeat
+from WalletWave.utils.work_queue import DONE, FAILED, LEASED, PENDING, LeaseQueue
+
+
+def make_queue(tmp_path, **kwargs) -> LeaseQueue:
+    return LeaseQueue(str(tmp_path / "queue.db"), **kwargs)
+
+
+def test_create_job_splits_into_leases(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.create_job("wallet_list", [f"w{i}" for i in range(5)], lease_size=2, params={"period": "7d"})
+
+    assert queue.job_status(job_id)[PENDING] == 3
+    lease = queue.claim("worker", ttl=60)
+    assert lease.items == ["w0", "w1"]
+    assert lease.params == {"period": "7d"}
+    assert lease.attempts == 1
+    queue.close()
+
+
+def test_complete_stores_results_and_finishes_job(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.create_job("wallet_list", ["a", "b"], lease_size=2)
+    lease = queue.claim("worker", ttl=60)
+
+    assert queue.complete(lease, "worker", [("a", {"winrate": 0.7}), ("b", None)])
+    assert queue.is_finished(job_id)
+    assert queue.job_status(job_id)[DONE] == 1
+    assert queue.get_results(job_id) == [{"winrate": 0.7}]  # the failed lookup is skipped
+    assert queue.claim("worker", ttl=60) is None
+    queue.close()
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_loses_it(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.create_job("wallet_list", ["a"])
+    lease = queue.claim("first", ttl=0)
+    time.sleep(0.01)
+
+    reclaimed = queue.claim("second", ttl=60)
+    assert reclaimed.lease_id == lease.lease_id
+    assert reclaimed.attempts == 2
+    assert not queue.heartbeat(lease, "first", ttl=60)
+    assert not queue.complete(lease, "first", [("a", {})])
+    assert queue.complete(reclaimed, "second", [("a", {})])
+    queue.close()
+
+
+def test_release_hands_the_lease_back(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.create_job("wallet_list", ["a"])
+    lease = queue.claim("worker", ttl=60)
+    assert queue.job_status(job_id)[LEASED] == 1
+
+    queue.release(lease, "worker")
+    assert queue.job_status(job_id)[PENDING] == 1
+    assert queue.claim("other", ttl=60).lease_id == lease.lease_id
+    queue.close()
+
+
+def test_exhausted_lease_fails_without_another_claim(tmp_path):
+    # the last worker died holding the lease: status alone must finish the job, or --wait never returns
+    queue = make_queue(tmp_path, max_attempts=1)
+    job_id = queue.create_job("wallet_list", ["a", "b"], lease_size=1)
+    first = queue.claim("worker", ttl=60)
+    queue.complete(first, "worker", [("a", {})])
+    queue.claim("worker", ttl=0)
+    time.sleep(0.01)
+
+    assert queue.is_finished(job_id)
+    status = queue.job_status(job_id)
+    assert status[FAILED] == 1 and status[DONE] == 1
+    assert queue.claim("worker", ttl=60) is None
+    queue.close()
+
+
+def test_queue_is_shared_between_connections(tmp_path):
+    coordinator = make_queue(tmp_path)
+    worker = make_queue(tmp_path)
+    job_id = coordinator.create_job("wallet_list", ["a"])
+
+    lease = worker.claim("worker", ttl=60)
+    worker.complete(lease, "worker", [("a", {"winrate": 1})])
+    assert coordinator.is_finished(job_id)
+    assert coordinator.get_results(job_id) == [{"winrate": 1}]
+    coordinator.close()
+    worker.close()
+
+
+def test_concurrent_claims_never_share_a_lease(tmp_path):
+    coordinator = make_queue(tmp_path)
+    coordinator.create_job("wallet_list", [f"w{i}" for i in range(40)], lease_size=1)
+    assert coordinator._conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"  # WAL breaks on NFS
+    start = threading.Barrier(4)
+    claimed = {}
+
+    def worker(name):
+        queue = make_queue(tmp_path)  # one connection per worker, like separate hosts
+        start.wait()
+        leases = []
+        while (lease := queue.claim(name, ttl=60)) is not None:
+            leases.append(lease.lease_id)
+        claimed[name] = leases
+        queue.close()
+
+    threads = [threading.Thread(target=worker, args=(f"worker-{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lease_ids = [lease_id for leases in claimed.values() for lease_id in leases]
+    assert len(lease_ids) == len(set(lease_ids)) == 40
+    coordinator.close()
+
+
+def test_heartbeat_renews_from_executor_and_cancels_lost_work(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.create_job("wallet_list", ["a"])
+    lease = queue.claim("worker", ttl=0.3)
+    claimed = lease.expires_at
+
+    async def scenario():
+        work = asyncio.create_task(asyncio.sleep(10))
+        heartbeat = asyncio.create_task(_heartbeat(queue, lease, "worker", 0.3, work))
+        await asyncio.sleep(0.25)
+        renewed = lease.expires_at
+        queue.release(lease, "worker")  # the lease is gone, the next heartbeat must notice
+        lost = await asyncio.wait_for(heartbeat, 1)
+        return renewed, lost, work
+
+    renewed, lost, work = asyncio.run(scenario())
+    assert renewed > claimed
+    assert lost and work.cancelled()
+    queue.close()
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from WalletWave.utils import worker_pool
+from WalletWave.utils.gmgn_client.utils.rate_limiter import current_request_policy, request_priority
+from WalletWave.utils.worker_pool import DONE, RESULT, ShardedWalletScanner, shard_addresses
+
+ADDRESSES = [f"wallet{i}" for i in range(10)]
+
+
+async def _fake_fetch(worker_id, shard, period, timeout, summary_func, result_queue, *args):
+    """ Stands in for _fetch_shard in the workers: answers from the address, without any client """
+    deadline = current_request_policy().deadline
+    for wallet_address in shard:
+        summary = None if wallet_address == "fails" else {
+            "wallet_address": wallet_address,
+            "worker": worker_id,
+            "period": period,
+            "time_left": None if deadline is None else deadline - time.monotonic(),
+        }
+        result_queue.put((RESULT, wallet_address, summary))
+    result_queue.put((DONE, worker_id, len(shard), {"header_rotations": 1}))
+
+
+def _stub_scan_shard(*args):
+    # runs in the spawned worker: only the fetch is replaced, the real entry point rebuilds the deadline
+    worker_pool._fetch_shard = _fake_fetch
+    worker_pool._scan_shard(*args)
+
+
+def _crashing_scan_shard(worker_id, *args):
+    if worker_id == 1:
+        os._exit(3)  # dies without reporting DONE
+    _stub_scan_shard(worker_id, *args)
+
+
+@pytest.mark.parametrize("count, workers", [(10, 3), (10, 10), (3, 8), (0, 4), (1000, 7)])
+def test_shards_cover_every_address_once_with_balanced_sizes(count, workers):
+    addresses = [f"wallet{i}" for i in range(count)]
+    shards = shard_addresses(addresses, workers)
+
+    assert sorted(address for shard in shards for address in shard) == sorted(addresses)
+    assert len(shards) == min(count, workers)
+    assert all(shards)
+    if shards:
+        sizes = [len(shard) for shard in shards]
+        assert max(sizes) - min(sizes) <= 1
+
+
+def run_scan(monkeypatch, tmp_path, target, addresses, **scan_kwargs):
+    from WalletWave.utils.gmgn_client.metrics import ClientMetrics
+
+    monkeypatch.chdir(tmp_path)  # workers write their logs under the working directory
+    monkeypatch.setattr(worker_pool, "_scan_shard", target)
+    metrics = ClientMetrics()
+    scanner = ShardedWalletScanner(3, poll_interval=0.2, metrics=metrics)
+    streamed = []
+
+    async def scenario():
+        return await asyncio.wait_for(scanner.scan(addresses, on_result=streamed.append, **scan_kwargs), 60)
+
+    return asyncio.run(scenario()), streamed, metrics
+
+
+def test_spawn_pool_merges_the_results_of_every_worker(monkeypatch, tmp_path):
+    with request_priority(deadline=time.monotonic() + 60):
+        results, streamed, metrics = run_scan(monkeypatch, tmp_path, _stub_scan_shard, ADDRESSES + ["fails"],
+                                              period="30d")
+
+    assert sorted(result["wallet_address"] for result in results) == ADDRESSES
+    assert streamed == results
+    assert {result["worker"] for result in results} == {0, 1, 2}
+    assert {result["period"] for result in results} == {"30d"}
+    # the deadline is rebuilt in every worker from the time left in the parent
+    assert all(0 < result["time_left"] <= 60 for result in results)
+    assert metrics.header_rotations == 3  # one DONE summary merged per worker
+
+
+def test_spawn_pool_without_deadline(monkeypatch, tmp_path):
+    results, _, _ = run_scan(monkeypatch, tmp_path, _stub_scan_shard, ADDRESSES)
+    assert {result["time_left"] for result in results} == {None}
+
+
+def test_worker_that_exits_early_is_reported_instead_of_hanging(monkeypatch, tmp_path, caplog):
+    results, _, metrics = run_scan(monkeypatch, tmp_path, _crashing_scan_shard, ADDRESSES)
+
+    lost = set(shard_addresses(ADDRESSES, 3)[1])
+    assert {result["wallet_address"] for result in results} == set(ADDRESSES) - lost
+    assert metrics.header_rotations == 2
+    assert "Worker 1 exited with code 3 before finishing" in caplog.text